@@ -0,0 +1,283 @@
+"""
+Microbenchmarks for ``CalculationModel`` (no network; persistence goes to an
+in-memory fake of the ``results`` collection).
+
+    python benchmarks/bench_calculation.py                   # run and compare with baselines.json
+    python benchmarks/bench_calculation.py --save-baseline   # record new baselines
+    python benchmarks/bench_calculation.py --quick --case saw,wp
+
+Every case runs over a grid of alternatives x criteria. For each size the
+fastest time per call is measured (after one warm-up call, GC disabled), throughput is
+reported as matrix cells per second, and allocations as the tracemalloc peak
+of one call. The run exits with status 1 when a case is slower than its
+baseline by more than ``--threshold`` or allocates more than
+``--alloc-threshold``.
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+# Perhitungan identik tidak boleh dilayani dari cache hasil
+os.environ["RESULT_CACHE_MAX_BYTES"] = "0"
+# Baseline diukur tanpa metrics Prometheus (biaya tetap per panggilan, lihat readme)
+os.environ.setdefault("METRICS_ENABLED", "0")
+os.environ.setdefault("MATRIX_CODEC", "binary")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import numpy as np  # noqa: E402
+
+import memory_firestore  # noqa: E402
+from app.models.calculation_model import CalculationModel  # noqa: E402
+from app.models.criteria_schema import CriteriaSchema  # noqa: E402
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines.json")
+DEFAULT_ALTERNATIVES = (100, 1000, 10000)
+DEFAULT_CRITERIA = (5, 20, 50)
+QUICK_ALTERNATIVES = (100, 1000)
+QUICK_CRITERIA = (5, 20)
+SUBCRITERIA_PER_CRITERION = 5
+SAMPLE_SECONDS = 0.002
+CASES = (
+    "saw", "wp", "saw_subcriteria", "wp_subcriteria", "criteria_flatten", "criteria_assemble", "save_results",
+)
+
+
+class Inputs:
+    """
+    Random but seeded inputs of one grid size, in both v1 (arrays) and v2 (criteria tree + dicts) form.
+    """
+
+    def __init__(self, alternatives: int, criteria: int, seed: int = 0) -> None:
+        rng = np.random.default_rng(seed)
+        self.alternatives = alternatives
+        self.criteria = criteria
+        self.decision_matrix = rng.uniform(1, 100, (alternatives, criteria))
+        self.criteria_weights = rng.uniform(0.1, 1, criteria)
+        self.criteria_types = ["cost" if j % 3 == 0 else "benefit" for j in range(criteria)]
+        self.scores = rng.uniform(0, 1, alternatives)
+
+        # Pohon kriteria v2: sub-kriteria dikelompokkan per 5, bobot efektif berjumlah 1
+        names = [f"c{j}" for j in range(criteria)]
+        groups = [names[i:i + SUBCRITERIA_PER_CRITERION] for i in range(0, criteria, SUBCRITERIA_PER_CRITERION)]
+        self.criteria_tree = [
+            {
+                "name": f"k{g}",
+                "weight": 1 / len(groups),
+                "type": "benefit",
+                "subcriteria": [
+                    {"name": name, "weight": 1 / len(group), "type": self.criteria_types[int(name[1:])]}
+                    for name in group
+                ],
+            }
+            for g, group in enumerate(groups)
+        ]
+        self.alternative_rows = [
+            {"alternative": f"a{i}", "criteria_scores": dict(zip(names, row))}
+            for i, row in enumerate(self.decision_matrix.tolist())
+        ]
+
+
+def _cases(model: CalculationModel, client) -> dict:
+    """
+    ``name -> (inputs -> callable)``; the callable is what gets timed.
+    """
+    def save_results(inputs: Inputs):
+        def run():
+            client.clear()
+            model.save_results(
+                "simple_additive_weighting", inputs.criteria_weights, inputs.decision_matrix, inputs.scores, "sync"
+            )
+        return run
+
+    return {
+        "saw": lambda inputs: lambda: model.simple_additive_weighting(
+            inputs.criteria_weights, inputs.decision_matrix, inputs.criteria_types, "none"
+        ),
+        "wp": lambda inputs: lambda: model.weighted_product(
+            inputs.criteria_weights, inputs.decision_matrix, inputs.criteria_types, "none"
+        ),
+        "saw_subcriteria": lambda inputs: lambda: model.simple_additive_weighting_with_subcriteria(
+            inputs.criteria_tree, inputs.alternative_rows, "none"
+        ),
+        "wp_subcriteria": lambda inputs: lambda: model.weighted_product_with_subcriteria(
+            inputs.criteria_tree, inputs.alternative_rows, "none"
+        ),
+        # Flatten pohon kriteria tanpa cache schema, lalu bangun matriks A x C dari dict alternatif
+        "criteria_flatten": lambda inputs: lambda: CriteriaSchema(inputs.criteria_tree),
+        "criteria_assemble": lambda inputs: (
+            lambda schema: lambda: schema.assemble(inputs.alternative_rows)
+        )(CriteriaSchema(inputs.criteria_tree)),
+        "save_results": save_results,
+    }
+
+
+def _measure(run, min_time: float, min_repeats: int) -> dict:
+    run()  # warm-up
+    # Seperti timeit: GC dimatikan, panggilan cepat diulang per sampel (>= 2 ms), diambil sampel tercepat
+    gc.collect()
+    gc.disable()
+    try:
+        number = 1
+        while True:
+            started = time.perf_counter()
+            for _ in range(number):
+                run()
+            elapsed = time.perf_counter() - started
+            if elapsed >= SAMPLE_SECONDS:
+                break
+            number *= 2
+        timings = [elapsed / number]
+        started = time.perf_counter()
+        while len(timings) < min_repeats or time.perf_counter() - started < min_time:
+            sample_started = time.perf_counter()
+            for _ in range(number):
+                run()
+            timings.append((time.perf_counter() - sample_started) / number)
+
+        # Alokasi diukur terpisah karena tracemalloc memperlambat pemanggilan
+        tracemalloc.start()
+        before, _ = tracemalloc.get_traced_memory()
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    finally:
+        gc.enable()
+
+    return {"seconds": min(timings), "repeats": len(timings) * number, "peak_bytes": peak - before}
+
+
+def run_benchmarks(case_names, alternatives, criteria, min_time: float, min_repeats: int) -> dict:
+    client = memory_firestore.install()
+    model = CalculationModel()
+    cases = _cases(model, client)
+    unknown = [name for name in case_names if name not in cases]
+    if unknown:
+        raise SystemExit(f"Unknown case(s): {', '.join(unknown)}. Expected: {', '.join(CASES)}.")
+
+    results = {}
+    for n_alternatives in alternatives:
+        for n_criteria in criteria:
+            inputs = Inputs(n_alternatives, n_criteria)
+            cells = n_alternatives * n_criteria
+            for name in case_names:
+                measured = _measure(cases[name](inputs), min_time, min_repeats)
+                measured["cells_per_second"] = cells / measured["seconds"]
+                measured["bytes_per_cell"] = measured["peak_bytes"] / cells
+                key = f"{name}/{n_alternatives}x{n_criteria}"
+                results[key] = measured
+                print(
+                    f"{key:<32} {measured['seconds'] * 1000:>10.3f} ms  {measured['cells_per_second'] / 1e6:>9.2f} Mcells/s"
+                    f"  peak {measured['peak_bytes'] / 1024:>10.1f} KiB ({measured['bytes_per_cell']:.1f} B/cell)",
+                    flush=True,
+                )
+    return results
+
+
+def compare(results: dict, baselines: dict, threshold: float, alloc_threshold: float) -> dict:
+    """
+    ``key -> [messages]`` for regressions of ``results`` against ``baselines``
+    (cases without a baseline are skipped).
+    """
+    regressions = {}
+    for key, measured in results.items():
+        baseline = baselines.get(key)
+        if baseline is None:
+            continue
+        slowdown = measured["seconds"] / baseline["seconds"] - 1
+        if slowdown > threshold:
+            regressions.setdefault(key, []).append(
+                f"{key}: {measured['seconds'] * 1000:.3f} ms vs baseline {baseline['seconds'] * 1000:.3f} ms (+{slowdown:.0%})"
+            )
+        # Alokasi kecil (< 64 KiB) terlalu dipengaruhi objek Python sementara untuk dibandingkan
+        growth = (measured["peak_bytes"] - baseline["peak_bytes"]) / max(baseline["peak_bytes"], 64 * 1024)
+        if growth > alloc_threshold:
+            regressions.setdefault(key, []).append(
+                f"{key}: peak {measured['peak_bytes']} B vs baseline {baseline['peak_bytes']} B (+{growth:.0%})"
+            )
+    return regressions
+
+
+def _sizes(value: str | None, default) -> tuple[int, ...]:
+    return tuple(int(size) for size in value.split(",")) if value else default
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--case", help="comma-separated cases (default: all)")
+    parser.add_argument("--alternatives", help="comma-separated alternative counts")
+    parser.add_argument("--criteria", help="comma-separated criteria counts")
+    parser.add_argument("--quick", action="store_true", help="small grid for a fast check")
+    parser.add_argument("--min-time", type=float, default=0.2, help="seconds to repeat each case (default 0.2)")
+    parser.add_argument("--min-repeats", type=int, default=5)
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true", help="write the results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed slowdown (default 0.25 = 25%%)")
+    parser.add_argument("--alloc-threshold", type=float, default=0.10, help="allowed peak allocation growth")
+    parser.add_argument("--output", help="also write the results as JSON to this file")
+    args = parser.parse_args()
+
+    case_names = args.case.split(",") if args.case else list(CASES)
+    alternatives = _sizes(args.alternatives, QUICK_ALTERNATIVES if args.quick else DEFAULT_ALTERNATIVES)
+    criteria = _sizes(args.criteria, QUICK_CRITERIA if args.quick else DEFAULT_CRITERIA)
+
+    results = run_benchmarks(case_names, alternatives, criteria, args.min_time, args.min_repeats)
+    report = {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2, sort_keys=True)
+
+    if args.save_baseline:
+        baselines = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as file:
+                baselines = json.load(file).get("results", {})
+        # Baseline lama untuk ukuran/case yang tidak dijalankan tetap disimpan
+        baselines.update({key: {"seconds": m["seconds"], "peak_bytes": m["peak_bytes"]} for key, m in results.items()})
+        report["results"] = dict(sorted(baselines.items()))
+        with open(args.baseline, "w") as file:
+            json.dump(report, file, indent=2)
+            file.write("\n")
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --save-baseline to record one.")
+        return 0
+    with open(args.baseline) as file:
+        baselines = json.load(file).get("results", {})
+
+    regressions = compare(results, baselines, args.threshold, args.alloc_threshold)
+    if regressions:
+        # Satu pengukuran lambat bisa karena noise mesin: ukur ulang lebih lama sebelum dinyatakan regresi
+        print(f"\nRe-measuring {len(regressions)} case(s) over the threshold:")
+        for key in regressions:
+            name, size = key.split("/")
+            n_alternatives, n_criteria = (int(n) for n in size.split("x"))
+            results.update(run_benchmarks(
+                [name], (n_alternatives,), (n_criteria,), args.min_time * 5, args.min_repeats * 2
+            ))
+        regressions = compare(
+            {key: results[key] for key in regressions}, baselines, args.threshold, args.alloc_threshold
+        )
+    if regressions:
+        messages = [message for key_messages in regressions.values() for message in key_messages]
+        print(f"\n{len(messages)} regression(s) over the threshold:")
+        for message in messages:
+            print(f"  {message}")
+        return 1
+    print(f"\nNo regressions against {args.baseline}.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
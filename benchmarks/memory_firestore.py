@@ -0,0 +1,138 @@
+"""
+In-memory stand-in for the parts of the Firestore client used by
+``CalculationModel.save_results`` (collections, documents, batches and
+transactions), so persistence can be benchmarked without network.
+"""
+import itertools
+import os
+
+
+class MemorySnapshot:
+    def __init__(self, document_id: str, data: dict | None) -> None:
+        self.id = document_id
+        self.exists = data is not None
+        self._data = data
+
+    def get(self, field: str):
+        return self._data[field]
+
+    def to_dict(self) -> dict | None:
+        return dict(self._data) if self._data is not None else None
+
+
+class MemoryDocument:
+    def __init__(self, client: "MemoryClient", path: str) -> None:
+        self._client = client
+        self.path = path
+        self.id = path.rsplit("/", 1)[-1]
+
+    def collection(self, name: str) -> "MemoryCollection":
+        return self._client.collection(f"{self.path}/{name}")
+
+    def get(self, transaction=None, retry=None, timeout=None) -> MemorySnapshot:
+        return MemorySnapshot(self.id, self._client.documents.get(self.path))
+
+    def set(self, data: dict, merge: bool = False) -> None:
+        self._client.write(self.path, data, merge)
+
+
+class MemoryCollection:
+    def __init__(self, client: "MemoryClient", path: str) -> None:
+        self._client = client
+        self.path = path
+        self.id = path.rsplit("/", 1)[-1]
+
+    def document(self, document_id: str | None = None) -> MemoryDocument:
+        if document_id is None:
+            document_id = f"{next(self._client.ids):020d}"
+        return MemoryDocument(self._client, f"{self.path}/{document_id}")
+
+
+class MemoryBatch:
+    def __init__(self, client: "MemoryClient") -> None:
+        self._client = client
+        self._writes = []
+
+    def set(self, reference: MemoryDocument, data: dict, merge: bool = False) -> None:
+        self._writes.append((reference.path, data, merge))
+
+    def commit(self, retry=None, timeout=None) -> None:
+        for path, data, merge in self._writes:
+            self._client.write(path, data, merge)
+        self._writes = []
+
+
+class MemoryTransaction(MemoryBatch):
+    """
+    Enough of ``google.cloud.firestore.Transaction`` for ``@firestore.transactional``.
+    """
+
+    _read_only = False
+    _max_attempts = 1
+
+    def __init__(self, client: "MemoryClient") -> None:
+        super().__init__(client)
+        self._id = None
+
+    def _clean_up(self) -> None:
+        self._writes = []
+        self._id = None
+
+    def _begin(self, retry_id=None) -> None:
+        self._id = next(self._client.ids).to_bytes(8, "big")
+
+    def _commit(self) -> list:
+        self.commit()
+        self._clean_up()
+        return []
+
+    def _rollback(self) -> None:
+        self._clean_up()
+
+
+class MemoryClient:
+    """
+    Documents are kept in one dict keyed by full path (``results/<id>``,
+    ``results/<id>/decision_matrix_chunks/<n>``).
+    """
+
+    def __init__(self) -> None:
+        self.documents = {}
+        self.ids = itertools.count()
+
+    def collection(self, name: str) -> MemoryCollection:
+        return MemoryCollection(self, name)
+
+    def batch(self) -> MemoryBatch:
+        return MemoryBatch(self)
+
+    def transaction(self, max_attempts: int = 5, read_only: bool = False) -> MemoryTransaction:
+        return MemoryTransaction(self)
+
+    def get_all(self, references, field_paths=None, transaction=None, retry=None, timeout=None):
+        for reference in references:
+            yield reference.get()
+
+    def write(self, path: str, data: dict, merge: bool) -> None:
+        current = dict(self.documents.get(path) or {}) if merge else {}
+        for key, value in data.items():
+            # firestore.Increment(n) pada counter dokumen
+            if type(value).__name__ == "Increment":
+                value = current.get(key, 0) + value.value
+            current[key] = value
+        self.documents[path] = current
+
+    def clear(self) -> None:
+        self.documents.clear()
+
+
+def install() -> MemoryClient:
+    """
+    Make ``Connection.get_client()`` return a fresh ``MemoryClient`` in this process.
+    """
+    from app.connection.registry import ClientRegistry
+
+    client = MemoryClient()
+    ClientRegistry._client = client
+    ClientRegistry._pid = os.getpid()
+    return client
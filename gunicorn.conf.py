@@ -0,0 +1,80 @@
+# Konfigurasi gunicorn (dibaca otomatis dari direktori kerja, atau lewat --config)
+import os
+import tempfile
+
+bind = os.environ.get("GUNICORN_BIND", "0.0.0.0:8080")
+workers = int(os.environ.get("GUNICORN_WORKERS", "1"))
+graceful_timeout = int(os.environ.get("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+
+# SERVING_MODE=async: banyak thread per worker berbagi satu event loop + AsyncClient Firestore
+_async_mode = os.environ.get("SERVING_MODE", "sync").lower() == "async"
+worker_class = os.environ.get("GUNICORN_WORKER_CLASS", "gthread" if _async_mode else "sync")
+threads = int(os.environ.get("GUNICORN_THREADS", "32" if _async_mode else "1"))
+
+# Metrics Prometheus dari semua worker ditulis ke satu direktori dan digabung oleh /metrics.
+# Harus di-set sebelum prometheus_client di-import oleh worker.
+os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", os.path.join(tempfile.gettempdir(), "spk-metrics"))
+
+
+def on_starting(server):
+    # Jumlah worker sebenarnya (juga dari --workers) diteruskan ke Config di worker
+    os.environ["GUNICORN_WORKERS"] = str(server.cfg.workers)
+    if server.cfg.workers > 1:
+        server.log.warning(
+            f"{server.cfg.workers} workers: background jobs are disabled (?async=1 answers 400, "
+            "large matrices are calculated in the request); they need GUNICORN_WORKERS=1"
+        )
+        # Sesi slider bobot juga per worker: sticky session load balancer tidak memilih worker
+        server.log.warning(
+            f"{server.cfg.workers} workers: weight slider sessions (/saw/sessions, /wp/sessions) live in the worker "
+            "that created them, so PATCH/save requests reaching another worker answer 404; use GUNICORN_WORKERS=1"
+        )
+
+    # Nilai dari run sebelumnya (PID worker lama) tidak boleh ikut terhitung
+    directory = os.environ["PROMETHEUS_MULTIPROC_DIR"]
+    os.makedirs(directory, exist_ok=True)
+    for name in os.listdir(directory):
+        if name.endswith(".db"):
+            os.remove(os.path.join(directory, name))
+
+
+def post_fork(server, worker):
+    # Client Firestore dibuat ulang di tiap worker; channel gRPC tidak aman dibawa lewat fork
+    from app.connection.registry import ClientRegistry
+    from app.utils.config import Config
+
+    from app.connection.async_client import AsyncFirestore
+
+    ClientRegistry.reset()
+    AsyncFirestore.reset()
+    if Config.FIRESTORE_WARMUP:
+        try:
+            ClientRegistry.warm_up()
+        except Exception as e:
+            server.log.warning(f"Firestore warm-up failed: {e}")
+
+
+def worker_exit(server, worker):
+    # Kirim sisa antrian write-behind ke Firestore sebelum worker berhenti
+    from app.connection.write_behind import flush_write_behind
+
+    flush_write_behind(timeout=graceful_timeout)
+
+    # Hentikan process pool analisis sensitivitas (jika pernah dibuat)
+    from app.models.sensitivity import shutdown_sensitivity_pool
+
+    shutdown_sensitivity_pool()
+
+    # Job latar belakang yang masih antri dibatalkan bersama pool-nya
+    from app.models.jobs import shutdown_job_pool
+
+    shutdown_job_pool()
+
+
+def child_exit(server, worker):
+    # File metrics worker yang berhenti tetap dijumlahkan; hanya gauge "live" yang dibuang
+    try:
+        from prometheus_client import multiprocess
+    except ImportError:
+        return
+    multiprocess.mark_process_dead(worker.pid)
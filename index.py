@@ -1,6 +1,4 @@
-from typing import Literal
-from flask import Flask, jsonify
-from flask.wrappers import Response
+import json
 import os
 import sys
 
@@ -9,41 +7,28 @@ src_path = os.path.join(current_dir, 'src')
 if src_path not in sys.path:
     sys.path.insert(0, src_path)
 
+from app.utils.startup import startup_timer
 
-from src.app.utils.config import Config
-from src.app.controllers.saw_controller import saw_bp
-from src.app.controllers.wp_controller import wp_bp
-from src.app.connection.connection import Connection
+with startup_timer.phase("import_app"):
+    from app import create_app
+    from app.utils.config import Config
 
-from flask_cors import CORS
-import sys
-import os
-sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
-
-app = Flask(__name__)
-Config.init_firebase()
-CORS(app)
-
-# Register blueprints
-app.register_blueprint(saw_bp, url_prefix="/saw")
-app.register_blueprint(wp_bp, url_prefix="/wp")
-
-@app.route("/")
-def home() -> tuple[Response, Literal[200]] | tuple[Response, Literal[500]]:
-    try:
-        col_ref = Connection.get_collection("results")
-        doc_count = sum(1 for _ in col_ref.stream())
-        return (
-            jsonify(
-                {
-                    "message": f"Connected successfully! Collection has {doc_count} documents."
-                }
-            ),
-            200,
-        )
-    except Exception as e:
-        return jsonify({"error": f"Connection failed: {str(e)}"}), 500
+app = create_app()
+
+
+def profile_startup() -> int:
+    # Ukur waktu sampai response pertama lalu bandingkan dengan STARTUP_BUDGET_MS (untuk CI)
+    with app.test_client() as client:
+        client.get("/healthz")
+    report = startup_timer.report()
+    report["budget_ms"] = Config.STARTUP_BUDGET_MS or None
+    print(json.dumps(report, indent=2))
+    if Config.STARTUP_BUDGET_MS and report["first_response_ms"] > Config.STARTUP_BUDGET_MS:
+        return 1
+    return 0
 
 
 if __name__ == "__main__":
+    if "--profile-startup" in sys.argv:
+        sys.exit(profile_startup())
     app.run(debug=False)
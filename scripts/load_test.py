@@ -0,0 +1,82 @@
+"""
+Simple load test for a running server: concurrent ``POST /saw/calculate``
+requests that persist their result, to compare ``SERVING_MODE=sync`` with
+``SERVING_MODE=async`` (against the Firestore emulator or a test project).
+
+    python scripts/load_test.py --url http://localhost:8080 --concurrency 64 --requests 2000
+"""
+import argparse
+import json
+import random
+import threading
+import time
+import urllib.request
+
+
+def _body(alternatives: int, criteria: int) -> bytes:
+    # Matriks acak per request supaya setiap hasil menjadi dokumen baru (bukan hit cache)
+    return json.dumps({
+        "decision_matrix": [[random.uniform(1, 100) for _ in range(criteria)] for _ in range(alternatives)],
+        "criteria_weights": [1 / criteria] * criteria,
+        "criteria_types": ["benefit"] * criteria,
+    }).encode()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:8080")
+    parser.add_argument("--path", default="/saw/calculate?persist=sync")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--alternatives", type=int, default=20)
+    parser.add_argument("--criteria", type=int, default=5)
+    args = parser.parse_args()
+
+    latencies = []
+    errors = []
+    remaining = iter(range(args.requests))
+    lock = threading.Lock()
+
+    def worker() -> None:
+        while True:
+            with lock:
+                if next(remaining, None) is None:
+                    return
+            request = urllib.request.Request(
+                args.url + args.path,
+                data=_body(args.alternatives, args.criteria),
+                headers={"Content-Type": "application/json"},
+            )
+            started = time.perf_counter()
+            try:
+                with urllib.request.urlopen(request, timeout=120) as response:
+                    response.read()
+            except Exception as e:
+                with lock:
+                    errors.append(str(e))
+                continue
+            with lock:
+                latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=worker) for _ in range(args.concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+
+    def percentile(p: float) -> float:
+        return latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000 if latencies else 0.0
+
+    print(f"requests: {len(latencies)} ok, {len(errors)} failed in {elapsed:.2f}s")
+    print(f"throughput: {len(latencies) / elapsed:.1f} req/s")
+    print(f"latency ms: p50 {percentile(0.50):.1f}  p95 {percentile(0.95):.1f}  p99 {percentile(0.99):.1f}")
+    if errors:
+        print(f"first error: {errors[0]}")
+
+
+if __name__ == "__main__":
+    main()
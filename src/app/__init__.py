@@ -0,0 +1,68 @@
+import logging
+import time
+from app.utils.config import Config
+from app.utils.metrics import metrics
+from app.utils.startup import startup_timer
+
+
+def create_app():
+    """
+    Build the Flask app. Firebase and Firestore are not touched here; the
+    client is created by ``ClientRegistry`` on the first request that needs it.
+    """
+    if Config.SERVING_MODE not in Config.SERVING_MODES:
+        raise ValueError(
+            f"Unknown SERVING_MODE '{Config.SERVING_MODE}'. Expected one of: {', '.join(Config.SERVING_MODES)}."
+        )
+
+    if Config.STORAGE_BACKEND not in Config.STORAGE_BACKENDS:
+        raise ValueError(
+            f"Unknown STORAGE_BACKEND '{Config.STORAGE_BACKEND}'. Expected one of: {', '.join(Config.STORAGE_BACKENDS)}."
+        )
+
+    if Config.RESULTS_VIEW not in Config.RESULTS_VIEW_MODES:
+        raise ValueError(
+            f"Unknown RESULTS_VIEW '{Config.RESULTS_VIEW}'. Expected one of: {', '.join(Config.RESULTS_VIEW_MODES)}."
+        )
+
+    with startup_timer.phase("import_flask"):
+        from flask import Flask, g, request
+        from flask_cors import CORS
+
+    with startup_timer.phase("import_controllers"):
+        from app.controllers.compare_controller import compare_bp
+        from app.controllers.health_controller import health_bp
+        from app.controllers.job_controller import job_bp
+        from app.controllers.saw_controller import saw_bp
+        from app.controllers.wp_controller import wp_bp
+        from app.connection.resilience import Deadline
+
+    with startup_timer.phase("create_app"):
+        logging.basicConfig(level=Config.LOG_LEVEL)
+        app = Flask(__name__)
+        CORS(app)
+
+        # Register blueprints
+        app.register_blueprint(health_bp)
+        app.register_blueprint(saw_bp, url_prefix="/saw")
+        app.register_blueprint(wp_bp, url_prefix="/wp")
+        app.register_blueprint(compare_bp, url_prefix="/compare")
+        app.register_blueprint(job_bp, url_prefix="/jobs")
+
+        @app.before_request
+        def _start_request_timer():
+            g.request_started = time.perf_counter()
+            # Semua panggilan Firestore request ini berbagi satu budget waktu
+            Deadline.start(Config.FIRESTORE_DEADLINE)
+
+        @app.after_request
+        def _mark_first_response(response):
+            startup_timer.mark_first_response()
+            # Label route memakai pola URL (/jobs/<job_id>), bukan path, agar jumlah seri tetap kecil
+            route = request.url_rule.rule if request.url_rule is not None else "unmatched"
+            metrics.observe_request(
+                route, request.method, response.status_code, time.perf_counter() - g.request_started
+            )
+            return response
+
+    return app
@@ -0,0 +1,85 @@
+import asyncio
+import os
+import threading
+
+from app.connection.registry import ClientRegistry
+from app.utils.config import Config
+
+
+class AsyncFirestore:
+    """
+    One asyncio event loop thread and one Firestore ``AsyncClient`` per process.
+
+    Used when ``Config.SERVING_MODE`` is ``async``: request threads hand their
+    Firestore work to the loop with ``run``, so concurrent requests share one
+    gRPC channel and a request with several Firestore calls awaits them
+    together. Like ``ClientRegistry``, everything is re-created when the
+    process ID changes (after a gunicorn fork).
+    """
+
+    _loop = None
+    _client = None
+    _pid = None
+    _lock = threading.Lock()
+
+    @staticmethod
+    def run(function, *args, timeout: float | None = None):
+        """
+        Run ``await function(client, *args)`` on the loop and return its result.
+        """
+        client = AsyncFirestore.get_client()
+        future = asyncio.run_coroutine_threadsafe(function(client, *args), AsyncFirestore._loop)
+        try:
+            return future.result(timeout if timeout is not None else Config.FIRESTORE_ASYNC_TIMEOUT)
+        except TimeoutError:
+            # Coroutine yang terlambat dibatalkan agar tidak terus memakai loop dan channel
+            future.cancel()
+            raise
+
+    @staticmethod
+    def get_client():
+        if AsyncFirestore._client is not None and AsyncFirestore._pid == os.getpid():
+            return AsyncFirestore._client
+        with AsyncFirestore._lock:
+            if AsyncFirestore._client is None or AsyncFirestore._pid != os.getpid():
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="firestore-async", daemon=True).start()
+                # Channel grpc.aio terikat pada event loop, jadi client dibuat di dalam loop itu
+                client = asyncio.run_coroutine_threadsafe(AsyncFirestore._create_client(), loop).result()
+                AsyncFirestore._loop = loop
+                AsyncFirestore._client = client
+                AsyncFirestore._pid = os.getpid()
+        return AsyncFirestore._client
+
+    @staticmethod
+    def reset() -> None:
+        """
+        Forget the loop and client of this process; called from gunicorn ``post_fork``.
+        """
+        with AsyncFirestore._lock:
+            AsyncFirestore._loop = None
+            AsyncFirestore._client = None
+            AsyncFirestore._pid = None
+
+    @staticmethod
+    async def _create_client():
+        from google.cloud import firestore
+        from google.cloud.firestore_v1.services.firestore import async_client as firestore_async_client
+        from google.cloud.firestore_v1.services.firestore.transports import grpc_asyncio
+
+        client = firestore.AsyncClient(**ClientRegistry.client_kwargs())
+        if os.environ.get("FIRESTORE_EMULATOR_HOST"):
+            return client
+
+        # Opsi keepalive sama dengan client sync (ClientRegistry.channel_options)
+        channel = grpc_asyncio.FirestoreGrpcAsyncIOTransport.create_channel(
+            client._target,
+            credentials=client._credentials,
+            options=ClientRegistry.channel_options(),
+        )
+        transport = grpc_asyncio.FirestoreGrpcAsyncIOTransport(host=client._target, channel=channel)
+        client._transport = transport
+        client._firestore_api_internal = firestore_async_client.FirestoreAsyncClient(
+            transport=transport, client_options=client._client_options
+        )
+        return client
@@ -1,11 +1,54 @@
+import threading
+
 from app.utils.config import Config
-from firebase_admin import firestore
 
 
 # pakai logic ini factory method / abstrck fact method
 class Connection:
+    _repositories = {}
+    _lock = threading.Lock()
+
+    @staticmethod
+    def get_client():
+        # Client Firestore per proses (aman setelah fork gunicorn); import ditunda sampai dipakai
+        from app.connection.registry import ClientRegistry
+
+        return ClientRegistry.get_client()
+
     @staticmethod
     def get_collection(collection_name: str):
-        Config.init_firebase()
-        db = firestore.client()
-        return db.collection(collection_name)
+        return Connection.get_client().collection(collection_name)
+
+    @staticmethod
+    def get_repository(collection_name: str = "results"):
+        """
+        Result repository of ``collection_name`` for ``Config.STORAGE_BACKEND`` (one instance per process).
+        """
+        key = (Config.STORAGE_BACKEND, collection_name)
+        repository = Connection._repositories.get(key)
+        if repository is None:
+            with Connection._lock:
+                repository = Connection._repositories.get(key)
+                if repository is None:
+                    repository = Connection._create_repository(*key)
+                    Connection._repositories[key] = repository
+        return repository
+
+    @staticmethod
+    def _create_repository(backend: str, collection_name: str):
+        # Import per backend: sqlite/memory tidak perlu memuat library Firestore
+        if backend == "firestore":
+            from app.connection.firestore_repository import FirestoreRepository
+
+            return FirestoreRepository(collection_name)
+        if backend == "sqlite":
+            from app.connection.sqlite_repository import SQLiteRepository
+
+            return SQLiteRepository(collection_name)
+        if backend == "memory":
+            from app.connection.memory_repository import MemoryRepository
+
+            return MemoryRepository(collection_name)
+        raise ValueError(
+            f"Unknown storage backend '{backend}'. Expected one of: {', '.join(Config.STORAGE_BACKENDS)}."
+        )
@@ -0,0 +1,110 @@
+from app.connection.connection import Connection
+from app.connection.resilience import Deadline
+from app.utils.config import Config
+
+# Firestore membatasi satu transaksi/batch maksimal 500 operasi (termasuk update counter)
+MAX_BATCH_WRITES = 500
+
+
+class DocumentCounter:
+    """
+    Document count per collection, kept in ``Config.COUNTER_COLLECTION``.
+
+    Every write through ``set_counted`` increments the counter in the same
+    transaction as the documents, so reading the count is a single
+    document read regardless of collection size.
+    """
+
+    @staticmethod
+    def ref(collection_name: str):
+        return Connection.get_collection(Config.COUNTER_COLLECTION).document(collection_name)
+
+    @staticmethod
+    def set_counted(collection, documents: dict) -> int:
+        """
+        Write ``{document_id: data}`` to ``collection`` and count only new documents.
+
+        Runs in one transaction: documents that already exist are left as they
+        are, so repeated writes of the same content never grow the collection
+        or the counter. Returns the number of new documents.
+
+        The transaction makes one attempt (``max_attempts=1``): an ``Aborted``
+        commit is retried by ``FirestoreGuard`` only, not also by the client.
+        """
+        from firebase_admin import firestore
+
+        client = Connection.get_client()
+        counter_ref = DocumentCounter.ref(collection.id)
+
+        @firestore.transactional
+        def _write(transaction) -> int:
+            refs = [collection.document(document_id) for document_id in documents]
+            existing = {
+                snapshot.id
+                for snapshot in client.get_all(
+                    refs, field_paths=["method"], transaction=transaction, **Deadline.call_options()
+                )
+                if snapshot.exists
+            }
+            new_refs = [ref for ref in refs if ref.id not in existing]
+            for ref in new_refs:
+                transaction.set(ref, documents[ref.id])
+            if new_refs:
+                transaction.set(counter_ref, {"count": firestore.Increment(len(new_refs))}, merge=True)
+            return len(new_refs)
+
+        return _write(client.transaction(max_attempts=1))
+
+    @staticmethod
+    async def set_counted_async(client, collection, documents: dict) -> int:
+        """
+        ``set_counted`` with the Firestore ``AsyncClient`` (``SERVING_MODE=async``).
+        """
+        from google.cloud.firestore import Increment, async_transactional
+
+        counter_ref = client.collection(Config.COUNTER_COLLECTION).document(collection.id)
+
+        @async_transactional
+        async def _write(transaction) -> int:
+            refs = [collection.document(document_id) for document_id in documents]
+            existing = {
+                snapshot.id
+                async for snapshot in client.get_all(refs, field_paths=["method"], transaction=transaction)
+                if snapshot.exists
+            }
+            new_refs = [ref for ref in refs if ref.id not in existing]
+            for ref in new_refs:
+                transaction.set(ref, documents[ref.id])
+            if new_refs:
+                transaction.set(counter_ref, {"count": Increment(len(new_refs))}, merge=True)
+            return len(new_refs)
+
+        return await _write(client.transaction(max_attempts=1))
+
+    @staticmethod
+    def get(collection_name: str) -> int:
+        snapshot = DocumentCounter.ref(collection_name).get(**Deadline.call_options())
+        if snapshot.exists:
+            return snapshot.get("count")
+        return DocumentCounter.seed(collection_name)
+
+    @staticmethod
+    def seed(collection_name: str) -> int:
+        """
+        Initialize a missing counter from a one-off aggregation count query.
+        """
+        from firebase_admin import firestore
+
+        client = Connection.get_client()
+        counter_ref = DocumentCounter.ref(collection_name)
+
+        @firestore.transactional
+        def _seed(transaction) -> int:
+            snapshot = counter_ref.get(transaction=transaction, **Deadline.call_options())
+            if snapshot.exists:
+                return snapshot.get("count")
+            count = int(client.collection(collection_name).count().get(**Deadline.call_options())[0][0].value)
+            transaction.set(counter_ref, {"count": count})
+            return count
+
+        return _seed(client.transaction(max_attempts=1))
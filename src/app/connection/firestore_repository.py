@@ -0,0 +1,178 @@
+import asyncio
+import time
+
+from app.connection.async_client import AsyncFirestore
+from app.connection.connection import Connection
+from app.connection.counter import MAX_BATCH_WRITES, DocumentCounter
+from app.connection.matrix_codec import MatrixCodec
+from app.connection.repository import ResultRepository
+from app.connection.resilience import Deadline, FirestoreGuard
+from app.utils.config import Config
+from app.utils.metrics import metrics
+
+
+class FirestoreRepository(ResultRepository):
+    """
+    Results in a Firestore collection; large matrices are chunked into a
+    subcollection and the document count is kept by ``DocumentCounter``.
+    With ``SERVING_MODE=async`` reads and writes go through ``AsyncFirestore``.
+    Documents saved before ``created_at`` was stored report their Firestore ``create_time``.
+    Every call runs under the request deadline and ``FirestoreGuard`` (retries, circuit breaker).
+    """
+
+    @property
+    def collection(self):
+        # Referensi koleksi diambil dari client milik proses ini (bukan client sebelum fork)
+        return Connection.get_collection(self.collection_name)
+
+    def save(self, documents: dict) -> int:
+        # created_at hanya tersimpan saat dokumen pertama kali dibuat (set_counted melewati ID yang sudah ada)
+        now = time.time()
+        documents = {
+            document_id: (dict(data, created_at=now), chunks) for document_id, (data, chunks) in documents.items()
+        }
+        # Satu transaksi per MAX_BATCH_WRITES - 1 dokumen (satu tulis untuk counter), mis. dari endpoint bulk
+        items = list(documents.items())
+        step = MAX_BATCH_WRITES - 1
+        saved = 0
+        for start in range(0, len(items), step):
+            group = dict(items[start:start + step])
+            # Idempotent: ID dari hash konten dan set_counted melewati dokumen yang sudah ada
+            saved += FirestoreGuard.call("save", lambda: self._call("save", self._save, self._save_async, group))
+        return saved
+
+    @staticmethod
+    def _call(operation: str, function, async_function, *args):
+        with metrics.firestore_call(operation):
+            if Config.SERVING_MODE == "async":
+                return AsyncFirestore.run(
+                    async_function, *args, timeout=Deadline.timeout(Config.FIRESTORE_ASYNC_TIMEOUT)
+                )
+            return function(*args)
+
+    def _save(self, documents: dict) -> int:
+        collection = self.collection
+        for document_id, (_, chunks) in documents.items():
+            if chunks:
+                # Potongan matriks besar ditulis dulu, baru dokumen induknya
+                MatrixCodec.write_chunks(collection.document(document_id), chunks)
+        return DocumentCounter.set_counted(
+            collection, {document_id: data for document_id, (data, _) in documents.items()}
+        )
+
+    def iter_results(self, methods=None, limit: int | None = None, start_after: str | None = None, fields=None):
+        query = self._query(self.collection, methods, limit, start_after, fields)
+        decode_matrix = not fields or "decision_matrix" in fields
+        for doc in self._stream(query):
+            data = self._data(doc, fields)
+            if decode_matrix:
+                # Mendukung format biner maupun JSON string lama
+                data["decision_matrix"] = MatrixCodec.decode(data.get("decision_matrix"), doc.reference)
+            yield data
+
+    def iter_created_after(self, created_after: float | None = None):
+        if created_after is None:
+            # Muat penuh: dokumen lama tanpa created_at juga ikut
+            query = self.collection
+        else:
+            from google.cloud.firestore_v1.base_query import FieldFilter
+
+            query = self.collection.where(filter=FieldFilter("created_at", ">=", created_after)).order_by("created_at")
+        for doc in self._stream(query):
+            data = self._data(doc)
+            data["decision_matrix"] = MatrixCodec.decode(data.get("decision_matrix"), doc.reference)
+            yield data
+
+    def listen(self, callback):
+        def on_snapshot(_, changes, read_time) -> None:
+            upserts = []
+            removed = []
+            for change in changes:
+                if change.type.name == "REMOVED":
+                    removed.append(change.document.id)
+                    continue
+                data = self._data(change.document)
+                value = data.get("decision_matrix")
+                # Matriks langsung sebagai array (tanpa tolist); chunk besar dibaca dari subkoleksi
+                data["decision_matrix"] = (
+                    MatrixCodec.decode(value) if isinstance(value, str)
+                    else MatrixCodec.to_array(value, change.document.reference)
+                )
+                upserts.append(data)
+            callback(upserts, removed)
+
+        return self.collection.on_snapshot(on_snapshot)
+
+    def get_results(self, methods=None, limit: int | None = None, start_after: str | None = None, fields=None) -> list:
+        if Config.SERVING_MODE == "async":
+            # Dokumen halaman dan chunk matriksnya dibaca bersamaan di event loop AsyncClient
+            return FirestoreGuard.call(
+                "query", lambda: self._call("query", None, self._results_async, methods, limit, start_after, fields)
+            )
+        return super().get_results(methods, limit, start_after, fields)
+
+    def count(self) -> int:
+        # Dibaca dari dokumen counter (satu read, tidak tergantung ukuran koleksi)
+        def _count() -> int:
+            with metrics.firestore_call("count"):
+                return DocumentCounter.get(self.collection_name)
+
+        return FirestoreGuard.call("count", _count)
+
+    async def _save_async(self, client, documents: dict) -> int:
+        collection = client.collection(self.collection_name)
+        await asyncio.gather(*(
+            MatrixCodec.write_chunks_async(client, collection.document(document_id), chunks)
+            for document_id, (_, chunks) in documents.items() if chunks
+        ))
+        return await DocumentCounter.set_counted_async(
+            client, collection, {document_id: data for document_id, (data, _) in documents.items()}
+        )
+
+    async def _results_async(self, client, methods, limit, start_after, fields) -> list:
+        query = self._query(client.collection(self.collection_name), methods, limit, start_after, fields)
+        decode_matrix = not fields or "decision_matrix" in fields
+
+        async def _decode(doc) -> dict:
+            data = self._data(doc, fields)
+            if decode_matrix:
+                data["decision_matrix"] = await MatrixCodec.decode_async(
+                    client, data.get("decision_matrix"), doc.reference
+                )
+            return data
+
+        documents = [doc async for doc in query.stream()]
+        return list(await asyncio.gather(*(_decode(doc) for doc in documents)))
+
+    @staticmethod
+    def _stream(query):
+        return FirestoreGuard.stream(
+            "query", lambda: metrics.firestore_stream("query", query.stream(**Deadline.call_options(stream=True)))
+        )
+
+    @staticmethod
+    def _data(doc, fields=None) -> dict:
+        data = doc.to_dict()
+        if "created_at" not in data and (not fields or "created_at" in fields) and doc.create_time is not None:
+            data["created_at"] = doc.create_time.timestamp()
+        data["id"] = doc.id
+        return data
+
+    @staticmethod
+    def _query(query, methods, limit, start_after, fields):
+        from google.cloud.firestore_v1.base_query import FieldFilter
+
+        if methods:
+            methods = list(methods)
+            if len(methods) == 1:
+                query = query.where(filter=FieldFilter("method", "==", methods[0]))
+            else:
+                query = query.where(filter=FieldFilter("method", "in", methods))
+        if fields:
+            query = query.select(list(fields))
+        query = query.order_by("__name__")
+        if start_after:
+            query = query.start_after({"__name__": start_after})
+        if limit:
+            query = query.limit(limit)
+        return query
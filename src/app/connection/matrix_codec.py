@@ -0,0 +1,179 @@
+import asyncio
+import json
+import zlib
+
+import numpy as np
+
+from app.connection.connection import Connection
+from app.connection.resilience import Deadline
+from app.utils.config import Config
+
+CODEC_NAME = "ndarray-le"
+CHUNK_COLLECTION = "decision_matrix_chunks"
+# Batas kasar payload satu commit Firestore (maksimal 10 MiB per request)
+MAX_BATCH_BYTES = 8 * 1024 * 1024
+
+
+class MatrixCodec:
+    """
+    Store decision matrices as raw little-endian float bytes instead of JSON strings.
+
+    ``encode`` returns the map stored in the ``decision_matrix`` field plus the
+    list of chunks that do not fit in the document itself; chunks live in the
+    ``decision_matrix_chunks`` subcollection of the result document.
+    """
+
+    @staticmethod
+    def encode(matrix) -> tuple[dict | str, list]:
+        if Config.MATRIX_CODEC == "json":
+            return json.dumps(np.asarray(matrix).tolist()), []
+
+        array = np.ascontiguousarray(matrix, dtype="<f8")
+        payload = array.tobytes()
+        compression = None
+        if Config.MATRIX_COMPRESS_LEVEL > 0:
+            compressed = zlib.compress(payload, Config.MATRIX_COMPRESS_LEVEL)
+            # Data acak hampir tidak terkompresi; simpan mentah kalau tidak lebih kecil
+            if len(compressed) < len(payload):
+                payload, compression = compressed, "zlib"
+
+        encoded = {
+            "codec": CODEC_NAME,
+            "dtype": array.dtype.str,
+            "shape": list(array.shape),
+            "compression": compression,
+            "chunks": 0,
+            "data": payload,
+        }
+        if len(payload) <= Config.MATRIX_CHUNK_BYTES:
+            return encoded, []
+
+        step = Config.MATRIX_CHUNK_BYTES
+        chunks = [payload[i:i + step] for i in range(0, len(payload), step)]
+        encoded["chunks"] = len(chunks)
+        encoded["data"] = None
+        return encoded, chunks
+
+    @staticmethod
+    def decode(value, document_ref=None):
+        """
+        Decode a stored ``decision_matrix`` field; legacy JSON strings are still accepted.
+        """
+        if value is None:
+            return None
+        if isinstance(value, str):
+            try:
+                return json.loads(value)
+            except json.JSONDecodeError:
+                return None
+        array = MatrixCodec.to_array(value, document_ref)
+        return array.tolist() if array is not None else None
+
+    @staticmethod
+    def split_payload(value, chunks: list) -> tuple[dict | str, bytes | None]:
+        """
+        ``(metadata, payload)`` of an encoded matrix for stores without a document size limit.
+
+        The chunks (or inline ``data``) are joined into one payload and the
+        metadata is the map without ``data``; legacy JSON strings are returned as they are.
+        """
+        if not MatrixCodec.is_encoded(value):
+            return value, None
+        payload = b"".join(chunks) if chunks else bytes(value["data"])
+        metadata = {key: item for key, item in value.items() if key != "data"}
+        metadata["chunks"] = 0
+        return metadata, payload
+
+    @staticmethod
+    def decode_payload(metadata, payload: bytes | None):
+        """
+        Inverse of ``split_payload``: the decoded matrix as a list.
+        """
+        if payload is None:
+            return MatrixCodec.decode(metadata)
+        return MatrixCodec.to_array(metadata, payload=payload).tolist()
+
+    @staticmethod
+    def is_encoded(value) -> bool:
+        return isinstance(value, dict) and value.get("codec") == CODEC_NAME
+
+    @staticmethod
+    def to_array(value, document_ref=None, payload: bytes | None = None) -> np.ndarray | None:
+        """
+        Decode an ``ndarray-le`` map (stored field or msgpack request value) into a read-only array.
+
+        ``payload`` is the already joined chunk data, if the caller read it itself.
+        """
+        if not MatrixCodec.is_encoded(value):
+            return None
+
+        if payload is not None:
+            pass
+        elif value.get("chunks"):
+            if document_ref is None:
+                return None
+            payload = MatrixCodec.read_chunks(document_ref, value["chunks"])
+        else:
+            payload = bytes(value["data"])
+        if value.get("compression") == "zlib":
+            payload = zlib.decompress(payload)
+        return np.frombuffer(payload, dtype=np.dtype(value["dtype"])).reshape(value["shape"])
+
+    @staticmethod
+    def write_chunks(document_ref, chunks: list) -> None:
+        # Ditulis sebelum dokumen induk, dalam beberapa batch agar tiap commit < 10 MiB
+        client = Connection.get_client()
+        for batch in MatrixCodec._chunk_batches(document_ref, chunks, client.batch):
+            batch.commit(**Deadline.call_options())
+
+    @staticmethod
+    def read_chunks(document_ref, count: int) -> bytes:
+        refs = [
+            document_ref.collection(CHUNK_COLLECTION).document(f"{index:06d}")
+            for index in range(count)
+        ]
+        parts = {}
+        for snapshot in Connection.get_client().get_all(refs, **Deadline.call_options()):
+            if not snapshot.exists:
+                raise ValueError(f"Chunk '{snapshot.id}' of decision matrix {document_ref.id} is missing.")
+            parts[snapshot.get("index")] = bytes(snapshot.get("data"))
+        return b"".join(parts[index] for index in range(count))
+
+    @staticmethod
+    def _chunk_batches(document_ref, chunks: list, new_batch) -> list:
+        per_batch = max(1, MAX_BATCH_BYTES // Config.MATRIX_CHUNK_BYTES)
+        batches = []
+        for start in range(0, len(chunks), per_batch):
+            batch = new_batch()
+            for index in range(start, min(start + per_batch, len(chunks))):
+                batch.set(
+                    document_ref.collection(CHUNK_COLLECTION).document(f"{index:06d}"),
+                    {"index": index, "data": chunks[index]},
+                )
+            batches.append(batch)
+        return batches
+
+    @staticmethod
+    async def write_chunks_async(client, document_ref, chunks: list) -> None:
+        # Versi AsyncClient: semua batch chunk di-commit bersamaan
+        batches = MatrixCodec._chunk_batches(document_ref, chunks, client.batch)
+        await asyncio.gather(*(batch.commit() for batch in batches))
+
+    @staticmethod
+    async def decode_async(client, value, document_ref):
+        """
+        ``decode`` for documents read with the AsyncClient; chunks are fetched without blocking the loop.
+        """
+        if not MatrixCodec.is_encoded(value) or not value.get("chunks"):
+            return MatrixCodec.decode(value)
+        refs = [
+            document_ref.collection(CHUNK_COLLECTION).document(f"{index:06d}")
+            for index in range(value["chunks"])
+        ]
+        parts = {}
+        async for snapshot in client.get_all(refs):
+            if not snapshot.exists:
+                raise ValueError(f"Chunk '{snapshot.id}' of decision matrix {document_ref.id} is missing.")
+            parts[snapshot.get("index")] = bytes(snapshot.get("data"))
+        payload = b"".join(parts[index] for index in range(value["chunks"]))
+        return MatrixCodec.to_array(value, payload=payload).tolist()
@@ -0,0 +1,103 @@
+import bisect
+import heapq
+import itertools
+import threading
+import time
+
+from app.connection.matrix_codec import MatrixCodec
+from app.connection.repository import ResultRepository
+
+
+class MemoryRepository(ResultRepository):
+    """
+    Results in a dict of this process, for tests and local batch runs; nothing survives a restart.
+
+    Document IDs are kept sorted, overall and per method, so a page is a
+    binary search plus ``limit`` steps, like the indexed backends; a
+    ``(created_at, id)`` list serves ``iter_created_after``.
+    """
+
+    def __init__(self, collection_name: str) -> None:
+        super().__init__(collection_name)
+        self._documents = {}
+        self._ids = []
+        self._ids_by_method = {}
+        self._created = []
+        self._lock = threading.Lock()
+
+    def save(self, documents: dict) -> int:
+        now = time.time()
+        new = 0
+        with self._lock:
+            for document_id, (data, chunks) in documents.items():
+                if document_id in self._documents:
+                    continue
+                document = dict(data)
+                document["decision_matrix"], payload = MatrixCodec.split_payload(data.get("decision_matrix"), chunks)
+                self._documents[document_id] = (now, document, payload)
+                bisect.insort(self._ids, document_id)
+                bisect.insort(self._ids_by_method.setdefault(data["method"], []), document_id)
+                bisect.insort(self._created, (now, document_id))
+                new += 1
+        return new
+
+    def iter_results(self, methods=None, limit: int | None = None, start_after: str | None = None, fields=None):
+        with self._lock:
+            if methods:
+                sources = [self._ids_by_method.get(method, []) for method in methods]
+            else:
+                sources = [self._ids]
+            # Gabungan beberapa daftar ID terurut, mulai setelah start_after
+            merged = heapq.merge(*(self._ids_after(ids, start_after) for ids in sources))
+            selected = [
+                (document_id, self._documents[document_id])
+                for document_id in itertools.islice(merged, limit or None)
+            ]
+        yield from self._results(selected, fields)
+
+    def iter_created_after(self, created_after: float | None = None):
+        with self._lock:
+            start = bisect.bisect_left(self._created, (created_after,)) if created_after is not None else 0
+            selected = [(document_id, self._documents[document_id]) for _, document_id in self._created[start:]]
+        yield from self._results(selected)
+
+    @staticmethod
+    def _results(selected: list, fields=None):
+        decode_matrix = not fields or "decision_matrix" in fields
+        for document_id, (created_at, document, payload) in selected:
+            data = dict(document, created_at=created_at)
+            if decode_matrix:
+                data["decision_matrix"] = MatrixCodec.decode_payload(document.get("decision_matrix"), payload)
+            if fields:
+                data = {field: data[field] for field in fields if field in data}
+            data["id"] = document_id
+            yield data
+
+    def count(self) -> int:
+        return len(self._documents)
+
+    def drain(self) -> dict:
+        """
+        Remove and return every document as ``{document_id: (data, chunks)}``.
+
+        Used by job pool processes to hand their results back to the worker.
+        """
+        with self._lock:
+            documents = {
+                document_id: (dict(document, decision_matrix=self._joined(document["decision_matrix"], payload)), [])
+                for document_id, (_, document, payload) in self._documents.items()
+            }
+            self._documents.clear()
+            self._ids.clear()
+            self._ids_by_method.clear()
+            self._created.clear()
+        return documents
+
+    @staticmethod
+    def _ids_after(ids: list, start_after: str | None):
+        start = bisect.bisect_right(ids, start_after) if start_after else 0
+        return (ids[i] for i in range(start, len(ids)))
+
+    @staticmethod
+    def _joined(metadata, payload):
+        return metadata if payload is None else dict(metadata, data=payload)
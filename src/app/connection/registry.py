@@ -0,0 +1,117 @@
+import logging
+import os
+import threading
+
+from app.utils.config import Config
+from google.cloud import firestore
+from google.cloud.firestore_v1.services.firestore import client as firestore_client
+from google.cloud.firestore_v1.services.firestore.transports import grpc as firestore_grpc_transport
+
+logger = logging.getLogger(__name__)
+
+# Project ID default saat memakai Firestore emulator
+EMULATOR_PROJECT = "demo-spk"
+# Atribut internal google-cloud-firestore yang dipakai untuk memasang channel sendiri (lihat requirements.txt)
+CLIENT_INTERNALS = ("_target", "_credentials", "_client_options", "_firestore_api_internal")
+
+
+class ClientRegistry:
+    """
+    One Firestore client (and one gRPC channel) per process.
+
+    The client is created lazily on first use and re-created when the
+    process ID changes, so a client built in the gunicorn master is never
+    reused by a forked worker.
+    """
+
+    _client = None
+    _pid = None
+    _lock = threading.Lock()
+
+    @staticmethod
+    def channel_options() -> list:
+        return [
+            ("grpc.keepalive_time_ms", Config.FIRESTORE_KEEPALIVE_TIME_MS),
+            ("grpc.keepalive_timeout_ms", Config.FIRESTORE_KEEPALIVE_TIMEOUT_MS),
+            ("grpc.keepalive_permit_without_calls", int(Config.FIRESTORE_KEEPALIVE_WITHOUT_CALLS)),
+            ("grpc.max_send_message_length", -1),
+            ("grpc.max_receive_message_length", -1),
+        ]
+
+    @staticmethod
+    def get_client():
+        if ClientRegistry._client is not None and ClientRegistry._pid == os.getpid():
+            return ClientRegistry._client
+        with ClientRegistry._lock:
+            if ClientRegistry._client is None or ClientRegistry._pid != os.getpid():
+                ClientRegistry._client = ClientRegistry._create_client()
+                ClientRegistry._pid = os.getpid()
+        return ClientRegistry._client
+
+    @staticmethod
+    def reset() -> None:
+        """
+        Forget the client of this process; called from gunicorn ``post_fork``.
+        """
+        with ClientRegistry._lock:
+            ClientRegistry._client = None
+            ClientRegistry._pid = None
+
+    @staticmethod
+    def warm_up() -> None:
+        """
+        Open the channel with one cheap RPC so the first request does not pay for it.
+        """
+        client = ClientRegistry.get_client()
+        client.collection(Config.COUNTER_COLLECTION).document("results").get()
+
+    @staticmethod
+    def client_kwargs() -> dict:
+        """
+        Credentials and project for a Firestore client (sync or async).
+
+        Against the emulator (``FIRESTORE_EMULATOR_HOST``) no service account
+        is needed: anonymous credentials and ``GOOGLE_CLOUD_PROJECT`` are used.
+        """
+        if os.environ.get("FIRESTORE_EMULATOR_HOST"):
+            from google.auth.credentials import AnonymousCredentials
+
+            return {
+                "credentials": AnonymousCredentials(),
+                "project": os.environ.get("GOOGLE_CLOUD_PROJECT", EMULATOR_PROJECT),
+            }
+        app = Config.init_firebase()
+        return {"credentials": app.credential.get_credential(), "project": app.project_id}
+
+    @staticmethod
+    def _create_client():
+        client = firestore.Client(**ClientRegistry.client_kwargs())
+
+        if os.environ.get("FIRESTORE_EMULATOR_HOST"):
+            # Emulator memakai channel insecure bawaan client
+            return client
+
+        # firestore.Client tidak punya opsi publik untuk channel/transport, jadi channel dipasang lewat
+        # atribut internal; versi library di luar rentang di requirements.txt bisa mengubahnya
+        missing = [name for name in CLIENT_INTERNALS if not hasattr(client, name)]
+        if missing or client._firestore_api_internal is not None:
+            logger.warning(
+                f"google-cloud-firestore {firestore.__version__} does not expose {', '.join(missing) or 'a lazy API client'}; "
+                "using its default gRPC channel, FIRESTORE_KEEPALIVE_* options are not applied."
+            )
+            return client
+
+        # Channel dibuat sendiri agar opsi keepalive bisa diatur lewat Config
+        channel = firestore_grpc_transport.FirestoreGrpcTransport.create_channel(
+            client._target,
+            credentials=client._credentials,
+            options=ClientRegistry.channel_options(),
+        )
+        transport = firestore_grpc_transport.FirestoreGrpcTransport(
+            host=client._target, channel=channel
+        )
+        client._transport = transport
+        client._firestore_api_internal = firestore_client.FirestoreClient(
+            transport=transport, client_options=client._client_options
+        )
+        return client
@@ -0,0 +1,61 @@
+class StorageUnavailableError(Exception):
+    """
+    Raised when the storage backend cannot be reached in time (deadline, retries exhausted or circuit breaker open).
+    """
+
+
+class ResultRepository:
+    """
+    Storage of calculation results, one instance per collection.
+
+    Documents are the dicts built by ``CalculationModel`` (``method``,
+    ``criteria_weights``, ``decision_matrix`` as encoded by ``MatrixCodec``,
+    ``scores``) keyed by their content hash. Implementations:
+    ``FirestoreRepository``, ``SQLiteRepository`` and ``MemoryRepository``,
+    selected with ``Config.STORAGE_BACKEND``.
+    """
+
+    def __init__(self, collection_name: str) -> None:
+        self.collection_name = collection_name
+
+    def save(self, documents: dict) -> int:
+        """
+        Store ``{document_id: (data, chunks)}``; existing IDs are left as they are.
+
+        Returns the number of new documents.
+        """
+        raise NotImplementedError
+
+    def iter_results(self, methods=None, limit: int | None = None, start_after: str | None = None, fields=None):
+        """
+        Yield stored documents ordered by ID, with ``id`` and ``created_at`` added and ``decision_matrix`` decoded to a list.
+
+        ``methods`` filters on ``method``, ``fields`` projects the documents
+        and ``start_after`` is the last ID of the previous page.
+        """
+        raise NotImplementedError
+
+    def iter_created_after(self, created_after: float | None = None):
+        """
+        Yield stored documents like ``iter_results``, ordered by ``created_at``
+        (Unix time of the first save), from ``created_after`` inclusive.
+
+        Used to load and poll ``ResultsView``.
+        """
+        raise NotImplementedError
+
+    def listen(self, callback):
+        """
+        Push every change to ``callback(upserts, removed_ids)``, starting with the whole collection.
+
+        ``upserts`` are documents like ``iter_results`` with ``decision_matrix``
+        as an array. Returns a handle with ``is_active`` and ``close()``; only
+        backends with change notifications implement it.
+        """
+        raise NotImplementedError
+
+    def get_results(self, methods=None, limit: int | None = None, start_after: str | None = None, fields=None) -> list:
+        return list(self.iter_results(methods, limit, start_after, fields))
+
+    def count(self) -> int:
+        raise NotImplementedError
@@ -0,0 +1,305 @@
+import logging
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from app.connection.repository import StorageUnavailableError
+from app.utils.config import Config
+from app.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+_deadline = ContextVar("firestore_deadline", default=None)
+
+
+class DeadlineExceededError(StorageUnavailableError):
+    """
+    Raised before a Firestore call when the budget of the current request is used up.
+    """
+
+
+class CircuitOpenError(StorageUnavailableError):
+    """
+    Raised instead of calling Firestore while the circuit breaker is open.
+    """
+
+
+class Deadline:
+    """
+    Firestore time budget of the current request.
+
+    The budget starts in ``before_request`` and lives in a ``ContextVar``, so
+    background threads (write-behind, results view) and job processes have
+    none and only get the per-call cap ``FIRESTORE_CALL_TIMEOUT``.
+    """
+
+    @staticmethod
+    def start(seconds: float | None) -> None:
+        _deadline.set(None if seconds is None else time.monotonic() + seconds)
+
+    @staticmethod
+    @contextmanager
+    def scope(seconds: float | None):
+        """
+        Replace the budget inside the block; ``None`` removes it (e.g. for a streamed export).
+        """
+        token = _deadline.set(None if seconds is None else time.monotonic() + seconds)
+        try:
+            yield
+        finally:
+            _deadline.reset(token)
+
+    @staticmethod
+    def remaining() -> float | None:
+        deadline = _deadline.get()
+        return None if deadline is None else deadline - time.monotonic()
+
+    @staticmethod
+    def timeout(cap: float | None = Config.FIRESTORE_CALL_TIMEOUT) -> float | None:
+        """
+        Timeout for the next call: the remaining budget, at most ``cap``.
+        """
+        remaining = Deadline.remaining()
+        if remaining is None:
+            return cap
+        if remaining <= 0:
+            raise DeadlineExceededError("The Firestore deadline of this request was exceeded.")
+        return remaining if cap is None else min(remaining, cap)
+
+    @staticmethod
+    def call_options(stream: bool = False) -> dict:
+        """
+        ``retry`` and ``timeout`` keyword arguments for a Firestore client call.
+
+        The built-in retry of the client is turned off so ``FirestoreGuard``
+        alone decides what is retried. A stream is bounded by the request
+        budget only, not by the per-call cap.
+        """
+        return {"retry": None, "timeout": Deadline.timeout(None if stream else Config.FIRESTORE_CALL_TIMEOUT)}
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker.
+
+    ``closed``: calls pass; ``failure_threshold`` transient failures in a
+    row open it. ``open``: calls are refused for ``reset_timeout`` seconds.
+    ``half_open``: one probe call passes; success closes the breaker, a
+    failure opens it again.
+    """
+
+    STATES = ("closed", "half_open", "open")
+
+    def __init__(
+        self,
+        failure_threshold: int = Config.FIRESTORE_BREAKER_FAILURES,
+        reset_timeout: float = Config.FIRESTORE_BREAKER_RESET,
+    ) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = None
+        self.opened = 0
+        self.rejected = 0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self) -> bool:
+        """
+        True while calls are being refused (no state change, unlike ``allow``).
+        """
+        return self.state == "open" and time.monotonic() - self.opened_at < self.reset_timeout
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == "open":
+                if time.monotonic() - self.opened_at < self.reset_timeout:
+                    self.rejected += 1
+                    return False
+                self._set_state("half_open")
+            if self.state == "half_open":
+                if self._probing:
+                    self.rejected += 1
+                    return False
+                self._probing = True
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self._probing = False
+            if self.state != "closed":
+                self._set_state("closed")
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            self._probing = False
+            if self.state == "half_open" or self.failures >= self.failure_threshold:
+                if self.state != "open":
+                    self.opened += 1
+                    logger.warning(f"Firestore circuit breaker opened after {self.failures} failure(s).")
+                self.opened_at = time.monotonic()
+                self._set_state("open")
+
+    def release(self) -> None:
+        # Panggilan selesai tanpa hasil yang bisa dinilai (mis. budget request habis)
+        with self._lock:
+            self._probing = False
+
+    def stats(self) -> dict:
+        return {
+            "state": "half_open" if self.state == "open" and not self.is_open else self.state,
+            "consecutive_failures": self.failures,
+            "failure_threshold": self.failure_threshold,
+            "reset_timeout": self.reset_timeout,
+            "opened": self.opened,
+            "rejected": self.rejected,
+        }
+
+    def _set_state(self, state: str) -> None:
+        self.state = state
+        metrics.set_breaker_state(self.STATES.index(state))
+
+
+class FirestoreGuard:
+    """
+    Deadline, retry and circuit breaker policy around Firestore operations of this process.
+
+    Only idempotent operations are retried, after a transient error
+    (unavailable, timeout, aborted, resource exhausted), with full-jitter
+    exponential backoff and never past the request deadline. Reads and
+    result saves are idempotent: documents are keyed by content hash and
+    ``DocumentCounter.set_counted`` skips IDs that already exist. When the
+    operation still fails, or the breaker is open, ``StorageUnavailableError``
+    is raised.
+    """
+
+    breaker = CircuitBreaker()
+    retries = {}
+    failures = {}
+    _lock = threading.Lock()
+
+    @staticmethod
+    def call(operation: str, function, idempotent: bool = True):
+        """
+        Run ``function()`` under the policy and return its result.
+        """
+        attempt = 0
+        while True:
+            FirestoreGuard._admit(operation)
+            try:
+                result = function()
+            except Exception as e:
+                delay = FirestoreGuard._failed(operation, e, attempt, idempotent)
+                attempt += 1
+                time.sleep(delay)
+                continue
+            FirestoreGuard.breaker.record_success()
+            return result
+
+    @staticmethod
+    def stream(operation: str, open_stream, idempotent: bool = True):
+        """
+        Yield from ``open_stream()`` under the policy.
+
+        The stream is retried only until its first item arrived; a failure
+        after that is raised to the reader (and counted by the breaker).
+        """
+        attempt = 0
+        while True:
+            FirestoreGuard._admit(operation)
+            try:
+                iterator = iter(open_stream())
+                first = next(iterator)
+            except StopIteration:
+                FirestoreGuard.breaker.record_success()
+                return
+            except Exception as e:
+                delay = FirestoreGuard._failed(operation, e, attempt, idempotent)
+                attempt += 1
+                time.sleep(delay)
+                continue
+            break
+
+        yield first
+        try:
+            yield from iterator
+        except Exception as e:
+            if FirestoreGuard.transient(e):
+                FirestoreGuard.breaker.record_failure()
+            raise
+        FirestoreGuard.breaker.record_success()
+
+    @staticmethod
+    def transient(error: Exception) -> bool:
+        from google.api_core import exceptions
+
+        return isinstance(
+            error,
+            (
+                exceptions.ServiceUnavailable,
+                exceptions.DeadlineExceeded,
+                exceptions.InternalServerError,
+                exceptions.ResourceExhausted,
+                exceptions.Aborted,
+                exceptions.GatewayTimeout,
+                TimeoutError,
+                ConnectionError,
+            ),
+        )
+
+    @staticmethod
+    def stats() -> dict:
+        return {
+            "breaker": FirestoreGuard.breaker.stats(),
+            "retries": dict(FirestoreGuard.retries),
+            "failures": dict(FirestoreGuard.failures),
+            "max_attempts": Config.FIRESTORE_MAX_ATTEMPTS,
+            "deadline": Config.FIRESTORE_DEADLINE,
+            "call_timeout": Config.FIRESTORE_CALL_TIMEOUT,
+        }
+
+    @staticmethod
+    def _admit(operation: str) -> None:
+        if not FirestoreGuard.breaker.allow():
+            raise CircuitOpenError(f"Firestore is unavailable (circuit breaker open), {operation} was not attempted.")
+
+    @staticmethod
+    def _failed(operation: str, error: Exception, attempt: int, idempotent: bool) -> float:
+        """
+        Record a failed attempt; return the backoff before the next one or raise.
+        """
+        if isinstance(error, StorageUnavailableError):
+            # Budget request habis sebelum memanggil Firestore: bukan kegagalan Firestore
+            FirestoreGuard.breaker.release()
+            raise error
+        if not FirestoreGuard.transient(error):
+            # Firestore menjawab (mis. argumen tidak valid): error diteruskan apa adanya
+            FirestoreGuard.breaker.record_success()
+            raise error
+
+        FirestoreGuard.breaker.record_failure()
+        with FirestoreGuard._lock:
+            FirestoreGuard.failures[operation] = FirestoreGuard.failures.get(operation, 0) + 1
+
+        # Full jitter: acak antara 0 dan batas backoff eksponensial
+        delay = random.uniform(
+            0, min(Config.FIRESTORE_RETRY_MAX_DELAY, Config.FIRESTORE_RETRY_BASE_DELAY * 2 ** attempt)
+        )
+        remaining = Deadline.remaining()
+        if (
+            not idempotent
+            or attempt + 1 >= Config.FIRESTORE_MAX_ATTEMPTS
+            or (remaining is not None and remaining <= delay)
+        ):
+            raise StorageUnavailableError(f"Firestore {operation} failed: {error}") from error
+
+        with FirestoreGuard._lock:
+            FirestoreGuard.retries[operation] = FirestoreGuard.retries.get(operation, 0) + 1
+        metrics.observe_retry(operation)
+        return delay
@@ -0,0 +1,330 @@
+import bisect
+import heapq
+import itertools
+import logging
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+
+from app.connection.connection import Connection
+from app.utils.config import Config
+
+logger = logging.getLogger(__name__)
+
+
+class ResultsView:
+    """
+    Materialized copy of one results collection in this worker, served by ``GET /results`` instead of the backend.
+
+    The view loads the collection once and then follows it: ``listen`` mode
+    applies the changes pushed by the repository (Firestore ``on_snapshot``),
+    ``poll`` mode reads the documents created since the last poll every
+    ``poll_interval`` seconds. Documents are indexed by ID, by method (for
+    the ID-ordered, filtered pages) and by ``created_at``; matrices are kept
+    as arrays and only converted to lists for the page being served.
+
+    ``ready()`` is false until the first load finished, after the last sync
+    is older than ``max_staleness`` (and the listener is down), or when the
+    collection does not fit in ``max_bytes``; reads then go to the backend.
+    """
+
+    def __init__(
+        self,
+        repository,
+        mode: str,
+        max_bytes: int = Config.RESULTS_VIEW_MAX_BYTES,
+        max_staleness: float = Config.RESULTS_VIEW_MAX_STALENESS,
+        poll_interval: float = Config.RESULTS_VIEW_POLL_INTERVAL,
+    ) -> None:
+        self.repository = repository
+        self.mode = mode
+        self.max_bytes = max_bytes
+        self.max_staleness = max_staleness
+        self.poll_interval = poll_interval
+        self._documents = {}
+        self._ids = []
+        self._ids_by_method = {}
+        self._created = []
+        self._lock = threading.Lock()
+        self._thread = None
+        self._pid = None
+        self._stopping = threading.Event()
+        self._watch = None
+        self._watermark = None
+        self.bytes = 0
+        self.loaded = False
+        self.overflowed = False
+        self.synced_at = None
+        self.updates = 0
+        self.errors = 0
+
+    def ready(self) -> bool:
+        self._ensure_worker()
+        if not self.loaded or self.overflowed:
+            return False
+        if self._watch is not None and self._watch.is_active:
+            return True
+        return time.monotonic() - self.synced_at <= self.max_staleness
+
+    def stats(self) -> dict:
+        return {
+            "mode": self.mode,
+            "ready": self.ready(),
+            "documents": len(self._documents),
+            "bytes": self.bytes,
+            "max_bytes": self.max_bytes,
+            "overflowed": self.overflowed,
+            "staleness": None if self.synced_at is None else round(time.monotonic() - self.synced_at, 3),
+            "max_staleness": self.max_staleness,
+            "updates": self.updates,
+            "errors": self.errors,
+        }
+
+    def put(self, document: dict) -> None:
+        """
+        Insert one document just saved by this worker (with ``id`` and ``created_at``).
+
+        Saves never overwrite an existing ID (content hash, see ``set_counted``),
+        so a document already in the view keeps its stored ``created_at``.
+        """
+        if document["id"] in self._documents:
+            return
+        self.apply([document], [])
+
+    def apply(self, upserts: list, removed_ids: list) -> None:
+        with self._lock:
+            if self.overflowed:
+                return
+            for document_id in removed_ids:
+                self._remove(document_id)
+            # Satu versi per ID (yang terakhir menang); versi lama dilepas selagi indeks masih terurut
+            documents = {}
+            for document in upserts:
+                document = dict(document)
+                documents[document.pop("id")] = document
+            for document_id in documents:
+                self._remove(document_id)
+
+            # put (satu dokumen): insort. Batch (load awal, poll, listener): append lalu satu sort per indeks;
+            # ID hash acak membuat insort per dokumen O(N), jadi load awal O(N^2) dengan lock dipegang
+            insert = bisect.insort if len(documents) == 1 else list.append
+            methods = set()
+            for document_id, document in documents.items():
+                document["decision_matrix"] = self._stored_matrix(document.get("decision_matrix"))
+                created_at = document.get("created_at") or 0.0
+                size = self._sizeof(document)
+                self._documents[document_id] = (created_at, document, size)
+                method = document.get("method")
+                methods.add(method)
+                insert(self._ids, document_id)
+                insert(self._ids_by_method.setdefault(method, []), document_id)
+                insert(self._created, (created_at, document_id))
+                self.bytes += size
+                if self._watermark is None or created_at > self._watermark:
+                    self._watermark = created_at
+            if len(documents) > 1:
+                # Timsort menggabungkan bagian yang sudah terurut dengan batch baru
+                self._ids.sort()
+                self._created.sort()
+                for method in methods:
+                    self._ids_by_method[method].sort()
+            self.updates += len(upserts) + len(removed_ids)
+            if self.bytes > self.max_bytes:
+                self._overflow()
+
+    def iter_results(self, methods=None, limit: int | None = None, start_after: str | None = None, fields=None):
+        decode_matrix = not fields or "decision_matrix" in fields
+        with self._lock:
+            if methods:
+                sources = [self._ids_by_method.get(method, []) for method in methods]
+            else:
+                sources = [self._ids]
+            # Sama seperti MemoryRepository: gabungan daftar ID terurut mulai setelah start_after
+            merged = heapq.merge(*(self._ids_after(ids, start_after) for ids in sources))
+            selected = [
+                (document_id, self._documents[document_id][1])
+                for document_id in itertools.islice(merged, limit or None)
+            ]
+
+        for document_id, document in selected:
+            data = dict(document)
+            if decode_matrix and isinstance(data.get("decision_matrix"), np.ndarray):
+                data["decision_matrix"] = data["decision_matrix"].tolist()
+            if fields:
+                data = {field: data[field] for field in fields if field in data}
+            data["id"] = document_id
+            yield data
+
+    def get_results(self, methods=None, limit: int | None = None, start_after: str | None = None, fields=None) -> list:
+        return list(self.iter_results(methods, limit, start_after, fields))
+
+    def count(self) -> int:
+        return len(self._documents)
+
+    def close(self) -> None:
+        # Thread view menutup listener sebelum berhenti
+        self._stopping.set()
+
+    def _ensure_worker(self) -> None:
+        # Thread (dan listener) dibuat di proses yang membaca, bukan diwarisi lewat fork
+        if self._thread is not None and self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._thread is None or self._pid != os.getpid():
+                self._stopping = threading.Event()
+                self._watch = None
+                self._pid = os.getpid()
+                self._thread = threading.Thread(target=self._run, name="results-view", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stopping.is_set() and not self.overflowed:
+            try:
+                if self.mode == "listen":
+                    if self._watch is None or not self._watch.is_active:
+                        self._listen()
+                else:
+                    self._poll()
+            except Exception as e:
+                self.errors += 1
+                if self.mode == "listen":
+                    # Listener tidak bisa dibuka (mis. emulator/jaringan): lanjut dengan polling
+                    logger.warning(f"Results view listener failed, falling back to polling: {e}")
+                    self.mode = "poll"
+                    continue
+                logger.warning(f"Results view poll failed: {e}")
+            self._stopping.wait(self.poll_interval)
+        if self._watch is not None:
+            self._watch.close()
+            self._watch = None
+
+    def _listen(self) -> None:
+        if self._watch is not None:
+            # Listener mati: mulai ulang, snapshot awal berisi seluruh koleksi lagi
+            self._watch.close()
+            self._clear()
+        self._watch = self.repository.listen(self._on_changes)
+
+    def _on_changes(self, upserts: list, removed_ids: list) -> None:
+        self.apply(upserts, removed_ids)
+        self.synced_at = time.monotonic()
+        self.loaded = True
+
+    def _poll(self) -> None:
+        started = time.monotonic()
+        # Dokumen dengan created_at sedikit sebelum watermark bisa baru ter-commit (write-behind,
+        # jam worker lain), jadi jendela max_staleness terakhir dibaca ulang
+        created_after = None if self._watermark is None else self._watermark - self.max_staleness
+        batch = []
+        for document in self.repository.iter_created_after(created_after):
+            if created_after is not None and document["id"] in self._documents:
+                continue
+            batch.append(document)
+            # Batch tumbuh seiring isi view: tiap apply mengurutkan ulang indeks (O(N)), jadi load awal
+            # cukup O(log N) kali sort; memori batch paling banyak sebesar view itu sendiri
+            if len(batch) >= max(500, len(self._documents)):
+                self.apply(batch, [])
+                batch = []
+        self.apply(batch, [])
+        self.synced_at = started
+        self.loaded = True
+
+    def _overflow(self) -> None:
+        # Dipanggil dengan lock (bisa dari thread listener): koleksi tidak muat, semua baca kembali ke backend.
+        # Listener ditutup oleh thread view, bukan dari callback-nya sendiri
+        logger.warning(
+            f"Results view of '{self.repository.collection_name}' exceeds {self.max_bytes} bytes; "
+            "serving results from the storage backend."
+        )
+        self.overflowed = True
+        self._stopping.set()
+        self._documents.clear()
+        self._ids.clear()
+        self._ids_by_method.clear()
+        self._created.clear()
+        self.bytes = 0
+
+    def _clear(self) -> None:
+        with self._lock:
+            self._documents.clear()
+            self._ids.clear()
+            self._ids_by_method.clear()
+            self._created.clear()
+            self.bytes = 0
+            self._watermark = None
+        self.loaded = False
+
+    def _remove(self, document_id: str) -> None:
+        entry = self._documents.pop(document_id, None)
+        if entry is None:
+            return
+        created_at, document, size = entry
+        self._discard(self._ids, document_id)
+        self._discard(self._ids_by_method.get(document.get("method"), []), document_id)
+        self._discard(self._created, (created_at, document_id))
+        self.bytes -= size
+
+    @staticmethod
+    def _discard(items: list, item) -> None:
+        i = bisect.bisect_left(items, item)
+        if i < len(items) and items[i] == item:
+            del items[i]
+
+    @staticmethod
+    def _ids_after(ids: list, start_after: str | None):
+        start = bisect.bisect_right(ids, start_after) if start_after else 0
+        return (ids[i] for i in range(start, len(ids)))
+
+    @staticmethod
+    def _stored_matrix(value):
+        # Disimpan sebagai array float64 (8 byte per sel), bukan list Python (~32 byte per sel)
+        if isinstance(value, list):
+            try:
+                return np.asarray(value, dtype=float)
+            except ValueError:
+                return value
+        return value
+
+    @staticmethod
+    def _sizeof(value) -> int:
+        if isinstance(value, np.ndarray):
+            return value.nbytes
+        if isinstance(value, dict):
+            return sys.getsizeof(value) + sum(sys.getsizeof(k) + ResultsView._sizeof(v) for k, v in value.items())
+        if isinstance(value, (list, tuple)):
+            return sys.getsizeof(value) + sum(ResultsView._sizeof(v) for v in value)
+        return sys.getsizeof(value)
+
+
+_views = {}
+_views_lock = threading.Lock()
+
+
+def view_mode() -> str:
+    """
+    ``listen`` or ``poll`` for ``Config.RESULTS_VIEW``; ``auto`` listens on Firestore outside the emulator.
+    """
+    if Config.RESULTS_VIEW != "auto":
+        return Config.RESULTS_VIEW
+    if Config.STORAGE_BACKEND == "firestore" and not os.environ.get("FIRESTORE_EMULATOR_HOST"):
+        return "listen"
+    return "poll"
+
+
+def get_results_view(collection_name: str = "results") -> ResultsView | None:
+    """
+    The results view of ``collection_name`` in this process, or ``None`` when ``RESULTS_VIEW=off``.
+    """
+    if Config.RESULTS_VIEW == "off":
+        return None
+    view = _views.get(collection_name)
+    if view is None:
+        with _views_lock:
+            view = _views.get(collection_name)
+            if view is None:
+                view = ResultsView(Connection.get_repository(collection_name), view_mode())
+                _views[collection_name] = view
+    return view
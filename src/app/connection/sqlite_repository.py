@@ -0,0 +1,119 @@
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+
+from app.connection.matrix_codec import MatrixCodec
+from app.connection.repository import ResultRepository
+from app.utils.config import Config
+
+_TABLE_NAME = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+
+
+class SQLiteRepository(ResultRepository):
+    """
+    Results in a local SQLite database (``Config.SQLITE_PATH``), one table per collection.
+
+    The database runs in WAL mode so readers do not block the writer. Rows
+    are keyed by the document ID (the input hash) and indexed by
+    ``(method, id)`` for the filtered, ID-ordered pages of ``/results`` and
+    by ``created_at``. The matrix is stored as one BLOB, without chunks.
+    Connections are per thread and re-opened after a fork.
+    """
+
+    def __init__(self, collection_name: str, path: str | None = None) -> None:
+        if not _TABLE_NAME.fullmatch(collection_name):
+            raise ValueError(f"Invalid collection name '{collection_name}' for SQLite.")
+        super().__init__(collection_name)
+        self.path = path or Config.SQLITE_PATH
+        self._local = threading.local()
+
+    def save(self, documents: dict) -> int:
+        now = time.time()
+        rows = []
+        for document_id, (data, chunks) in documents.items():
+            document = dict(data)
+            document["decision_matrix"], payload = MatrixCodec.split_payload(data.get("decision_matrix"), chunks)
+            rows.append((document_id, data["method"], now, json.dumps(document), payload))
+
+        connection = self._connection()
+        # Satu transaksi untuk semua baris; ID yang sudah ada dilewati (sama seperti set_counted)
+        with connection:
+            before = connection.total_changes
+            connection.executemany(
+                f"INSERT OR IGNORE INTO {self.collection_name} (id, method, created_at, document, matrix) "
+                "VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+            return connection.total_changes - before
+
+    def iter_results(self, methods=None, limit: int | None = None, start_after: str | None = None, fields=None):
+        conditions = []
+        parameters = []
+        if methods:
+            methods = list(methods)
+            conditions.append(f"method IN ({', '.join('?' * len(methods))})")
+            parameters.extend(methods)
+        if start_after:
+            conditions.append("id > ?")
+            parameters.append(start_after)
+
+        sql = " WHERE " + " AND ".join(conditions) if conditions else ""
+        sql += " ORDER BY id"
+        if limit:
+            sql += " LIMIT ?"
+            parameters.append(limit)
+        yield from self._select(sql, parameters, fields)
+
+    def iter_created_after(self, created_after: float | None = None):
+        # Memakai index created_at
+        if created_after is None:
+            yield from self._select(" ORDER BY created_at, id", [])
+        else:
+            yield from self._select(" WHERE created_at >= ? ORDER BY created_at, id", [created_after])
+
+    def _select(self, clauses: str, parameters: list, fields=None):
+        decode_matrix = not fields or "decision_matrix" in fields
+        sql = f"SELECT id, created_at, document{', matrix' if decode_matrix else ''} FROM {self.collection_name}"
+        for row in self._connection().execute(sql + clauses, parameters):
+            data = json.loads(row[2])
+            data["created_at"] = row[1]
+            if decode_matrix:
+                data["decision_matrix"] = MatrixCodec.decode_payload(data.get("decision_matrix"), row[3])
+            if fields:
+                data = {field: data[field] for field in fields if field in data}
+            data["id"] = row[0]
+            yield data
+
+    def count(self) -> int:
+        return self._connection().execute(f"SELECT COUNT(*) FROM {self.collection_name}").fetchone()[0]
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is not None and self._local.pid == os.getpid():
+            return connection
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        connection = sqlite3.connect(self.path, timeout=Config.SQLITE_TIMEOUT)
+        connection.execute("PRAGMA journal_mode=WAL")
+        # WAL + NORMAL: commit tidak menunggu fsync, data tetap konsisten setelah crash
+        connection.execute("PRAGMA synchronous=NORMAL")
+        table = self.collection_name
+        connection.executescript(f"""
+            CREATE TABLE IF NOT EXISTS {table} (
+                id TEXT PRIMARY KEY,
+                method TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                document TEXT NOT NULL,
+                matrix BLOB
+            );
+            CREATE INDEX IF NOT EXISTS {table}_method_id ON {table} (method, id);
+            CREATE INDEX IF NOT EXISTS {table}_created_at ON {table} (created_at);
+        """)
+        self._local.connection = connection
+        self._local.pid = os.getpid()
+        return connection
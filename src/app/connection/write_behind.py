@@ -0,0 +1,180 @@
+import atexit
+import logging
+import os
+import queue
+import threading
+import time
+
+from app.connection.counter import MAX_BATCH_WRITES
+from app.connection.repository import StorageUnavailableError
+from app.utils.config import Config
+
+logger = logging.getLogger(__name__)
+
+
+class WriteBehindQueue:
+    """
+    Bounded in-process queue that commits documents to their repository in batches.
+
+    Writes are grouped into one commit per ``batch_size`` documents or
+    per ``flush_interval`` seconds, whichever comes first. When the queue is
+    full the write falls back to a synchronous commit. While the backend is
+    unavailable (``StorageUnavailableError``) the worker puts the batch back
+    and tries again after ``flush_interval``.
+    """
+
+    def __init__(
+        self,
+        max_size: int = Config.WRITE_BEHIND_MAX_SIZE,
+        batch_size: int = Config.WRITE_BEHIND_BATCH_SIZE,
+        flush_interval: float = Config.WRITE_BEHIND_FLUSH_INTERVAL,
+    ) -> None:
+        # Satu slot batch dipakai untuk update counter dokumen
+        self.batch_size = min(batch_size, MAX_BATCH_WRITES - 1)
+        self.flush_interval = flush_interval
+        self._queue = queue.Queue(maxsize=max_size)
+        self._lock = threading.Lock()
+        self._thread = None
+        self._pid = None
+        self._stopping = threading.Event()
+        self.committed = 0
+        self.overflowed = 0
+        self.failed = 0
+        self.deferred = 0
+
+    @property
+    def depth(self) -> int:
+        return self._queue.qsize()
+
+    def stats(self) -> dict:
+        return {
+            "queue_depth": self.depth,
+            "capacity": self._queue.maxsize,
+            "committed": self.committed,
+            "overflowed": self.overflowed,
+            "failed": self.failed,
+            "deferred": self.deferred,
+        }
+
+    def enqueue(self, repository, document_id: str, data: dict, chunks: list | None = None) -> None:
+        self._ensure_worker()
+        try:
+            self._queue.put_nowait((repository, document_id, data, chunks))
+        except queue.Full:
+            # Antrian penuh: tulis langsung agar data tidak hilang
+            self.overflowed += 1
+            self._commit([(repository, document_id, data, chunks)], task_done=False)
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """
+        Block until every queued write has been committed (or ``timeout`` passes).
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self._queue.unfinished_tasks:
+            if self._thread is None or not self._thread.is_alive():
+                # Worker belum jalan (atau sudah berhenti): kosongkan di thread ini
+                self._drain(block=False)
+                continue
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+    def close(self, timeout: float | None = None) -> bool:
+        flushed = self.flush(timeout)
+        self._stopping.set()
+        return flushed
+
+    def _ensure_worker(self) -> None:
+        # Thread dibuat ulang setelah fork (gunicorn) karena thread tidak ikut ter-fork
+        if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._stopping.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="write-behind", daemon=True
+            )
+            self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stopping.is_set():
+            self._drain(block=True)
+
+    def _drain(self, block: bool) -> None:
+        pending = []
+        deadline = time.monotonic() + self.flush_interval
+        while len(pending) < self.batch_size:
+            timeout = deadline - time.monotonic()
+            try:
+                if block and timeout > 0:
+                    pending.append(self._queue.get(timeout=timeout))
+                else:
+                    pending.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        if pending:
+            self._commit(pending)
+
+    def _commit(self, pending: list, task_done: bool = True) -> None:
+        try:
+            # Kelompokkan per repository: satu transaksi (atau satu bulk insert) per koleksi
+            by_repository = {}
+            for repository, document_id, data, chunks in pending:
+                by_repository.setdefault(id(repository), (repository, {}))[1][document_id] = (data, chunks)
+            for repository, documents in by_repository.values():
+                repository.save(documents)
+            self.committed += len(pending)
+        except StorageUnavailableError as e:
+            if threading.current_thread() is not self._thread:
+                # Commit langsung (antrian penuh / flush tanpa worker): tidak ada yang mengulang
+                self.failed += len(pending)
+                logger.error("Write-behind commit failed for %d documents: %s", len(pending), e)
+                return
+            logger.warning("Storage unavailable, retrying %d queued documents later: %s", len(pending), e)
+            self._requeue(pending)
+            self._stopping.wait(self.flush_interval)
+        except Exception as e:
+            self.failed += len(pending)
+            logger.error("Write-behind commit failed for %d documents: %s", len(pending), e)
+        finally:
+            if task_done:
+                for _ in pending:
+                    self._queue.task_done()
+
+
+    def _requeue(self, pending: list) -> None:
+        # Dokumen dikembalikan ke antrian; yang tidak muat lagi dihitung gagal
+        for index, item in enumerate(pending):
+            try:
+                self._queue.put_nowait(item)
+            except queue.Full:
+                self.failed += len(pending) - index
+                logger.error("Write-behind queue is full, dropping %d documents.", len(pending) - index)
+                break
+            self.deferred += 1
+
+
+_write_behind = None
+_write_behind_lock = threading.Lock()
+
+
+def get_write_behind() -> WriteBehindQueue:
+    global _write_behind
+    if _write_behind is None:
+        with _write_behind_lock:
+            if _write_behind is None:
+                _write_behind = WriteBehindQueue()
+                atexit.register(flush_write_behind, Config.WRITE_BEHIND_FLUSH_INTERVAL * 10)
+    return _write_behind
+
+
+def flush_write_behind(timeout: float | None = None) -> bool:
+    """
+    Flush pending writes if the queue was ever used; called on worker shutdown.
+    """
+    if _write_behind is None:
+        return True
+    return _write_behind.close(timeout)
@@ -0,0 +1,27 @@
+from typing import Literal
+from flask import jsonify
+from flask.wrappers import Response
+from app.models.bulk import BulkCalculation
+from app.utils.payload import payload_response, request_payload
+from app.utils.request_options import dtype_option, persist_mode, request_trace, with_trace
+
+
+def bulk_response(calculation_model, method_name: str) -> tuple[Response, Literal[200]] | tuple[Response, Literal[400]]:
+    """
+    Shared handler for ``/saw/bulk`` and ``/wp/bulk``.
+
+    Invalid problems do not fail the request: their entry in ``results`` is
+    ``{"message": ...}`` and ``errors`` counts them. Only an invalid request
+    (no ``problems`` list, too many problems or cells) is a 400.
+    """
+    try:
+        data = request_payload()
+        with request_trace() as trace:
+            results = BulkCalculation.run(
+                calculation_model, method_name, data.get("problems"), persist_mode(data), dtype_option(data)
+            )
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
+
+    errors = sum(1 for result in results if "message" in result)
+    return payload_response(with_trace({"results": results, "errors": errors}, trace))
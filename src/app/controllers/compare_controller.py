@@ -0,0 +1,29 @@
+from typing import Literal
+from flask import Blueprint, request, jsonify
+from flask.wrappers import Response
+from app.models.methods import compare_methods
+from app.utils.request_options import request_trace, with_trace
+
+compare_bp = Blueprint("compare_bp", __name__)
+
+
+@compare_bp.route("", methods=["POST"])
+def compare() -> tuple[Response, Literal[400]] | tuple[Response, Literal[200]]:
+    data = request.json
+    # Daftar method bisa dari query string (?methods=saw,wp) atau body JSON
+    methods = request.args.get("methods")
+    methods = [m for m in methods.split(",") if m] if methods else data.get("methods")
+
+    try:
+        with request_trace() as trace:
+            result = compare_methods(
+                data["decision_matrix"],
+                criteria=data.get("criteria"),
+                criteria_weights=data.get("criteria_weights"),
+                criteria_types=data.get("criteria_types"),
+                methods=methods,
+            )
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
+
+    return jsonify(with_trace(result, trace)), 200
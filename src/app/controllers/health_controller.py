@@ -0,0 +1,82 @@
+from typing import Literal
+from flask import Blueprint, jsonify
+from flask.wrappers import Response
+from app.connection.connection import Connection
+from app.connection.resilience import FirestoreGuard
+from app.connection.results_view import get_results_view
+from app.connection.write_behind import get_write_behind
+from app.models.decision_session import session_store
+from app.utils.cache import result_cache
+from app.utils.metrics import metrics
+from app.utils.startup import startup_timer
+
+health_bp = Blueprint("health_bp", __name__)
+
+
+@health_bp.route("/")
+def home() -> tuple[Response, Literal[200]] | tuple[Response, Literal[500]]:
+    try:
+        # Firestore: dibaca dari dokumen counter (satu read, tidak tergantung ukuran koleksi)
+        doc_count = Connection.get_repository("results").count()
+        return (
+            jsonify(
+                {
+                    "message": f"Connected successfully! Collection has {doc_count} documents."
+                }
+            ),
+            200,
+        )
+    except Exception as e:
+        return jsonify({"error": f"Connection failed: {str(e)}"}), 500
+
+
+@health_bp.route("/healthz")
+def liveness() -> tuple[Response, Literal[200]]:
+    # Liveness probe tanpa I/O database
+    return jsonify({"status": "ok"}), 200
+
+
+@health_bp.route("/persistence")
+def persistence_stats() -> tuple[Response, Literal[200]]:
+    # Kedalaman antrian write-behind untuk monitoring
+    return jsonify(get_write_behind().stats()), 200
+
+
+@health_bp.route("/firestore")
+def firestore_stats() -> tuple[Response, Literal[200]]:
+    # Status circuit breaker dan jumlah retry/kegagalan Firestore di worker ini
+    return jsonify(FirestoreGuard.stats()), 200
+
+
+@health_bp.route("/cache")
+def cache_stats() -> tuple[Response, Literal[200]]:
+    # Hit/miss dan ukuran cache hasil perhitungan worker ini
+    return jsonify(result_cache.stats()), 200
+
+
+@health_bp.route("/results-view")
+def results_view_stats() -> tuple[Response, Literal[200]]:
+    # Ukuran dan kesegaran materialized view /results di worker ini
+    view = get_results_view("results")
+    return jsonify(view.stats() if view is not None else {"mode": "off"}), 200
+
+
+@health_bp.route("/sessions")
+def session_stats() -> tuple[Response, Literal[200]]:
+    # Jumlah dan ukuran sesi slider bobot di worker ini
+    return jsonify(session_store.stats()), 200
+
+
+@health_bp.route("/debug/startup")
+def startup_report() -> tuple[Response, Literal[200]]:
+    # Waktu import dan fase startup worker ini
+    return jsonify(startup_timer.report()), 200
+
+
+@health_bp.route("/metrics")
+def prometheus_metrics() -> tuple[Response, Literal[200]] | tuple[Response, Literal[503]]:
+    # Format teks Prometheus; dengan PROMETHEUS_MULTIPROC_DIR berisi gabungan semua worker
+    if not metrics.enabled:
+        return jsonify({"message": "Metrics are disabled (METRICS_ENABLED=0 or prometheus_client not installed)."}), 503
+    body, content_type = metrics.render()
+    return Response(body, content_type=content_type), 200
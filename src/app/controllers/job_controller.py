@@ -0,0 +1,65 @@
+from typing import Literal
+from flask import Blueprint, jsonify
+from flask.wrappers import Response
+from app.models.jobs import cancel_job, job_store
+from app.utils.payload import payload_response
+
+job_bp = Blueprint("job_bp", __name__)
+
+
+def _job_not_found(job_id: str) -> tuple[Response, Literal[404]]:
+    return jsonify({"message": f"Job '{job_id}' not found or expired."}), 404
+
+
+@job_bp.route("", methods=["GET"])
+def job_stats() -> tuple[Response, Literal[200]]:
+    # Jumlah job per status di worker ini
+    return jsonify(job_store.stats()), 200
+
+
+@job_bp.route("/<job_id>", methods=["GET"])
+def job_status(job_id: str) -> tuple[Response, Literal[200]] | tuple[Response, Literal[404]]:
+    job = job_store.get(job_id)
+    if job is None:
+        return _job_not_found(job_id)
+    return jsonify(job.to_dict()), 200
+
+
+@job_bp.route("/<job_id>/result", methods=["GET"])
+def job_result(job_id: str) -> tuple[Response, Literal[200]] | tuple[Response, Literal[202]] | tuple[Response, Literal[400]] | tuple[Response, Literal[404]] | tuple[Response, Literal[409]] | tuple[Response, Literal[500]]:
+    """
+    Scores of a finished job, in the same formats as the calculate endpoints (``Accept``).
+
+    ``202`` while the job is queued or running; a failed job answers like the
+    calculate endpoint would have (``400`` for invalid input).
+    """
+    job = job_store.get(job_id)
+    if job is None:
+        return _job_not_found(job_id)
+
+    status = job.status
+    if status in ("queued", "running"):
+        return jsonify(job.to_dict()), 202
+    if status == "cancelled":
+        return jsonify({"message": f"Job '{job_id}' was cancelled."}), 409
+    error = job.future.exception()
+    if error is not None:
+        return jsonify({"message": str(error)}), 400 if isinstance(error, ValueError) else 500
+    return payload_response({"scores": job.result()})
+
+
+@job_bp.route("/<job_id>", methods=["DELETE"])
+def delete_job(job_id: str) -> tuple[Response, Literal[200]] | tuple[Response, Literal[404]] | tuple[Response, Literal[409]]:
+    """
+    Cancel a queued job, or discard the result of a finished one. A running job cannot be stopped.
+    """
+    job = job_store.get(job_id)
+    if job is None:
+        return _job_not_found(job_id)
+
+    if job.finished:
+        job_store.remove(job_id)
+        return jsonify({"message": "Job removed."}), 200
+    if not cancel_job(job):
+        return jsonify({"message": f"Job '{job_id}' is already running and cannot be cancelled."}), 409
+    return jsonify(job.to_dict()), 200
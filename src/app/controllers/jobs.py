@@ -0,0 +1,77 @@
+from typing import Literal
+from flask import jsonify, request, url_for
+from flask.wrappers import Response
+import numpy as np
+from app.models.jobs import JobLimitError, submit_job
+from app.utils.config import Config
+from app.utils.request_options import dtype_option, persist_mode
+
+
+def jobs_enabled() -> bool:
+    """
+    Jobs are kept in the worker that accepted them, so with more than one
+    gunicorn worker a poll of the status or result URL could reach a worker
+    that does not know the job; jobs then run only with ``GUNICORN_WORKERS=1``.
+    """
+    return Config.GUNICORN_WORKERS <= 1
+
+
+def job_requested(cells: int) -> bool:
+    """
+    ``?async=1`` always submits a job and ``?async=0`` never does; otherwise
+    matrices of at least ``JOB_ASYNC_MIN_CELLS`` cells run as a job, unless
+    jobs are disabled by several workers (then they are calculated directly).
+    """
+    value = request.args.get("async")
+    if value is not None:
+        return value in ("1", "true")
+    return jobs_enabled() and 0 < Config.JOB_ASYNC_MIN_CELLS <= cells
+
+
+def submission_cells(decision_matrix, criteria_weights=None) -> int:
+    """
+    Size of a calculate request in matrix cells, without building the matrix.
+
+    v1 uses the matrix shape, v2 the number of values of the first
+    alternative; batch requests are multiplied by the number of scenarios.
+    """
+    if hasattr(decision_matrix, "size"):
+        cells = decision_matrix.size
+    elif decision_matrix and isinstance(decision_matrix[0], dict):
+        cells = len(decision_matrix) * len(decision_matrix[0].get("criteria_scores") or ())
+    elif decision_matrix and isinstance(decision_matrix[0], (list, tuple)):
+        cells = len(decision_matrix) * len(decision_matrix[0])
+    else:
+        cells = len(decision_matrix or ())
+    if criteria_weights is not None and np.ndim(criteria_weights) == 2:
+        cells *= len(criteria_weights)
+    return cells
+
+
+def submit_job_response(method_name: str, arguments: dict, data: dict) -> tuple[Response, Literal[202]] | tuple[Response, Literal[400]] | tuple[Response, Literal[503]]:
+    """
+    Shared handler for calculate requests that run as a background job.
+
+    Responds ``202 Accepted`` with the job ID and the status/result URLs,
+    or ``400`` for ``?async=1`` when jobs are disabled by several workers.
+    """
+    if not jobs_enabled():
+        return jsonify({
+            "message": f"Background jobs are disabled with {Config.GUNICORN_WORKERS} gunicorn workers "
+            "(job status is kept in the worker that accepted the job); run with GUNICORN_WORKERS=1 or use ?async=0.",
+        }), 400
+
+    try:
+        job = submit_job(method_name, {**arguments, "dtype": dtype_option(data)}, persist_mode(data))
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
+    except JobLimitError as e:
+        return jsonify({"message": str(e)}), 503
+
+    response = jsonify({
+        **job.to_dict(),
+        "status_url": url_for("job_bp.job_status", job_id=job.id),
+        "result_url": url_for("job_bp.job_result", job_id=job.id),
+    })
+    response.headers["Location"] = url_for("job_bp.job_status", job_id=job.id)
+    return response, 202
@@ -0,0 +1,32 @@
+import json
+from typing import Literal
+from flask import Response as FlaskResponse, jsonify, stream_with_context
+from flask.wrappers import Response
+from app.connection.repository import StorageUnavailableError
+from app.connection.resilience import Deadline
+from app.utils.request_options import results_options, wants_ndjson
+
+
+def results_response(calculation_model, default_methods) -> tuple[Response, Literal[200]] | tuple[Response, Literal[400]] | tuple[Response, Literal[503]]:
+    """
+    Shared handler for ``/saw/results`` and ``/wp/results``: one JSON page, or NDJSON stream.
+    """
+    try:
+        options = results_options(default_methods)
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
+
+    if wants_ndjson():
+        # Satu dokumen per baris; memori dibatasi satu dokumen, bukan seluruh koleksi
+        def lines():
+            # Ekspor bisa lebih lama dari budget request; tiap panggilan tetap dibatasi FIRESTORE_CALL_TIMEOUT
+            with Deadline.scope(None):
+                for result in calculation_model.iter_results(**options):
+                    yield json.dumps(result, default=str) + "\n"
+
+        return FlaskResponse(stream_with_context(lines()), mimetype="application/x-ndjson"), 200
+
+    try:
+        return jsonify(calculation_model.get_results_page(**options)), 200
+    except StorageUnavailableError as e:
+        return jsonify({"message": str(e)}), 503
@@ -2,15 +2,37 @@ from typing import Literal
 from flask import Blueprint, request, jsonify
 from flask.wrappers import Response
 from app.models.calculation_model import CalculationModel
+from app.utils.payload import payload_response, request_payload
+from app.utils.request_options import dtype_option, persist_mode, request_trace, save_persist_mode, with_trace
+from app.controllers.bulk import bulk_response
+from app.controllers.jobs import job_requested, submission_cells, submit_job_response
+from app.controllers.results import results_response
+from app.controllers.sensitivity import sensitivity_response
+from app.controllers.upload import upload_response
+from app.controllers.sessions import (
+    close_session_response,
+    open_session_response,
+    save_session_response,
+    update_session_response,
+)
 import numpy as np
 
 saw_bp = Blueprint("saw_bp", __name__)
+# Nama method yang disimpan oleh endpoint di blueprint ini (filter default /results)
+SAW_METHODS = (
+    "simple_additive_weighting",
+    "simple_additive_weighting_with_subcriteria",
+    "simple_additive_weighting_batch",
+)
 calculation_model = CalculationModel()
 
 
 @saw_bp.route("/calculate", methods=["POST"])
 def calculate_saw() -> tuple[Response, Literal[400]] | tuple[Response, Literal[200]]:
-    data = request.json
+    try:
+        data = request_payload()
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
     criteria_weights = np.array(data["criteria_weights"])
     decision_matrix = np.array(data["decision_matrix"])
     criteria_types = data.get("criteria_types")  # Added criteria_types
@@ -25,42 +47,129 @@ def calculate_saw() -> tuple[Response, Literal[400]] | tuple[Response, Literal[2
             400,
         )
 
-    scores = calculation_model.simple_additive_weighting(
-        criteria_weights, decision_matrix, criteria_types
-    )
+    if job_requested(decision_matrix.size):
+        return submit_job_response(
+            "simple_additive_weighting",
+            {"criteria_weights": criteria_weights, "decision_matrix": decision_matrix, "criteria_types": criteria_types},
+            data,
+        )
 
-    return jsonify({"scores": scores.tolist()}), 200
+    try:
+        with request_trace() as trace:
+            scores = calculation_model.simple_additive_weighting(
+                criteria_weights, decision_matrix, criteria_types, persist_mode(data), dtype_option(data)
+            )
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
+
+    return payload_response(with_trace({"scores": scores}, trace))
+
+
+@saw_bp.route("/batch", methods=["POST"])
+def calculate_saw_batch() -> tuple[Response, Literal[400]] | tuple[Response, Literal[200]]:
+    try:
+        data = request_payload()
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
+    criteria_weights = data["criteria_weights"]  # S x C, satu baris per skenario
+    decision_matrix = data["decision_matrix"]
+    criteria_types = data.get("criteria_types")  # C atau S x C
+
+    if job_requested(submission_cells(decision_matrix, criteria_weights)):
+        return submit_job_response(
+            "simple_additive_weighting_batch",
+            {"criteria_weights": criteria_weights, "decision_matrix": decision_matrix, "criteria_types": criteria_types},
+            data,
+        )
+
+    try:
+        with request_trace() as trace:
+            scores = calculation_model.simple_additive_weighting_batch(
+                criteria_weights, decision_matrix, criteria_types, persist_mode(data), dtype_option(data)
+            )
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
+
+    return payload_response(with_trace({"scores": scores}, trace))
+
+
+@saw_bp.route("/bulk", methods=["POST"])
+def calculate_saw_bulk() -> tuple[Response, Literal[200]] | tuple[Response, Literal[400]]:
+    return bulk_response(calculation_model, "simple_additive_weighting")
 
 
 @saw_bp.route("/save", methods=["POST"])
-def save_saw_results() -> tuple[Response, Literal[201]]:
+def save_saw_results() -> tuple[Response, Literal[201]] | tuple[Response, Literal[400]]:
     data = request.json
     method_name = "simple_additive_weighting"
 
-    calculation_model.save_results(
-        method_name,
-        np.array(data["criteria_weights"]),
-        np.array(data["decision_matrix"]),
-        np.array(data["scores"]),
-    )
+    try:
+        calculation_model.save_results(
+            method_name,
+            np.array(data["criteria_weights"]),
+            np.array(data["decision_matrix"]),
+            np.array(data["scores"]),
+            save_persist_mode(data),
+        )
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
 
     return jsonify({"message": "Results saved successfully."}), 201
 
 
-@saw_bp.route("/results", methods=["GET"])
-def get_saw_results() -> tuple[Response, Literal[200]]:
-    results = calculation_model.get_results()
+@saw_bp.route("/upload", methods=["POST"])
+def upload_saw() -> tuple[Response, Literal[200]] | tuple[Response, Literal[400]]:
+    return upload_response("simple_additive_weighting")
+
+
+@saw_bp.route("/sensitivity", methods=["POST"])
+def saw_sensitivity() -> tuple[Response, Literal[200]] | tuple[Response, Literal[400]]:
+    return sensitivity_response(calculation_model, "simple_additive_weighting")
+
+
+@saw_bp.route("/sessions", methods=["POST"])
+def open_saw_session() -> tuple[Response, Literal[201]] | tuple[Response, Literal[400]]:
+    return open_session_response(calculation_model, "simple_additive_weighting")
+
+
+@saw_bp.route("/sessions/<session_id>", methods=["PATCH"])
+def update_saw_session(session_id: str) -> tuple[Response, Literal[200]] | tuple[Response, Literal[400]] | tuple[Response, Literal[404]]:
+    return update_session_response(calculation_model, "simple_additive_weighting", session_id)
+
 
-    return jsonify({"results": results}), 200
+@saw_bp.route("/sessions/<session_id>/save", methods=["POST"])
+def save_saw_session(session_id: str) -> tuple[Response, Literal[201]] | tuple[Response, Literal[400]] | tuple[Response, Literal[404]]:
+    return save_session_response(calculation_model, "simple_additive_weighting", session_id)
+
+
+@saw_bp.route("/sessions/<session_id>", methods=["DELETE"])
+def close_saw_session(session_id: str) -> tuple[Response, Literal[200]] | tuple[Response, Literal[404]]:
+    return close_session_response("simple_additive_weighting", session_id)
+
+
+@saw_bp.route("/results", methods=["GET"])
+def get_saw_results() -> tuple[Response, Literal[200]] | tuple[Response, Literal[400]]:
+    return results_response(calculation_model, SAW_METHODS)
 
 @saw_bp.route("v2/calculate", methods=["POST"])
 def calculate_saw_with_subcriteria() -> tuple[Response, Literal[400]] | tuple[Response, Literal[200]]:
-    data = request.json
+    try:
+        data = request_payload()
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
     criteria = data["criteria"]
     decision_matrix = data["decision_matrix"]
 
+    if job_requested(submission_cells(decision_matrix)):
+        return submit_job_response(
+            "simple_additive_weighting_with_subcriteria", {"criteria": criteria, "decision_matrix": decision_matrix}, data
+        )
+
     try:
-        scores = calculation_model.simple_additive_weighting_with_subcriteria(criteria, decision_matrix)
-        return jsonify({"scores": scores}), 200
+        with request_trace() as trace:
+            scores = calculation_model.simple_additive_weighting_with_subcriteria(
+                criteria, decision_matrix, persist_mode(data), dtype_option(data)
+            )
+        return payload_response(with_trace({"scores": scores}, trace))
     except ValueError as e:
         return jsonify({"message": str(e)}), 400
\ No newline at end of file
@@ -0,0 +1,40 @@
+from typing import Literal
+from flask import jsonify, request
+from flask.wrappers import Response
+from app.models.sensitivity import (
+    DEFAULT_CONCENTRATION,
+    DEFAULT_SAMPLES,
+    DEFAULT_SPREAD,
+    SensitivityAnalysis,
+)
+from app.utils.request_options import request_trace, with_trace
+
+
+def sensitivity_response(calculation_model, method: str) -> tuple[Response, Literal[200]] | tuple[Response, Literal[400]]:
+    """
+    Shared handler for ``/saw/sensitivity`` and ``/wp/sensitivity``; nothing is persisted.
+    """
+    data = request.json
+    try:
+        with request_trace() as trace:
+            # Matriks divalidasi dan dinormalisasi sekali, sama seperti sesi slider
+            session = calculation_model.open_session(
+                method,
+                data["decision_matrix"],
+                criteria=data.get("criteria"),
+                criteria_weights=data.get("criteria_weights"),
+                criteria_types=data.get("criteria_types"),
+            )
+            result = SensitivityAnalysis.run(
+                session,
+                samples=data.get("samples", DEFAULT_SAMPLES),
+                distribution=data.get("distribution", "dirichlet"),
+                concentration=data.get("concentration", DEFAULT_CONCENTRATION),
+                spread=data.get("spread", DEFAULT_SPREAD),
+                seed=data.get("seed"),
+            )
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
+
+    scores = session.scores if isinstance(session.scores, dict) else session.scores.tolist()
+    return jsonify(with_trace({"scores": scores, **result}, trace)), 200
@@ -0,0 +1,88 @@
+from typing import Literal
+from flask import jsonify, request
+from flask.wrappers import Response
+from app.models.decision_session import session_store
+from app.utils.request_options import request_trace, save_persist_mode, with_trace
+
+
+def _scores_json(scores):
+    return scores if isinstance(scores, dict) else scores.tolist()
+
+
+def _find_session(method: str, session_id: str):
+    # Sesi SAW tidak bisa dipakai lewat /wp dan sebaliknya
+    session = session_store.get(session_id)
+    if session is None or not session.method_name.startswith(method):
+        return None
+    return session
+
+
+def _session_not_found(session_id: str) -> tuple[Response, Literal[404]]:
+    return jsonify({"message": f"Session '{session_id}' not found or expired."}), 404
+
+
+def open_session_response(calculation_model, method: str) -> tuple[Response, Literal[201]] | tuple[Response, Literal[400]]:
+    """
+    Shared handler for ``POST /saw/sessions`` and ``POST /wp/sessions``.
+    """
+    data = request.json
+    try:
+        with request_trace() as trace:
+            session = calculation_model.open_session(
+                method,
+                data["decision_matrix"],
+                criteria=data.get("criteria"),
+                criteria_weights=data.get("criteria_weights"),
+                criteria_types=data.get("criteria_types"),
+            )
+        session_id = session_store.add(session)
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
+
+    return jsonify(with_trace({"session_id": session_id, "scores": _scores_json(session.scores)}, trace)), 201
+
+
+def update_session_response(calculation_model, method: str, session_id: str) -> tuple[Response, Literal[200]] | tuple[Response, Literal[400]] | tuple[Response, Literal[404]]:
+    """
+    Shared handler for ``PATCH .../sessions/<session_id>``: new weights in, scores out, nothing persisted.
+    """
+    session = _find_session(method, session_id)
+    if session is None:
+        return _session_not_found(session_id)
+
+    data = request.json
+    try:
+        with request_trace() as trace:
+            scores = calculation_model.score_session(
+                session, criteria_weights=data.get("criteria_weights"), criteria=data.get("criteria")
+            )
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
+
+    return jsonify(with_trace({"scores": _scores_json(scores)}, trace)), 200
+
+
+def save_session_response(calculation_model, method: str, session_id: str) -> tuple[Response, Literal[201]] | tuple[Response, Literal[400]] | tuple[Response, Literal[404]]:
+    """
+    Shared handler for ``POST .../sessions/<session_id>/save``: persist the latest scores.
+    """
+    session = _find_session(method, session_id)
+    if session is None:
+        return _session_not_found(session_id)
+
+    try:
+        calculation_model.save_session(session, save_persist_mode(request.get_json(silent=True)))
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
+
+    return jsonify({"message": "Results saved successfully."}), 201
+
+
+def close_session_response(method: str, session_id: str) -> tuple[Response, Literal[200]] | tuple[Response, Literal[404]]:
+    """
+    Shared handler for ``DELETE .../sessions/<session_id>``.
+    """
+    if _find_session(method, session_id) is None:
+        return _session_not_found(session_id)
+    session_store.remove(session_id)
+    return jsonify({"message": "Session closed."}), 200
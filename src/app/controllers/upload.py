@@ -0,0 +1,94 @@
+import json
+import os
+from typing import Literal
+from flask import Response as FlaskResponse, jsonify, request, stream_with_context
+from flask.wrappers import Response
+from app.models.upload_scoring import INPUT_FORMATS, TopK, UploadScoring, spool_upload
+from app.utils.config import Config
+from app.utils.metrics import metrics
+
+DEFAULT_TOP_K = 10
+
+
+def _list_arg(name: str) -> list[str]:
+    value = request.args.get(name)
+    if not value:
+        raise ValueError(f"Query parameter '{name}' is required (comma-separated).")
+    return [item.strip() for item in value.split(",")]
+
+
+def _upload_options() -> dict:
+    try:
+        criteria_weights = [float(weight) for weight in _list_arg("criteria_weights")]
+    except ValueError as e:
+        raise ValueError(f"Invalid criteria_weights: {e}")
+
+    input_format = request.args.get("input") or INPUT_FORMATS.get(request.mimetype)
+    if input_format is None:
+        raise ValueError(
+            f"Unsupported Content-Type '{request.mimetype}'. Use text/csv, application/x-ndjson or application/x-npy."
+        )
+
+    k = request.args.get("k", DEFAULT_TOP_K)
+    try:
+        k = int(k)
+    except ValueError:
+        raise ValueError(f"Invalid k '{k}', expected an integer.")
+    if not (1 <= k <= Config.UPLOAD_MAX_TOP_K):
+        raise ValueError(f"k must be between 1 and {Config.UPLOAD_MAX_TOP_K}.")
+
+    return {
+        "criteria_weights": criteria_weights,
+        "criteria_types": _list_arg("criteria_types"),
+        "input_format": input_format,
+        "header": request.args.get("header") in ("1", "true"),
+        "k": k,
+        "full_scores": request.args.get("full_scores") in ("1", "true"),
+    }
+
+
+def upload_response(method: str) -> tuple[Response, Literal[200]] | tuple[Response, Literal[400]]:
+    """
+    Shared handler for ``/saw/upload`` and ``/wp/upload``.
+
+    The request body is the raw file; weights, types and ``k`` come from the
+    query string. Returns the top-k rows, or with ``full_scores=1`` an NDJSON
+    stream of every ``{"index", "score"}`` followed by a ``{"top_k"}`` line.
+    Nothing is persisted.
+    """
+    path = None
+    try:
+        options = _upload_options()
+        with metrics.stage("parse", request.endpoint):
+            path = spool_upload(request.stream, suffix=f".{options['input_format']}")
+        scoring = UploadScoring(
+            method, path, options["input_format"], options["criteria_weights"],
+            options["criteria_types"], options["header"],
+        )
+        scoring.prepare()
+        if not options["full_scores"]:
+            top_k = scoring.top_k(options["k"])
+    except ValueError as e:
+        if path is not None:
+            os.remove(path)
+        return jsonify({"message": str(e)}), 400
+
+    if not options["full_scores"]:
+        os.remove(path)
+        return jsonify({"rows": scoring.rows, "top_k": top_k}), 200
+
+    def lines():
+        # File sementara dihapus setelah stream selesai (atau dibatalkan client)
+        try:
+            top = TopK(options["k"])
+            for indices, scores in scoring.iter_scores():
+                top.push(indices, scores)
+                yield "".join(
+                    json.dumps({"index": int(index), "score": float(score)}) + "\n"
+                    for index, score in zip(indices, scores)
+                )
+            yield json.dumps({"rows": scoring.rows, "top_k": top.result()}) + "\n"
+        finally:
+            os.remove(path)
+
+    return FlaskResponse(stream_with_context(lines()), mimetype="application/x-ndjson"), 200
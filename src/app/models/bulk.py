@@ -0,0 +1,208 @@
+import numpy as np
+
+from app.models.calculation_model import CalculationModel
+from app.models.kernels import ScoringKernels
+from app.utils.cache import content_hash
+from app.utils.config import Config
+from app.utils.metrics import metrics
+from app.utils.trace import trace_stage
+
+BULK_METHODS = ("simple_additive_weighting", "weighted_product")
+
+
+class BulkProblems:
+    """
+    Independent small decision problems packed into padded tensors.
+
+    Every problem is ``{"decision_matrix", "criteria_weights", "criteria_types"}``
+    with its own number of alternatives and criteria. ``matrices`` is
+    P x A x C with A and C the largest sizes in the request; padded cells
+    hold 1.0 so that ``1 / x`` and ``log(x)`` stay finite, padded criteria
+    get weight 0 and ``alternative_mask`` (P x A) marks the real
+    alternatives. A problem that fails validation stays all padding and its
+    message is kept in ``errors`` (index -> message).
+    """
+
+    def __init__(self, problems, dtype: np.dtype) -> None:
+        if not isinstance(problems, list) or not problems:
+            raise ValueError("'problems' must be a non-empty list of decision problems.")
+        if len(problems) > Config.BULK_MAX_PROBLEMS:
+            raise ValueError(
+                f"Too many problems ({len(problems)}); at most {Config.BULK_MAX_PROBLEMS} per request."
+            )
+
+        self.errors = {}
+        # Banyak masalah memakai daftar tipe yang sama: mask cost dihitung sekali per daftar
+        self._cost_masks = {}
+        # (criteria_weights, decision_matrix, criteria_types, is_cost) per masalah yang valid
+        self.inputs = [None] * len(problems)
+        for index, problem in enumerate(problems):
+            try:
+                self.inputs[index] = self._parse(problem, dtype)
+            except (ValueError, TypeError) as e:
+                self.errors[index] = str(e)
+
+        shapes = [inputs[1].shape for inputs in self.inputs if inputs is not None]
+        n_alternatives = max((shape[0] for shape in shapes), default=0)
+        n_criteria = max((shape[1] for shape in shapes), default=0)
+        cells = len(problems) * n_alternatives * n_criteria
+        if cells > Config.BULK_MAX_CELLS:
+            raise ValueError(
+                f"The padded problems ({len(problems)} x {n_alternatives} x {n_criteria} = {cells} cells) exceed "
+                f"{Config.BULK_MAX_CELLS} cells; split the request or group problems of similar size."
+            )
+
+        self.matrices = np.ones((len(problems), n_alternatives, n_criteria), dtype)
+        self.weights = np.zeros((len(problems), n_criteria))
+        self.is_cost = np.zeros((len(problems), n_criteria), dtype=bool)
+        self.alternative_mask = np.zeros((len(problems), n_alternatives), dtype=bool)
+        for index, inputs in enumerate(self.inputs):
+            if inputs is None:
+                continue
+            criteria_weights, decision_matrix, _, is_cost = inputs
+            rows, columns = decision_matrix.shape
+            self.matrices[index, :rows, :columns] = decision_matrix
+            self.weights[index, :columns] = criteria_weights
+            self.is_cost[index, :columns] = is_cost
+            self.alternative_mask[index, :rows] = True
+
+    def fail(self, index: int, message: str) -> None:
+        self.errors[int(index)] = message
+
+    def valid(self, index: int) -> bool:
+        return int(index) not in self.errors
+
+    def _parse(self, problem, dtype: np.dtype) -> tuple:
+        if not isinstance(problem, dict):
+            raise ValueError("A problem must be an object with decision_matrix, criteria_weights and criteria_types.")
+        for key in ("decision_matrix", "criteria_weights"):
+            if key not in problem:
+                raise ValueError(f"Missing '{key}'.")
+
+        try:
+            criteria_weights = np.array(problem["criteria_weights"], dtype=float)
+            decision_matrix = np.asarray(problem["decision_matrix"], dtype=dtype)
+        except (ValueError, TypeError):
+            raise ValueError("The decision matrix and criteria weights must be numeric, with rows of equal length.")
+        if decision_matrix.ndim != 2 or 0 in decision_matrix.shape:
+            raise ValueError("The decision matrix must be a non-empty list of rows.")
+        if criteria_weights.shape != (decision_matrix.shape[1],):
+            raise ValueError(
+                "The number of criteria weights must match the number of columns in the decision matrix."
+            )
+        criteria_types = problem.get("criteria_types")
+        key = tuple(criteria_types) if isinstance(criteria_types, list) else None
+        is_cost = self._cost_masks.get(key)
+        if is_cost is None or is_cost.shape != (decision_matrix.shape[1],):
+            is_cost = CalculationModel._cost_mask(criteria_types, decision_matrix.shape[1])
+            if key is not None:
+                self._cost_masks[key] = is_cost
+        return criteria_weights, decision_matrix, criteria_types, is_cost
+
+
+class BulkCalculation:
+    """
+    SAW or WP scores of many independent problems in one vectorized pass.
+
+    Validation errors are reported per problem, in input order, instead of
+    failing the request. Scores match ``/calculate`` for the same problem,
+    and so do the document IDs: results are persisted with one repository
+    write for the whole request (``persist=async``: through write-behind).
+    """
+
+    @staticmethod
+    def run(
+        calculation_model: CalculationModel, method_name: str, problems, persist: str | None = None,
+        dtype: str | None = None,
+    ) -> list:
+        """
+        ``[{"scores": [...]}, {"message": "..."}, ...]``, one entry per problem.
+        """
+        if method_name not in BULK_METHODS:
+            raise ValueError(f"Unknown bulk method '{method_name}'. Expected one of: {', '.join(BULK_METHODS)}.")
+        persist = calculation_model.resolve_persist(persist)
+        dtype = calculation_model.resolve_dtype(dtype)
+
+        with trace_stage(f"{method_name}.bulk.validate", stage="validate"):
+            bulk = BulkProblems(problems, dtype)
+        metrics.observe_matrix(f"{method_name}_bulk", bulk.matrices.shape)
+
+        with trace_stage(f"{method_name}.bulk.score", bulk.matrices.shape):
+            if method_name == "simple_additive_weighting":
+                scores, weights = BulkCalculation._simple_additive_weighting(bulk)
+            else:
+                scores, weights = BulkCalculation._weighted_product(bulk)
+
+        results = []
+        documents = {}
+        for index, inputs in enumerate(bulk.inputs):
+            if not bulk.valid(index):
+                results.append({"message": bulk.errors[index]})
+                continue
+            criteria_weights, decision_matrix, criteria_types, _ = inputs
+            n_alternatives, n_criteria = decision_matrix.shape
+            problem_scores = scores[index, :n_alternatives].copy()
+            results.append({"scores": problem_scores})
+            if persist != "none":
+                # ID dokumen sama dengan /calculate untuk masalah yang sama (hash input, bukan hasil)
+                document_id = content_hash(
+                    method_name, criteria_weights, criteria_types, decision_matrix,
+                    *calculation_model._dtype_key(dtype),
+                )
+                documents[document_id] = (
+                    method_name, weights[index, :n_criteria].copy(), decision_matrix, problem_scores,
+                )
+
+        calculation_model.save_results_many(documents, persist)
+        return results
+
+    @staticmethod
+    def _simple_additive_weighting(bulk: BulkProblems) -> tuple[np.ndarray, np.ndarray]:
+        # Statistik kolom per masalah, hanya dari alternatif yang asli (bukan padding)
+        mask = bulk.alternative_mask[:, :, None]
+        col_min = bulk.matrices.min(axis=1, initial=np.inf, where=mask)
+        col_max = bulk.matrices.max(axis=1, initial=-np.inf, where=mask)
+
+        invalid = (bulk.is_cost & (col_min == 0)) | (~bulk.is_cost & (col_max == 0))
+        for index in np.flatnonzero(invalid.any(axis=1)):
+            if not bulk.valid(index):
+                continue
+            try:
+                CalculationModel._check_saw_stats(bulk.is_cost[index], col_min[index], col_max[index])
+            except ValueError as e:
+                bulk.fail(index, str(e))
+
+        scores = ScoringKernels.saw_bulk(bulk.matrices, bulk.weights, bulk.is_cost, col_min, col_max)
+        return scores, bulk.weights
+
+    @staticmethod
+    def _weighted_product(bulk: BulkProblems) -> tuple[np.ndarray, np.ndarray]:
+        # Padding bernilai 1, jadi nol hanya berasal dari sel yang asli
+        zero_cost = bulk.is_cost & (bulk.matrices == 0).any(axis=1)
+        for index in np.flatnonzero(zero_cost.any(axis=1)):
+            if bulk.valid(index):
+                i = np.flatnonzero(zero_cost[index])[0]
+                bulk.fail(index, f"Zero value found in cost criterion at index {i}, cannot divide by zero.")
+
+        # Normalisasi bobot per masalah; masalah yang gagal validasi (bobot 0) diabaikan
+        with np.errstate(divide="ignore", invalid="ignore"):
+            weights = bulk.weights / bulk.weights.sum(axis=1, keepdims=True)
+        signed_weights = np.where(bulk.is_cost, -weights, weights)
+
+        log_scores = ScoringKernels.wp_log_scores_bulk(signed_weights, bulk.matrices)
+        finite = (np.isfinite(log_scores) | ~bulk.alternative_mask).all(axis=1)
+        log_scores[~finite] = 0.0
+        # Alternatif padding mendapat exp(-inf) = 0, jadi tidak ikut dalam jumlah normalisasi
+        log_scores[~bulk.alternative_mask] = -np.inf
+        with np.errstate(invalid="ignore"):
+            scores = ScoringKernels.normalize_log_scores(log_scores)
+
+        for index in np.flatnonzero(~finite):
+            if not bulk.valid(index):
+                continue
+            # Ada nilai 0 di kriteria benefit: jalur zero mask yang sama dengan /calculate
+            n_alternatives, n_criteria = bulk.inputs[index][1].shape
+            scores[index, :n_alternatives] = CalculationModel._weighted_product_kernel(
+                signed_weights[index, :n_criteria], bulk.matrices[index, :n_alternatives, :n_criteria]
+            )
+        return scores, weights
@@ -1,11 +1,36 @@
 import numpy as np
 from app.connection.connection import Connection
+from app.connection.matrix_codec import MatrixCodec
+from app.connection.repository import StorageUnavailableError
+from app.connection.results_view import get_results_view
+from app.connection.write_behind import get_write_behind
+from app.models.criteria_schema import CriteriaSchema
+from app.models.decision_session import DecisionSession
+from app.models.kernels import ScoringKernels
+from app.utils.cache import content_hash, result_cache
+from app.utils.config import Config
+from app.utils.metrics import metrics
+from app.utils.trace import trace_active, trace_stage, trace_value
 import json
+import logging
+import time
+
+logger = logging.getLogger(__name__)
 
 
 class CalculationModel:
-    def __init__(self) -> None:
-        self.collection = Connection.get_collection("results")
+    def __init__(self, collection_name: str = "results") -> None:
+        self.collection_name = collection_name
+
+    @property
+    def repository(self):
+        # Backend penyimpanan (firestore, sqlite, memory) dipilih lewat Config.STORAGE_BACKEND
+        return Connection.get_repository(self.collection_name)
+
+    def _results_source(self):
+        # Materialized view per worker (RESULTS_VIEW) jika sudah termuat dan cukup segar, selain itu backend
+        view = get_results_view(self.collection_name)
+        return view if view is not None and view.ready() else self.repository
 
    
 
@@ -14,110 +39,189 @@ class CalculationModel:
         """
         Retrieve results from the database.
         """
-        docs = self.collection.stream()
-        results = []
-        for doc in docs:
-            data = doc.to_dict()
-            if "decision_matrix" in data:
+        return list(self.iter_results())
+
+    def get_results_page(
+        self, methods=None, limit: int = Config.RESULTS_PAGE_SIZE, start_after: str | None = None, fields=None
+    ) -> dict:
+        """
+        Retrieve one page of results ordered by document ID.
+
+        ``next_cursor`` is the ID to pass as ``start_after`` for the next page,
+        or ``None`` when this was the last page.
+        """
+        results = [
+            self._decode_result(data)
+            for data in self._results_source().get_results(methods, limit, start_after, fields)
+        ]
+        next_cursor = results[-1]["id"] if len(results) == limit else None
+        return {"results": results, "next_cursor": next_cursor}
+
+    def iter_results(self, methods=None, limit: int | None = None, start_after: str | None = None, fields=None):
+        """
+        Stream decoded results, optionally filtered by method and projected to ``fields``.
+        """
+        for data in self._results_source().iter_results(methods, limit, start_after, fields):
+            yield self._decode_result(data)
+
+    @staticmethod
+    def _decode_result(data: dict) -> dict:
+        # Hasil batch menyimpan bobot dan skor 2D sebagai JSON string
+        for key in ("criteria_weights", "scores"):
+            if isinstance(data.get(key), str):
                 try:
-                    data["decision_matrix"] = json.loads(data["decision_matrix"])
+                    data[key] = json.loads(data[key])
                 except json.JSONDecodeError:
-                    data["decision_matrix"] = None
-            else:
-                data["decision_matrix"] = None
-            results.append(data)
-        return results
-        
+                    pass
+        return data
 
-    
     ###################################
     #### Model with Sub Criteria #####
     ###################################
 
+    @staticmethod
+    def resolve_persist(persist: str | None) -> str:
+        """
+        Validate ``persist`` (one of ``Config.PERSIST_MODES``); ``None`` uses ``Config.DEFAULT_PERSIST``.
+        """
+        persist = persist or Config.DEFAULT_PERSIST
+        if persist not in Config.PERSIST_MODES:
+            raise ValueError(
+                f"Unknown persist mode '{persist}'. Expected one of: {', '.join(Config.PERSIST_MODES)}."
+            )
+        return persist
+
+    @staticmethod
+    def resolve_dtype(dtype: str | None) -> np.dtype:
+        """
+        Validate ``dtype`` (one of ``Config.DTYPES``); ``None`` uses ``Config.DEFAULT_DTYPE``.
+        """
+        dtype = dtype or Config.DEFAULT_DTYPE
+        if dtype not in Config.DTYPES:
+            raise ValueError(f"Unknown dtype '{dtype}'. Expected one of: {', '.join(Config.DTYPES)}.")
+        return np.dtype(dtype)
+
+    @staticmethod
+    def _dtype_key(dtype: np.dtype) -> tuple:
+        # content_hash memakai bytes float64, jadi hasil float32 butuh kunci cache sendiri
+        return () if dtype == np.float64 else (dtype.name,)
+
     def save_results(
-        self, method_name: str, criteria_weights, decision_matrix, scores
+        self, method_name: str, criteria_weights, decision_matrix, scores, persist: str | None = None,
+        document_id: str | None = None,
     ) -> None:
         """
         Save the results of the calculation in the database.
+
+        The document ID is the content hash of the calculation, so saving the
+        same calculation twice does not create a second document.
         """
-        decision_matrix_str = json.dumps(decision_matrix.tolist())
+        persist = self.resolve_persist(persist)
+        if persist == "none":
+            return
+
+        if document_id is None:
+            document_id = content_hash(method_name, criteria_weights, decision_matrix, scores)
+        with trace_stage(f"{method_name}.persist.{persist}", decision_matrix.shape, stage="persist"):
+            self._persist(method_name, criteria_weights, decision_matrix, scores, persist, document_id)
+
+    def save_results_many(self, results: dict, persist: str | None = None) -> None:
+        """
+        Save ``{document_id: (method_name, criteria_weights, decision_matrix, scores)}`` with one repository write.
+
+        Used by the bulk endpoints; ``persist=async`` queues every document in the write-behind queue.
+        """
+        persist = self.resolve_persist(persist)
+        if persist == "none" or not results:
+            return
+        with trace_stage(f"bulk.persist.{persist}", (len(results),), stage="persist"):
+            self._persist_many(results, persist)
+
+    def _persist(self, method_name: str, criteria_weights, decision_matrix, scores, persist: str, document_id: str) -> None:
+        self._persist_many({document_id: (method_name, criteria_weights, decision_matrix, scores)}, persist)
+
+    def _persist_many(self, results: dict, persist: str) -> None:
+        documents = {document_id: self._document(*result) for document_id, result in results.items()}
+
+        if persist == "async":
+            for document_id, (data, chunks) in documents.items():
+                get_write_behind().enqueue(self.repository, document_id, data, chunks)
+            return
+
+        try:
+            self.repository.save(documents)
+        except StorageUnavailableError as e:
+            # Firestore tidak tersedia (deadline/circuit breaker): skor tetap dikembalikan,
+            # penyimpanan ditunda ke write-behind yang mengulang saat Firestore pulih
+            logger.warning(f"Deferring save of {len(documents)} result(s): {e}")
+            metrics.observe_deferred(self.collection_name, len(documents))
+            for document_id, (data, chunks) in documents.items():
+                get_write_behind().enqueue(self.repository, document_id, data, chunks)
+            return
+
+        view = get_results_view(self.collection_name)
+        if view is not None and view.loaded:
+            # Hasil yang disimpan worker ini langsung terlihat di /results worker yang sama
+            now = time.time()
+            for document_id, (data, _) in documents.items():
+                view.put(dict(data, id=document_id, decision_matrix=results[document_id][2], created_at=now))
+
+    @staticmethod
+    def _document(method_name: str, criteria_weights, decision_matrix, scores) -> tuple[dict, list]:
+        decision_matrix_data, chunks = MatrixCodec.encode(decision_matrix)
 
         # Tentukan format scores berdasarkan tipe data yang diterima
         if isinstance(scores, dict):
-            scores_data = scores 
+            # Skor float32 (dtype=float32) bukan float Python, jadi dikonversi sebelum disimpan
+            scores_data = {name: float(score) for name, score in scores.items()}
         else:
             scores_data = scores.tolist()  
 
+        # Firestore tidak mendukung nested array, jadi hasil batch (2D) disimpan sebagai JSON string
+        criteria_weights_data = criteria_weights.tolist()
+        if criteria_weights.ndim > 1:
+            criteria_weights_data = json.dumps(criteria_weights_data)
+        if not isinstance(scores, dict) and scores.ndim > 1:
+            scores_data = json.dumps(scores_data)
+
         data = {
             "method": method_name,
-            "criteria_weights": criteria_weights.tolist(),
-            "decision_matrix": decision_matrix_str,
+            "criteria_weights": criteria_weights_data,
+            "decision_matrix": decision_matrix_data,
             "scores": scores_data,  
         }
-
-        self.collection.add(data)
+        return data, chunks
     ## SUdah Benar
 
-    def weighted_product_with_subcriteria(self, criteria, decision_matrix) -> any:
-        # Buat list untuk menyimpan bobot, tipe sub-kriteria, dan nama sub-kriteria
-        subcriteria_weights = []
-        subcriteria_types = []
-        sub_criteria_names = []
-
-        # Loop melalui kriteria utama dan sub-kriteria
-        for criterion in criteria:
-            if 'subcriteria' not in criterion or len(criterion['subcriteria']) == 0:
-                # Jika tidak ada sub-kriteria, tambahkan kriteria utama langsung
-                subcriteria_weights.append(criterion['weight'])
-                subcriteria_types.append(criterion['type'])
-                sub_criteria_names.append(criterion['name'])
-            else:
-                # Loop pada setiap sub-kriteria
-                for subcriterion in criterion['subcriteria']:
-                    # Hitung bobot aktual sub-kriteria berdasarkan bobot kriteria utama
-                    actual_weight = criterion['weight'] * subcriterion['weight']
-                    subcriteria_weights.append(actual_weight)
-                    subcriteria_types.append(subcriterion['type'])
-                    sub_criteria_names.append(subcriterion['name'])
-
-        # Konversi bobot sub-kriteria menjadi numpy array
-        subcriteria_weights = np.array(subcriteria_weights, dtype=float)
-
-        # Buat list untuk menyimpan pesan error
-        error_list = []
-
-        # Periksa apakah bobot kriteria atau sub-kriteria berada di antara 1-5
-        for weight, name in zip(subcriteria_weights, sub_criteria_names):
-            if not (weight > 0 and weight <= 5):
-                    error_list.append(f"Bobot sub-kriteria '{name}' tidak valid. Bobot harus berada pada skala 1-5 (Nilai saat ini: {weight}).")
-
-        # Jika ada pesan error, gabungkan menjadi satu pesan dan raise ValueError
-        if error_list:
-            # Buat pesan error lengkap
-            error_message = (
-                "Validasi Weighted Product gagal karena kesalahan pada bobot kriteria:\n" +
-                "\n".join(error_list)
-            )
-            raise ValueError(error_message)
-
-        # Buat matriks keputusan untuk sub-kriteria
-        sub_decision_matrix = np.zeros((len(decision_matrix), len(subcriteria_weights)))
-    
-        # Isi matriks keputusan untuk sub-kriteria berdasarkan nama sub-kriteria
-        # validasi handling frontend yng salah 
-        for i, alternative in enumerate(decision_matrix):
-            for j, sub_name in enumerate(sub_criteria_names):
-                if sub_name not in alternative['criteria_scores']:
-                    raise ValueError(f"Nilai sub-kriteria '{sub_name}' hilang pada alternatif '{alternative}'.")
-                      # Validasi bahwa nilai tidak boleh negatif
-                if alternative['criteria_scores'][sub_name] < 0:
-                    raise ValueError(f"Nilai alternatif untuk '{sub_name}' pada alternatif '{alternative['alternative']}' tidak boleh negatif.")
-
-                # Validasi bahwa nilai alternatif tidak boleh 0
-                if alternative['criteria_scores'][sub_name] == 0:
-                    raise ValueError(f"Nilai alternatif untuk '{sub_name}' pada alternatif '{alternative['alternative']}' tidak boleh 0.")
-
-                sub_decision_matrix[i, j] = alternative['criteria_scores'][sub_name]
+    def weighted_product_with_subcriteria(
+        self, criteria, decision_matrix, persist: str | None = None, dtype: str | None = None
+    ) -> any:
+        persist = self.resolve_persist(persist)
+        dtype = self.resolve_dtype(dtype)
+
+        with trace_stage("weighted_product_with_subcriteria.validate", stage="validate"):
+            # Schema kriteria (nama, bobot aktual, tipe) di-flatten sekali dan di-cache per pohon kriteria
+            schema = CriteriaSchema.compile(criteria)
+            sub_criteria_names = schema.names
+            subcriteria_weights = schema.weights.astype(float)
+
+            # Periksa apakah bobot kriteria atau sub-kriteria berada di antara 1-5
+            self._validate_wp_subcriteria_weights(sub_criteria_names, subcriteria_weights)
+
+        # Bangun matriks keputusan per baris sekaligus; nilai hilang/0/negatif dicek dengan mask
+        with trace_stage("weighted_product_with_subcriteria.assemble", (len(decision_matrix), len(sub_criteria_names))):
+            sub_decision_matrix = schema.assemble(decision_matrix, dtype)
+        metrics.observe_matrix("weighted_product_with_subcriteria", sub_decision_matrix.shape)
+
+        # Perhitungan identik dilayani dari cache; kunci memakai matriks hasil assemble
+        # (hash bytes jauh lebih murah daripada JSON ribuan dict criteria_scores)
+        alternative_names = [alternative['alternative'] for alternative in decision_matrix]
+        cache_key = content_hash(
+            "weighted_product_with_subcriteria", criteria, alternative_names, sub_decision_matrix, *self._dtype_key(dtype)
+        )
+        cached = result_cache.get(cache_key, persist)
+        if cached is not None:
+            return cached
         ###############
         # Masuk model # 
         ##############
@@ -125,291 +229,599 @@ class CalculationModel:
         if not np.isclose(subcriteria_weights.sum(), 1.0):
             subcriteria_weights /= subcriteria_weights.sum()
 
-        print("Subcriteria Weights (after normalization):", subcriteria_weights)
-        print("Subcriteria Decision Matrix:\n", sub_decision_matrix)
+        trace_value("criteria_weights", subcriteria_weights)
+        trace_value("decision_matrix", sub_decision_matrix)
 
-        # Inisialisasi matriks perpangkatan
-        powered_matrix = np.zeros_like(sub_decision_matrix, dtype=float)
+        # Tentukan tipe sub-kriteria; cost menjadi pangkat negatif
+        is_cost = schema.is_cost
+        if schema.unknown.any():
+            i = np.flatnonzero(schema.unknown)[0]
+            raise ValueError(f"Jenis kriteria '{schema.types[i]}' pada sub-kriteria '{sub_criteria_names[i]}' tidak dikenal.")
+        for i in np.flatnonzero(is_cost & (sub_decision_matrix == 0).any(axis=0)):
+            raise ValueError(f"Nilai nol ditemukan pada sub-kriteria cost '{sub_criteria_names[i]}', tidak bisa membagi dengan nol.")
 
-        # Lakukan operasi perpangkatan berdasarkan jenis kriteria
-        for i, criterion_type in enumerate(subcriteria_types):
-            column = sub_decision_matrix[:, i]
+        # Hitung skor dalam ruang log lalu normalisasi (log-sum-exp)
+        signed_weights = np.where(is_cost, -subcriteria_weights, subcriteria_weights)
+        with trace_stage("weighted_product_with_subcriteria.score", sub_decision_matrix.shape):
+            scores = self._weighted_product_kernel(signed_weights, sub_decision_matrix)
+        trace_value("scores", scores)
 
-            if criterion_type == "cost":
-                if np.any(column == 0):
-                    raise ValueError(f"Nilai nol ditemukan pada sub-kriteria cost '{sub_criteria_names[i]}', tidak bisa membagi dengan nol.")
-                powered_column = np.power(1 / column, subcriteria_weights[i])
-            elif criterion_type == "benefit":
-                powered_column = np.power(column, subcriteria_weights[i])
-            else:
-                raise ValueError(f"Jenis kriteria '{criterion_type}' pada sub-kriteria '{sub_criteria_names[i]}' tidak dikenal.")
+        # Buat dictionary hasil dengan format {Alternative name: score}
+        results = {alternative['alternative']: score for alternative, score in zip(decision_matrix, scores)}
 
-            powered_matrix[:, i] = powered_column
+        # Simpan hasilnya tanpa menggunakan .tolist()
+        self.save_results("weighted_product_with_subcriteria", subcriteria_weights, sub_decision_matrix, results, persist, cache_key)
+        result_cache.put(cache_key, results, persist)
+
+        # Kembalikan hasil akhir dengan format yang baru
+        return results
 
-        print("Powered Matrix:\n", powered_matrix)
-        # Kalikan semua elemen per baris untuk mendapatkan skor total setiap alternatif
-        scores = powered_matrix.prod(axis=1)
 
-        # Normalisasi skor (opsional, tergantung pada kebutuhan hasil akhir)
-        if not np.isclose(scores.sum(), 1.0):
-            scores /= scores.sum()
 
-        print("Final Normalized Scores:", scores)
+    def simple_additive_weighting_with_subcriteria(
+        self, criteria, decision_matrix, persist: str | None = None, dtype: str | None = None
+    ) -> any:
+        persist = self.resolve_persist(persist)
+        dtype = self.resolve_dtype(dtype)
+
+        with trace_stage("simple_additive_weighting_with_subcriteria.validate", stage="validate"):
+            # Schema kriteria (nama, bobot aktual, tipe) di-flatten sekali dan di-cache per pohon kriteria
+            schema = CriteriaSchema.compile(criteria)
+            sub_criteria_names = schema.names
+
+            # Validasi bahwa total bobot kriteria (atau sub-kriteria) harus sama dengan 1
+            if not np.isclose(schema.weights.sum(), 1.0):
+                raise ValueError(self._saw_subcriteria_weight_error(criteria))
+
+        subcriteria_weights = schema.weights.astype(float)
+
+        # Bangun matriks keputusan per baris sekaligus; nilai hilang/0/negatif dicek dengan mask
+        with trace_stage("simple_additive_weighting_with_subcriteria.assemble", (len(decision_matrix), len(sub_criteria_names))):
+            sub_decision_matrix = schema.assemble(decision_matrix, dtype)
+        metrics.observe_matrix("simple_additive_weighting_with_subcriteria", sub_decision_matrix.shape)
+
+        # Perhitungan identik dilayani dari cache; kunci memakai matriks hasil assemble
+        # (hash bytes jauh lebih murah daripada JSON ribuan dict criteria_scores)
+        alternative_names = [alternative['alternative'] for alternative in decision_matrix]
+        cache_key = content_hash(
+            "simple_additive_weighting_with_subcriteria", criteria, alternative_names, sub_decision_matrix,
+            *self._dtype_key(dtype),
+        )
+        cached = result_cache.get(cache_key, persist)
+        if cached is not None:
+            return cached
+
+        if schema.unknown.any():
+            i = np.flatnonzero(schema.unknown)[0]
+            raise ValueError(f"Jenis kriteria '{schema.types[i]}' pada sub-kriteria '{sub_criteria_names[i]}' tidak dikenal.")
+
+        # Normalisasi seperti pada metode SAW, per kolom berdasarkan jenis kriteria (min/max kolom)
+        with trace_stage("simple_additive_weighting_with_subcriteria.normalize", sub_decision_matrix.shape):
+            col_min, col_max = self._saw_subcriteria_stats(schema, sub_decision_matrix)
+
+        trace_value("criteria_weights", subcriteria_weights)
+        trace_value("decision_matrix", sub_decision_matrix)
+
+        with trace_stage("simple_additive_weighting_with_subcriteria.score", sub_decision_matrix.shape):
+            # Normalisasi dan jumlah berbobot per baris digabung dalam perkalian matriks-vektor
+            scores = ScoringKernels.saw(sub_decision_matrix, subcriteria_weights, schema.is_cost, col_min, col_max)
+        if trace_active():
+            # Matriks normalisasi hanya dibentuk untuk ?trace=1
+            trace_value(
+                "normalized_matrix", self._normalize_saw(sub_decision_matrix, schema.is_cost, col_min, col_max)
+            )
+        trace_value("scores", scores)
 
         # Buat dictionary hasil dengan format {Alternative name: score}
         results = {alternative['alternative']: score for alternative, score in zip(decision_matrix, scores)}
 
         # Simpan hasilnya tanpa menggunakan .tolist()
-        self.save_results("weighted_product_with_subcriteria", subcriteria_weights, sub_decision_matrix, results)
+        self.save_results("simple_additive_weighting_with_subcriteria", subcriteria_weights, sub_decision_matrix, results, persist, cache_key)
+        result_cache.put(cache_key, results, persist)
 
-        # Kembalikan hasil akhir dengan format yang baru
         return results
 
 
+    
 
-    def simple_additive_weighting_with_subcriteria(self, criteria, decision_matrix) -> any:
-        # Buat list untuk menyimpan bobot, tipe sub-kriteria, dan nama sub-kriteria
-        subcriteria_weights = []
-        subcriteria_types = []
-        sub_criteria_names = []
 
-        # Loop melalui kriteria utama dan sub-kriteria untuk menghitung bobot aktual
-        for criterion in criteria:
-            if 'subcriteria' not in criterion or len(criterion['subcriteria']) == 0:
-                # Jika tidak ada sub-kriteria, tambahkan kriteria utama langsung
-                subcriteria_weights.append(criterion['weight'])
-                subcriteria_types.append(criterion['type'])
-                sub_criteria_names.append(criterion['name'])
-            else:
-                # Loop pada setiap sub-kriteria
-                for subcriterion in criterion['subcriteria']:
-                    # Hitung bobot aktual sub-kriteria berdasarkan bobot kriteria utama
-                    actual_weight = criterion['weight'] * subcriterion['weight']
-                    subcriteria_weights.append(actual_weight)
-                    subcriteria_types.append(subcriterion['type'])
-                    sub_criteria_names.append(subcriterion['name'])
-
-        # Validasi bahwa total bobot kriteria (atau sub-kriteria) harus sama dengan 1
-        if not np.isclose(sum(subcriteria_weights), 1.0):
-            # Kumpulkan informasi kriteria dan sub-kriteria yang salah
-            main_criteria_details = {}
-            for criterion in criteria:
-                if 'subcriteria' in criterion and criterion['subcriteria']:
-                    # Jika ada sub-kriteria, hitung total bobot sub-kriteria untuk kriteria ini
-                    total_sub_weight = sum([sub['weight'] for sub in criterion['subcriteria']])
-                    if not np.isclose(total_sub_weight, 1.0):
-                        sub_names = ", ".join([sub['name'] for sub in criterion['subcriteria']])
-                        main_criteria_details[criterion['name']] = f"{sub_names} dengan nilai {{{', '.join([str(sub['weight']) for sub in criterion['subcriteria']])}}}"
-                else:
-                    # Jika tidak ada sub-kriteria, langsung periksa bobot kriteria utama
-                    if not (1 <= criterion['weight'] <= 5):
-                        main_criteria_details[criterion['name']] = f"dengan nilai {criterion['weight']}"
-
-            # Buat pesan error berdasarkan kesalahan yang ditemukan
-            if main_criteria_details:
-                error_message = (
-                    "Total bobot kriteria pada SAW harus sama dengan 1."
-                    "Hasil yang salah:<br/>" +
-                    "<br/>".join([f"Kriteria '{key}' pada {detail}" for key, detail in main_criteria_details.items()])
-                )
-            else:
-                error_message = "Total bobot kriteria pada SAW harus sama dengan 1, namun tidak ada kriteria yang terdeteksi kesalahan bobotnya."
-     
+   
 
+    @staticmethod
+    def _validate_wp_subcriteria_weights(sub_criteria_names, subcriteria_weights) -> None:
+        invalid_weights = ~((subcriteria_weights > 0) & (subcriteria_weights <= 5))
+        if invalid_weights.any():
+            error_list = [
+                f"Bobot sub-kriteria '{sub_criteria_names[i]}' tidak valid. Bobot harus berada pada skala 1-5 (Nilai saat ini: {subcriteria_weights[i]})."
+                for i in np.flatnonzero(invalid_weights)
+            ]
+            # Gabungkan semua kesalahan menjadi satu pesan
+            error_message = (
+                "Validasi Weighted Product gagal karena kesalahan pada bobot kriteria:\n" +
+                "\n".join(error_list)
+            )
             raise ValueError(error_message)
 
-        # Konversi bobot sub-kriteria menjadi numpy array
-        subcriteria_weights = np.array(subcriteria_weights, dtype=float)
-
-        # Buat matriks keputusan untuk sub-kriteria
-        sub_decision_matrix = np.zeros((len(decision_matrix), len(subcriteria_weights)))
-
-        # Isi matriks keputusan untuk sub-kriteria berdasarkan nama sub-kriteria
-        # Isi matriks keputusan untuk sub-kriteria berdasarkan nama sub-kriteria
-        for i, alternative in enumerate(decision_matrix):
-            for j, sub_name in enumerate(sub_criteria_names):
-                if sub_name not in alternative['criteria_scores']:
-                    raise ValueError(f"Nilai sub-kriteria '{sub_name}' hilang pada alternatif '{alternative}'.")
-
-                # Validasi bahwa nilai alternatif tidak boleh 0
-                if alternative['criteria_scores'][sub_name] == 0:
-                    raise ValueError(f"Nilai alternatif untuk '{sub_name}' pada alternatif '{alternative['alternative']}' tidak boleh 0.")
-                if alternative['criteria_scores'][sub_name] < 0:
-                    raise ValueError(f"Nilai alternatif untuk '{sub_name}' pada alternatif '{alternative['alternative']}' tidak boleh negatif.")
-
+    @staticmethod
+    def _saw_subcriteria_weight_error(criteria) -> str:
+        """
+        Explain which criteria make the SAW weights not sum to 1.
+        """
+        # Kumpulkan informasi kriteria dan sub-kriteria yang salah
+        main_criteria_details = {}
+        for criterion in criteria:
+            if 'subcriteria' in criterion and criterion['subcriteria']:
+                # Jika ada sub-kriteria, hitung total bobot sub-kriteria untuk kriteria ini
+                total_sub_weight = sum([sub['weight'] for sub in criterion['subcriteria']])
+                if not np.isclose(total_sub_weight, 1.0):
+                    sub_names = ", ".join([sub['name'] for sub in criterion['subcriteria']])
+                    main_criteria_details[criterion['name']] = f"{sub_names} dengan nilai {{{', '.join([str(sub['weight']) for sub in criterion['subcriteria']])}}}"
+            else:
+                # Jika tidak ada sub-kriteria, langsung periksa bobot kriteria utama
+                if not (1 <= criterion['weight'] <= 5):
+                    main_criteria_details[criterion['name']] = f"dengan nilai {criterion['weight']}"
 
-                sub_decision_matrix[i, j] = alternative['criteria_scores'][sub_name]
+        # Buat pesan error berdasarkan kesalahan yang ditemukan
+        if main_criteria_details:
+            error_message = (
+                "Total bobot kriteria pada SAW harus sama dengan 1."
+                "Hasil yang salah:<br/>" +
+                "<br/>".join([f"Kriteria '{key}' pada {detail}" for key, detail in main_criteria_details.items()])
+            )
+        else:
+            error_message = "Total bobot kriteria pada SAW harus sama dengan 1, namun tidak ada kriteria yang terdeteksi kesalahan bobotnya."
+        return error_message
 
+    @staticmethod
+    def _normalize_saw(decision_matrix, is_cost, col_min=None, col_max=None) -> np.ndarray:
+        """
+        SAW normalization (cost: min / x, benefit: x / max) of C criteria.
 
-        # Lakukan normalisasi seperti pada metode SAW
-        normalized_matrix = np.zeros_like(sub_decision_matrix, dtype=float)
+        ``col_min``/``col_max`` default to the statistics of ``decision_matrix``;
+        out-of-core scoring passes the statistics of the whole file instead.
+        """
+        if col_min is None:
+            col_min = decision_matrix.min(axis=0, initial=np.inf)
+        if col_max is None:
+            col_max = decision_matrix.max(axis=0, initial=-np.inf)
+        CalculationModel._check_saw_stats(is_cost, col_min, col_max)
+        # Kedua sisi np.where dihitung untuk semua kolom; pembagian dengan 0 di kolom lain diabaikan
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(is_cost, col_min / decision_matrix, decision_matrix / col_max)
+
+    @staticmethod
+    def _check_saw_stats(is_cost, col_min, col_max) -> None:
+        for i in np.flatnonzero(is_cost & (col_min == 0)):
+            raise ValueError(
+                f"Minimum value for cost criterion at index {i} is zero, cannot divide by zero."
+            )
+        for i in np.flatnonzero(~is_cost & (col_max == 0)):
+            raise ValueError(
+                f"Maximum value for benefit criterion at index {i} is zero, cannot divide by zero."
+            )
 
-        # Normalisasi per kolom berdasarkan jenis kriteria
-        for i, criterion_type in enumerate(subcriteria_types):
-            column = sub_decision_matrix[:, i]
+    @staticmethod
+    def _saw_subcriteria_stats(schema, sub_decision_matrix) -> tuple[np.ndarray, np.ndarray]:
+        col_min = sub_decision_matrix.min(axis=0, initial=np.inf)
+        col_max = sub_decision_matrix.max(axis=0, initial=-np.inf)
+        for i in np.flatnonzero(schema.is_cost & np.isclose(col_min, 0.0)):  # Perbaiki validasi zero division
+            raise ValueError(f"Minimum value untuk cost sub-kriteria '{schema.names[i]}' terlalu kecil atau nol. Periksa kembali input data.")
+        for i in np.flatnonzero(~schema.is_cost & np.isclose(col_max, 0.0)):
+            raise ValueError(f"Maximum value untuk benefit sub-kriteria '{schema.names[i]}' terlalu kecil atau nol. Periksa kembali input data.")
+        return col_min, col_max
 
-            if criterion_type == "cost":
-                min_value = column.min()
-                if np.isclose(min_value, 0.0):  # Perbaiki validasi zero division
-                    raise ValueError(f"Minimum value untuk cost sub-kriteria '{sub_criteria_names[i]}' terlalu kecil atau nol. Periksa kembali input data.")
-                normalized_column = min_value / column
-            elif criterion_type == "benefit":
-                max_value = column.max()
-                if np.isclose(max_value, 0.0):  # Perbaiki validasi zero division
-                    raise ValueError(f"Maximum value untuk benefit sub-kriteria '{sub_criteria_names[i]}' terlalu kecil atau nol. Periksa kembali input data.")
-                normalized_column = column / max_value
-            else:
-                raise ValueError(f"Jenis kriteria '{criterion_type}' pada sub-kriteria '{sub_criteria_names[i]}' tidak dikenal.")
+    ###################################
+    #### Model Non SUb kriteria   #####
+    ###################################
+    def simple_additive_weighting(
+        self, criteria_weights, decision_matrix, criteria_types, persist: str | None = None, dtype: str | None = None
+    ) -> any:
+        # Ubah data JSON ke numpy array (float32 jika diminta: setengah memori)
+        criteria_weights = np.array(criteria_weights, dtype=float)
+        dtype = self.resolve_dtype(dtype)
+        decision_matrix = np.asarray(decision_matrix, dtype=dtype)
+        metrics.observe_matrix("simple_additive_weighting", decision_matrix.shape)
+
+        # Perhitungan identik dilayani dari cache (kunci = hash konten input)
+        persist = self.resolve_persist(persist)
+        cache_key = content_hash(
+            "simple_additive_weighting", criteria_weights, criteria_types, decision_matrix, *self._dtype_key(dtype)
+        )
+        cached = result_cache.get(cache_key, persist)
+        if cached is not None:
+            return cached
+
+        trace_value("criteria_weights", criteria_weights)
+        trace_value("decision_matrix", decision_matrix)
+        with trace_stage("simple_additive_weighting.validate", decision_matrix.shape, stage="validate"):
+            # Cek apakah jumlah bobot kriteria sama dengan jumlah kolom pada matriks keputusan
+            if len(criteria_weights) != decision_matrix.shape[1]:
+                raise ValueError(
+                    "The number of criteria weights must match the number of columns in the decision matrix."
+                )
+            is_cost = self._cost_mask(criteria_types, decision_matrix.shape[1])
+
+        # Normalisasi per kolom: cost -> min / column, benefit -> column / max
+        with trace_stage("simple_additive_weighting.normalize", decision_matrix.shape):
+            col_min = decision_matrix.min(axis=0, initial=np.inf)
+            col_max = decision_matrix.max(axis=0, initial=-np.inf)
+            self._check_saw_stats(is_cost, col_min, col_max)
+
+        with trace_stage("simple_additive_weighting.score", decision_matrix.shape):
+            # Normalisasi, pembobotan dan jumlah per baris digabung dalam perkalian matriks-vektor
+            scores = ScoringKernels.saw(decision_matrix, criteria_weights, is_cost, col_min, col_max)
+        if trace_active():
+            # Matriks antara hanya dibentuk untuk ?trace=1
+            normalized_matrix = self._normalize_saw(decision_matrix, is_cost, col_min, col_max)
+            trace_value("normalized_matrix", normalized_matrix)
+            trace_value("weighted_matrix", normalized_matrix * criteria_weights)
+        trace_value("scores", scores)
 
-            normalized_matrix[:, i] = normalized_column
+        self.save_results(
+            "simple_additive_weighting", criteria_weights, decision_matrix, scores, persist, cache_key
+        )
+        result_cache.put(cache_key, scores, persist)
+        # Kembalikan skor akhir
+        return scores
 
+    def weighted_product(
+        self, criteria_weights, decision_matrix, criteria_types, persist: str | None = None, dtype: str | None = None
+    ) -> any:
+        # Ubah data JSON ke numpy array (float32 jika diminta: setengah memori)
+        criteria_weights = np.array(criteria_weights, dtype=float)
+        dtype = self.resolve_dtype(dtype)
+        decision_matrix = np.asarray(decision_matrix, dtype=dtype)
+        metrics.observe_matrix("weighted_product", decision_matrix.shape)
+
+        # Perhitungan identik dilayani dari cache (kunci = hash konten input)
+        persist = self.resolve_persist(persist)
+        cache_key = content_hash(
+            "weighted_product", criteria_weights, criteria_types, decision_matrix, *self._dtype_key(dtype)
+        )
+        cached = result_cache.get(cache_key, persist)
+        if cached is not None:
+            return cached
+
+        trace_value("decision_matrix", decision_matrix)
+        with trace_stage("weighted_product.validate", decision_matrix.shape, stage="validate"):
+            # Cek apakah jumlah bobot kriteria sama dengan jumlah kolom pada matriks keputusan
+            if len(criteria_weights) != decision_matrix.shape[1]:
+                raise ValueError(
+                    "The number of criteria weights must match the number of columns in the decision matrix."
+                )
+            is_cost = self._cost_mask(criteria_types, decision_matrix.shape[1])
+            for i in np.flatnonzero(is_cost & (decision_matrix == 0).any(axis=0)):
+                raise ValueError(
+                    f"Zero value found in cost criterion at index {i}, cannot divide by zero."
+                )
 
+        # Normalisasi bobot kriteria
+        criteria_weights /= criteria_weights.sum()
+        trace_value("criteria_weights", criteria_weights)
 
-        # Kalikan matriks normalisasi dengan bobot sub-kriteria
-        weighted_matrix = normalized_matrix * subcriteria_weights
+        # Kriteria 'cost' dipangkatkan dengan bobot negatif: (1 / x) ** w = x ** -w
+        signed_weights = np.where(is_cost, -criteria_weights, criteria_weights)
+        # Kalikan semua elemen per baris (dalam ruang log) lalu normalisasi skor
+        with trace_stage("weighted_product.score", decision_matrix.shape):
+            scores = self._weighted_product_kernel(signed_weights, decision_matrix)
+        trace_value("scores", scores)
 
-        # Jumlahkan setiap baris untuk mendapatkan skor per alternatif
-        scores = weighted_matrix.sum(axis=1)
+        self.save_results("weighted_product", criteria_weights, decision_matrix, scores, persist, cache_key)
+        result_cache.put(cache_key, scores, persist)
 
-        # Buat dictionary hasil dengan format {Alternative name: score}
-        results = {alternative['alternative']: score for alternative, score in zip(decision_matrix, scores)}
+        return scores
 
-        # Simpan hasilnya tanpa menggunakan .tolist()
-        self.save_results("simple_additive_weighting_with_subcriteria", subcriteria_weights, sub_decision_matrix, results)
+    ###################################
+    #### Kernel Weighted Product  #####
+    ###################################
+    @staticmethod
+    def _cost_mask(criteria_types, n_criteria: int) -> np.ndarray:
+        """
+        Convert a list of C criteria types into a boolean cost mask.
+        """
+        types = np.array(criteria_types if criteria_types is not None else [], dtype=object)
+        if types.shape != (n_criteria,):
+            raise ValueError(
+                "The number of criteria types must match the number of columns in the decision matrix."
+            )
+        is_cost = types == "cost"
+        unknown = ~(is_cost | (types == "benefit"))
+        if unknown.any():
+            i = np.flatnonzero(unknown)[0]
+            raise ValueError(f"Unknown criterion type '{types[i]}' at index {i}.")
+        return is_cost
+
+    @staticmethod
+    def _weighted_product_kernel(
+        signed_weights, decision_matrix, normalize: bool = True
+    ) -> np.ndarray:
+        """
+        Log-space Weighted Product: scores = exp(log(X) @ signed_w).
 
-        return results
+        ``signed_weights`` is C (one score vector) or S x C (S score vectors);
+        cost criteria carry negative exponents. With ``normalize`` the scores are
+        divided by their sum via a log-sum-exp shift, so hundreds of criteria
+        neither underflow nor overflow.
+        """
+        log_scores = ScoringKernels.wp_log_scores(signed_weights, decision_matrix)
+        if log_scores is None:
+            # Ada nilai 0 di matriks: jalur dengan zero mask
+            log_matrix, zero_mask = CalculationModel._log_matrix(decision_matrix)
+            return CalculationModel._weighted_product_from_log(signed_weights, log_matrix, zero_mask, normalize)
+        if not normalize:
+            return np.exp(log_scores, out=log_scores)
+        return ScoringKernels.normalize_log_scores(log_scores)
+
+    @staticmethod
+    def _log_matrix(decision_matrix) -> tuple[np.ndarray, np.ndarray | None]:
+        """
+        ``log(X)`` with zeros replaced by 0, plus the zero mask (``None`` when X has no zeros).
+        """
+        zero_mask = decision_matrix == 0
+        has_zero = zero_mask.any()
 
+        # log(0) diganti 0 agar 0 * -inf tidak menghasilkan nan; ditangani lewat zero_mask
+        with np.errstate(divide="ignore", invalid="ignore"):
+            log_matrix = np.log(np.where(zero_mask, 1.0, decision_matrix) if has_zero else decision_matrix)
+        return log_matrix, zero_mask if has_zero else None
 
-    
+    @staticmethod
+    def _weighted_product_log_scores(signed_weights, log_matrix, zero_mask=None) -> np.ndarray:
+        """
+        Unnormalized log scores ``log(X) @ signed_w``; ``-inf`` for a zero with a positive exponent.
+        """
+        log_scores = signed_weights @ log_matrix.T
+
+        if zero_mask is not None:
+            # Nilai 0 dengan pangkat positif membuat skor alternatif menjadi 0
+            rows = np.flatnonzero(zero_mask.any(axis=1))
+            zero_hits = (signed_weights > 0).astype(float) @ zero_mask[rows].T.astype(float)
+            log_scores[..., rows] = np.where(zero_hits > 0, -np.inf, log_scores[..., rows])
+        return log_scores
+
+    @staticmethod
+    def _weighted_product_from_log(
+        signed_weights, log_matrix, zero_mask=None, normalize: bool = True
+    ) -> np.ndarray:
+        """
+        Weighted Product scores from a precomputed ``_log_matrix``; O(A x C) per weight vector.
+        """
+        log_scores = CalculationModel._weighted_product_log_scores(signed_weights, log_matrix, zero_mask)
 
+        if not normalize:
+            return np.exp(log_scores)
 
-   
+        # Normalisasi skor: exp(s - max) / sum(exp(s - max)) == prod / sum(prod)
+        return ScoringKernels.normalize_log_scores(log_scores)
 
     ###################################
-    #### Model Non SUb kriteria   #####
+    #### Model Batch Skenario     #####
     ###################################
-    def simple_additive_weighting(
-        self, criteria_weights, decision_matrix, criteria_types
-    ) -> any:
-        # Ubah data JSON ke numpy array
-        criteria_weights = np.array(criteria_weights, dtype=float)
-        decision_matrix = np.array(decision_matrix, dtype=float)
-
-        print("Criteria Weights:", criteria_weights)
-        print("Decision Matrix:\n", decision_matrix)
-        print("Criteria Types:", criteria_types)
-        # Cek apakah jumlah bobot kriteria sama dengan jumlah kolom pada matriks keputusan
-        if len(criteria_weights) != decision_matrix.shape[1]:
+    @staticmethod
+    def _scenario_types(criteria_types, shape) -> np.ndarray:
+        """
+        Convert criteria types (one list of C, or S lists of C) into an S x C cost mask.
+        """
+        types = np.array(criteria_types if criteria_types is not None else [], dtype=object)
+        if types.ndim == 1:
+            types = np.broadcast_to(types, (shape[0], types.shape[0]))
+        if types.shape != shape:
             raise ValueError(
-                "The number of criteria weights must match the number of columns in the decision matrix."
+                "Criteria types must be a list of C types or an S x C block matching the criteria weights."
             )
-        # Inisialisasi matriks normalisasi dengan bentuk yang sama seperti matriks keputusan
-        normalized_matrix = np.zeros_like(decision_matrix, dtype=float)
-
-        # Loop melalui jenis kriteria untuk normalisasi
-        for i, criterion_type in enumerate(criteria_types):
-            column = decision_matrix[:, i]
-            # Jika kriteria 'cost', normalisasi dengan min_value / column
-            if criterion_type == "cost":
-                min_value = column.min()
-                if min_value == 0:
-                    raise ValueError(
-                        f"Minimum value for cost criterion at index {i} is zero, cannot divide by zero."
-                    )
-                normalized_column = min_value / column
-            # Jika kriteria 'benefit', normalisasi dengan column / max_value
-            elif criterion_type == "benefit":
-                max_value = column.max()
-                if max_value == 0:
-                    raise ValueError(
-                        f"Maximum value for benefit criterion at index {i} is zero, cannot divide by zero."
-                    )
-                normalized_column = column / max_value
-            else:
-                raise ValueError(
-                    f"Unknown criterion type '{criterion_type}' at index {i}."
-                )
-            # Simpan hasil normalisasi ke dalam matriks normalisasi
+        is_cost = types == "cost"
+        unknown = ~(is_cost | (types == "benefit"))
+        if unknown.any():
+            s, i = np.argwhere(unknown)[0]
+            raise ValueError(
+                f"Unknown criterion type '{types[s, i]}' at index {i} in scenario {s}."
+            )
+        return is_cost
 
-            normalized_matrix[:, i] = normalized_column
+    @staticmethod
+    def _scenario_inputs(criteria_weights, decision_matrix, criteria_types, dtype=np.float64):
+        # Ubah data JSON ke numpy array; satu baris bobot per skenario
+        criteria_weights = np.atleast_2d(np.array(criteria_weights, dtype=float))
+        decision_matrix = np.asarray(decision_matrix, dtype=dtype)
 
-            print(
-                f"Normalized values for criterion {i} ({criterion_type}):",
-                normalized_column,
+        if decision_matrix.ndim != 2 or criteria_weights.shape[1] != decision_matrix.shape[1]:
+            raise ValueError(
+                "The number of criteria weights in every scenario must match the number of columns in the decision matrix."
             )
+        is_cost = CalculationModel._scenario_types(criteria_types, criteria_weights.shape)
+        return criteria_weights, decision_matrix, is_cost
 
-        print("Normalized Matrix:\n", normalized_matrix)
-        # Kalikan matriks normalisasi dengan bobot kriteria
-        weighted_matrix = normalized_matrix * criteria_weights
-
-        print("Weighted Matrix:\n", weighted_matrix)
-        # Jumlahkan setiap baris untuk mendapatkan skor per alternatif
-        scores = weighted_matrix.sum(axis=1)
+    def simple_additive_weighting_batch(
+        self, criteria_weights, decision_matrix, criteria_types, persist: str | None = None, dtype: str | None = None
+    ) -> np.ndarray:
+        """
+        Score S weight scenarios against one decision matrix. Returns an S x A matrix.
+        """
+        with trace_stage("simple_additive_weighting_batch.validate", stage="validate"):
+            dtype = self.resolve_dtype(dtype)
+            criteria_weights, decision_matrix, is_cost = self._scenario_inputs(
+                criteria_weights, decision_matrix, criteria_types, dtype
+            )
+        metrics.observe_matrix("simple_additive_weighting_batch", decision_matrix.shape)
+
+        # Perhitungan identik dilayani dari cache (kunci = hash konten input)
+        persist = self.resolve_persist(persist)
+        cache_key = content_hash("simple_additive_weighting_batch", criteria_weights, is_cost, decision_matrix, *self._dtype_key(dtype))
+        cached = result_cache.get(cache_key, persist)
+        if cached is not None:
+            return cached
+
+        # Statistik kolom dihitung sekali untuk semua skenario
+        col_min = decision_matrix.min(axis=0)
+        col_max = decision_matrix.max(axis=0)
+        cost_used = is_cost.any(axis=0)
+        benefit_used = (~is_cost).any(axis=0)
+
+        for i in np.flatnonzero(cost_used & (col_min == 0)):
+            raise ValueError(
+                f"Minimum value for cost criterion at index {i} is zero, cannot divide by zero."
+            )
+        for i in np.flatnonzero(benefit_used & (col_max == 0)):
+            raise ValueError(
+                f"Maximum value for benefit criterion at index {i} is zero, cannot divide by zero."
+            )
 
-        print("Scores:", scores)
+        with trace_stage("simple_additive_weighting_batch.score", (len(criteria_weights),) + decision_matrix.shape):
+            # Normalisasi benefit (column / max) dan cost (min / column) masuk ke bobot per skenario:
+            # S x C bobot @ X^T, plus kolom cost yang dibalik sekali untuk semua skenario
+            scores = ScoringKernels.saw(decision_matrix, criteria_weights, is_cost, col_min, col_max)
+        trace_value("scores", scores)
 
         self.save_results(
-            "simple_additive_weighting", criteria_weights, decision_matrix, scores
+            "simple_additive_weighting_batch", criteria_weights, decision_matrix, scores, persist, cache_key
         )
-        # Kembalikan skor akhir
+        result_cache.put(cache_key, scores, persist)
         return scores
 
-    def weighted_product(
-        self, criteria_weights, decision_matrix, criteria_types
-    ) -> any:
-        # Ubah data JSON ke numpy array
-        criteria_weights = np.array(criteria_weights, dtype=float)
-        decision_matrix = np.array(decision_matrix, dtype=float)
+    def weighted_product_batch(
+        self, criteria_weights, decision_matrix, criteria_types, persist: str | None = None, dtype: str | None = None
+    ) -> np.ndarray:
+        """
+        Score S weight scenarios against one decision matrix. Returns an S x A matrix.
+        """
+        with trace_stage("weighted_product_batch.validate", stage="validate"):
+            dtype = self.resolve_dtype(dtype)
+            criteria_weights, decision_matrix, is_cost = self._scenario_inputs(
+                criteria_weights, decision_matrix, criteria_types, dtype
+            )
+        metrics.observe_matrix("weighted_product_batch", decision_matrix.shape)
+
+        # Perhitungan identik dilayani dari cache (kunci = hash konten input)
+        persist = self.resolve_persist(persist)
+        cache_key = content_hash("weighted_product_batch", criteria_weights, is_cost, decision_matrix, *self._dtype_key(dtype))
+        cached = result_cache.get(cache_key, persist)
+        if cached is not None:
+            return cached
+
+        # Normalisasi bobot kriteria per skenario
+        criteria_weights /= criteria_weights.sum(axis=1, keepdims=True)
 
-        print("Criteria Weights (before normalization):", criteria_weights)
-        print("Decision Matrix:\n", decision_matrix)
-        print("Criteria Types:", criteria_types)
-        # Cek apakah jumlah bobot kriteria sama dengan jumlah kolom pada matriks keputusan
-        if len(criteria_weights) != decision_matrix.shape[1]:
+        for i in np.flatnonzero(is_cost.any(axis=0) & (decision_matrix == 0).any(axis=0)):
             raise ValueError(
-                "The number of criteria weights must match the number of columns in the decision matrix."
+                f"Zero value found in cost criterion at index {i}, cannot divide by zero."
             )
-        # Normalisasi bobot kriteria
-        criteria_weights /= criteria_weights.sum()
-        print("Criteria Weights (after normalization):", criteria_weights)
-        # Inisialisasi matriks perpangkatan
-        powered_matrix = np.zeros_like(decision_matrix, dtype=float)
-        #
-        for i, criterion_type in enumerate(criteria_types):
-            column = decision_matrix[:, i]
-            # Lakukan operasi per kolom berdasarkan jenis kriteria
-
-            if criterion_type == "cost":
-                # Jika kriteria 'cost', pangkatkan (1 / column) dengan bobot kriteria
-                if np.any(column == 0):
+
+        signed_weights = np.where(is_cost, -criteria_weights, criteria_weights)
+        with trace_stage("weighted_product_batch.score", (len(criteria_weights),) + decision_matrix.shape):
+            scores = self._weighted_product_kernel(signed_weights, decision_matrix)
+        trace_value("scores", scores)
+
+        self.save_results("weighted_product_batch", criteria_weights, decision_matrix, scores, persist, cache_key)
+        result_cache.put(cache_key, scores, persist)
+        return scores
+
+    ###################################
+    #### Sesi Slider Bobot        #####
+    ###################################
+    def open_session(
+        self, method: str, decision_matrix, criteria=None, criteria_weights=None, criteria_types=None
+    ) -> DecisionSession:
+        """
+        Validate and precompute a decision matrix once for repeated weight updates.
+
+        ``method`` is ``simple_additive_weighting`` or ``weighted_product``. With
+        ``criteria`` the v2 (sub-criteria) input is used, otherwise
+        ``criteria_weights`` and ``criteria_types`` as in ``/calculate``. The
+        initial weights are scored right away (``session.scores``).
+        """
+        if criteria is not None:
+            schema = CriteriaSchema.compile(criteria)
+            if schema.unknown.any():
+                i = np.flatnonzero(schema.unknown)[0]
+                raise ValueError(f"Jenis kriteria '{schema.types[i]}' pada sub-kriteria '{schema.names[i]}' tidak dikenal.")
+            with trace_stage(f"{method}.session.assemble", (len(decision_matrix), len(schema.names))):
+                matrix = schema.assemble(decision_matrix)
+            is_cost = schema.is_cost
+            sub_criteria_names = schema.names
+            alternative_names = [alternative['alternative'] for alternative in decision_matrix]
+            method_name = f"{method}_with_subcriteria"
+        else:
+            matrix = np.array(decision_matrix, dtype=float)
+            if matrix.ndim != 2 or criteria_weights is None or len(criteria_weights) != matrix.shape[1]:
+                raise ValueError(
+                    "The number of criteria weights must match the number of columns in the decision matrix."
+                )
+            is_cost = self._cost_mask(criteria_types, matrix.shape[1])
+            sub_criteria_names = alternative_names = None
+            method_name = method
+
+        # Bagian yang tidak bergantung pada bobot dihitung sekali per sesi
+        with trace_stage(f"{method}.session.prepare", matrix.shape):
+            zero_mask = None
+            if method == "simple_additive_weighting":
+                if criteria is not None:
+                    prepared = self._normalize_saw(matrix, is_cost, *self._saw_subcriteria_stats(schema, matrix))
+                else:
+                    prepared = self._normalize_saw(matrix, is_cost)
+            elif method == "weighted_product":
+                for i in np.flatnonzero(is_cost & (matrix == 0).any(axis=0)):
                     raise ValueError(
                         f"Zero value found in cost criterion at index {i}, cannot divide by zero."
                     )
-                powered_column = np.power(1 / column, criteria_weights[i])
-            elif criterion_type == "benefit":
-                # Jika kriteria 'benefit', pangkatkan column dengan bobot kriteria
-                powered_column = np.power(column, criteria_weights[i])
+                prepared, zero_mask = self._log_matrix(matrix)
             else:
-                raise ValueError(
-                    f"Unknown criterion type '{criterion_type}' at index {i}."
-                )
-            # Simpan hasil perpangkatan ke dalam matriks perpangkatan
-            powered_matrix[:, i] = powered_column
+                raise ValueError(f"Unknown session method '{method}'.")
 
-            print(
-                f"Powered values for criterion {i} ({criterion_type}):", powered_column
-            )
+        session = DecisionSession(
+            method_name, matrix, prepared, is_cost, None, zero_mask, sub_criteria_names, alternative_names
+        )
+        self.score_session(session, criteria_weights=criteria_weights, criteria=criteria)
+        return session
 
-        print("Powered Matrix:\n", powered_matrix)
-        # Kalikan semua elemen per baris untuk mendapatkan skor
-        scores = powered_matrix.prod(axis=1)
-        # Normalisasi skor
-        scores /= scores.sum()
-        print("Normalized Scores:", scores)
+    def score_session(self, session: DecisionSession, criteria_weights=None, criteria=None) -> any:
+        """
+        Score a session with new weights in O(A x C); nothing is parsed again or persisted.
 
-        self.save_results("weighted_product", criteria_weights, decision_matrix, scores)
+        v2 sessions accept either the ``criteria`` tree (same sub-criteria, new
+        weights) or the flattened ``criteria_weights``.
+        """
+        if criteria is not None:
+            if not session.with_subcriteria:
+                raise ValueError("This session was opened without criteria; send criteria_weights instead.")
+            schema = CriteriaSchema.compile(criteria)
+            if schema.names != session.sub_criteria_names or (schema.is_cost != session.is_cost).any():
+                raise ValueError("Sub-kriteria dan jenisnya tidak boleh berubah dalam satu sesi; hanya bobot yang dapat diperbarui.")
+            weights = schema.weights.astype(float)
+        else:
+            weights = np.array(criteria_weights if criteria_weights is not None else [], dtype=float)
+            if weights.shape != (session.prepared.shape[1],):
+                raise ValueError(
+                    "The number of criteria weights must match the number of columns in the decision matrix."
+                )
 
+        # Validasi bobot sama seperti endpoint v2
+        if session.method_name == "simple_additive_weighting_with_subcriteria" and not np.isclose(weights.sum(), 1.0):
+            if criteria is not None:
+                raise ValueError(self._saw_subcriteria_weight_error(criteria))
+            raise ValueError("Total bobot kriteria pada SAW harus sama dengan 1.")
+        if session.method_name == "weighted_product_with_subcriteria":
+            self._validate_wp_subcriteria_weights(session.sub_criteria_names, weights)
+
+        with trace_stage(f"{session.method_name}.session.score", session.prepared.shape):
+            if session.method_name.startswith("simple_additive_weighting"):
+                scores = session.prepared @ weights
+            else:
+                weights /= weights.sum()
+                signed_weights = np.where(session.is_cost, -weights, weights)
+                scores = self._weighted_product_from_log(signed_weights, session.prepared, session.zero_mask)
+        trace_value("scores", scores)
+
+        if session.with_subcriteria:
+            # Format hasil v2: {Alternative name: score}
+            scores = dict(zip(session.alternative_names, scores))
+        with session.lock:
+            session.weights, session.scores = weights, scores
         return scores
-    
-
 
+    def save_session(self, session: DecisionSession, persist: str | None = None) -> None:
+        """
+        Persist the latest weights and scores of a session (only when the user commits).
+        """
+        with session.lock:
+            weights, scores = session.weights, session.scores
+        self.save_results(session.method_name, weights, session.decision_matrix, scores, persist)
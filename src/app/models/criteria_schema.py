@@ -0,0 +1,114 @@
+import threading
+from collections import OrderedDict
+from operator import itemgetter
+
+import numpy as np
+
+from app.utils.cache import content_hash
+from app.utils.config import Config
+
+# Batas jumlah sel bermasalah yang ditulis di pesan error
+MAX_REPORTED_CELLS = 100
+
+
+class CriteriaSchema:
+    """
+    Flattened criteria tree of the v2 endpoints: sub-criteria names, effective
+    weights (criterion weight x sub-criterion weight), types and a name -> column index.
+
+    Compiled schemas are cached by the content hash of the ``criteria`` tree.
+    """
+
+    _cache = OrderedDict()
+    _lock = threading.Lock()
+
+    def __init__(self, criteria) -> None:
+        names = []
+        weights = []
+        types = []
+        # Loop melalui kriteria utama dan sub-kriteria
+        for criterion in criteria:
+            if 'subcriteria' not in criterion or len(criterion['subcriteria']) == 0:
+                # Jika tidak ada sub-kriteria, tambahkan kriteria utama langsung
+                names.append(criterion['name'])
+                weights.append(criterion['weight'])
+                types.append(criterion['type'])
+            else:
+                for subcriterion in criterion['subcriteria']:
+                    # Bobot aktual sub-kriteria = bobot kriteria utama x bobot sub-kriteria
+                    names.append(subcriterion['name'])
+                    weights.append(criterion['weight'] * subcriterion['weight'])
+                    types.append(subcriterion['type'])
+
+        self.names = names
+        self.index = {name: i for i, name in enumerate(names)}
+        self.weights = np.array(weights, dtype=float)
+        self.types = np.array(types, dtype=object)
+        self.is_cost = self.types == "cost"
+        self.unknown = ~(self.is_cost | (self.types == "benefit"))
+        # Schema dipakai bersama antar request, jadi array-nya dibuat read-only
+        for array in (self.weights, self.types, self.is_cost, self.unknown):
+            array.flags.writeable = False
+        # itemgetter dengan satu nama mengembalikan skalar, bukan tuple
+        self._getter = itemgetter(*names) if len(names) > 1 else (lambda scores: (scores[names[0]],))
+
+    @classmethod
+    def compile(cls, criteria) -> "CriteriaSchema":
+        key = content_hash(criteria)
+        with cls._lock:
+            schema = cls._cache.get(key)
+            if schema is not None:
+                cls._cache.move_to_end(key)
+                return schema
+        schema = cls(criteria)
+        with cls._lock:
+            cls._cache[key] = schema
+            while len(cls._cache) > Config.SCHEMA_CACHE_SIZE:
+                cls._cache.popitem(last=False)
+        return schema
+
+    def assemble(self, decision_matrix, dtype=float) -> np.ndarray:
+        """
+        Build the A x C matrix (of ``dtype``) from ``[{alternative, criteria_scores}]`` and validate it.
+
+        Missing, zero and negative values are checked as array masks; every
+        offending cell is reported in one ``ValueError``.
+        """
+        n_criteria = len(self.names)
+        if n_criteria == 0:
+            return np.zeros((len(decision_matrix), 0), dtype)
+
+        nan = float("nan")
+        rows = []
+        for alternative in decision_matrix:
+            scores = alternative['criteria_scores']
+            try:
+                rows.append(self._getter(scores))
+            except KeyError:
+                # Ada nilai yang hilang: isi NaN, dilaporkan lewat mask di bawah
+                rows.append(tuple(scores.get(name, nan) for name in self.names))
+        matrix = np.array(rows, dtype=dtype).reshape(len(rows), n_criteria)
+
+        missing = np.isnan(matrix)
+        negative = matrix < 0
+        zero = matrix == 0
+        invalid = missing | negative | zero
+        if invalid.any():
+            raise ValueError(self._cell_errors(decision_matrix, missing, negative, invalid))
+        return matrix
+
+    def _cell_errors(self, decision_matrix, missing, negative, invalid) -> str:
+        rows, cols = np.nonzero(invalid)
+        errors = []
+        for i, j in zip(rows[:MAX_REPORTED_CELLS], cols[:MAX_REPORTED_CELLS]):
+            alternative = decision_matrix[i]
+            sub_name = self.names[j]
+            if missing[i, j]:
+                errors.append(f"Nilai sub-kriteria '{sub_name}' hilang pada alternatif '{alternative}'.")
+            elif negative[i, j]:
+                errors.append(f"Nilai alternatif untuk '{sub_name}' pada alternatif '{alternative['alternative']}' tidak boleh negatif.")
+            else:
+                errors.append(f"Nilai alternatif untuk '{sub_name}' pada alternatif '{alternative['alternative']}' tidak boleh 0.")
+        if len(rows) > MAX_REPORTED_CELLS:
+            errors.append(f"... dan {len(rows) - MAX_REPORTED_CELLS} nilai tidak valid lainnya.")
+        return "\n".join(errors)
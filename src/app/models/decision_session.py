@@ -0,0 +1,137 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+import numpy as np
+
+from app.utils.config import Config
+
+
+class DecisionSession:
+    """
+    Precomputed state of one weight-slider session.
+
+    ``prepared`` is the normalized matrix (SAW) or the log matrix (WP), so a
+    new weight vector is scored with one matrix-vector product. The arrays
+    are read-only; only ``weights`` and ``scores`` change between updates.
+    """
+
+    def __init__(
+        self, method_name: str, decision_matrix, prepared, is_cost, weights,
+        zero_mask=None, sub_criteria_names=None, alternative_names=None,
+    ) -> None:
+        self.method_name = method_name
+        self.decision_matrix = decision_matrix
+        self.prepared = prepared
+        self.is_cost = is_cost
+        self.zero_mask = zero_mask
+        # Hanya sesi v2 (criteria + sub-kriteria) yang punya nama kolom dan alternatif
+        self.sub_criteria_names = sub_criteria_names
+        self.alternative_names = alternative_names
+        self.weights = weights
+        self.scores = None
+        self.lock = threading.Lock()
+        for array in (decision_matrix, prepared, is_cost, zero_mask):
+            if array is not None:
+                array.flags.writeable = False
+
+    @property
+    def with_subcriteria(self) -> bool:
+        return self.sub_criteria_names is not None
+
+    @property
+    def nbytes(self) -> int:
+        arrays = (self.decision_matrix, self.prepared, self.is_cost, self.zero_mask, self.weights)
+        return sum(array.nbytes for array in arrays if isinstance(array, np.ndarray))
+
+
+class SessionStore:
+    """
+    Thread-safe in-memory store of ``DecisionSession`` objects for one worker.
+
+    Sessions expire ``ttl`` seconds after their last use; when the count or
+    byte limit is exceeded the least recently used session is evicted.
+    """
+
+    def __init__(
+        self,
+        max_sessions: int = Config.SESSION_MAX_COUNT,
+        max_bytes: int = Config.SESSION_MAX_BYTES,
+        ttl: float = Config.SESSION_TTL,
+    ) -> None:
+        self.max_sessions = max_sessions
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._sessions = OrderedDict()
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def add(self, session: DecisionSession) -> str:
+        size = session.nbytes
+        if size > self.max_bytes:
+            raise ValueError(
+                f"Decision matrix is too large for a session ({size} bytes, limit {self.max_bytes})."
+            )
+        session_id = uuid.uuid4().hex
+        with self._lock:
+            self._expire(time.monotonic())
+            self._sessions[session_id] = [time.monotonic() + self.ttl, size, session]
+            self.bytes += size
+            while len(self._sessions) > self.max_sessions or self.bytes > self.max_bytes:
+                self._remove(next(iter(self._sessions)))
+                self.evictions += 1
+        return session_id
+
+    def get(self, session_id: str) -> DecisionSession | None:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._sessions.get(session_id)
+            if entry is None:
+                return None
+            if entry[0] < now:
+                self._remove(session_id)
+                self.expirations += 1
+                return None
+            # TTL dihitung dari pemakaian terakhir
+            entry[0] = now + self.ttl
+            self._sessions.move_to_end(session_id)
+            return entry[2]
+
+    def remove(self, session_id: str) -> bool:
+        with self._lock:
+            if session_id not in self._sessions:
+                return False
+            self._remove(session_id)
+            return True
+
+    def clear(self) -> None:
+        with self._lock:
+            self._sessions.clear()
+            self.bytes = 0
+
+    def stats(self) -> dict:
+        return {
+            "sessions": len(self._sessions),
+            "bytes": self.bytes,
+            "max_sessions": self.max_sessions,
+            "max_bytes": self.max_bytes,
+            "ttl": self.ttl,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+    def _expire(self, now: float) -> None:
+        expired = [key for key, entry in self._sessions.items() if entry[0] < now]
+        for key in expired:
+            self._remove(key)
+        self.expirations += len(expired)
+
+    def _remove(self, session_id: str) -> None:
+        _, size, _ = self._sessions.pop(session_id)
+        self.bytes -= size
+
+
+session_store = SessionStore()
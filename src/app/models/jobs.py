@@ -0,0 +1,261 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+from app.connection.connection import Connection
+from app.models.calculation_model import CalculationModel
+from app.utils.config import Config
+from app.utils.process_pool import ProcessPool
+
+# Method CalculationModel yang boleh dijalankan sebagai job
+JOB_METHODS = (
+    "simple_additive_weighting",
+    "simple_additive_weighting_batch",
+    "simple_additive_weighting_with_subcriteria",
+    "weighted_product",
+    "weighted_product_batch",
+    "weighted_product_with_subcriteria",
+)
+
+
+class JobLimitError(Exception):
+    """
+    Raised when ``JOB_MAX_COUNT`` jobs are queued or running in this worker.
+    """
+
+
+class Job:
+    """
+    One calculation submitted to the job process pool.
+
+    The status is read from the future: ``queued``, ``running``, ``done``,
+    ``failed`` or ``cancelled``.
+    """
+
+    def __init__(self, method_name: str, future: Future) -> None:
+        self.id = uuid.uuid4().hex
+        self.method_name = method_name
+        self.future = future
+        self.created_at = time.time()
+        self.finished_at = None
+
+    @property
+    def status(self) -> str:
+        if self.future.cancelled():
+            return "cancelled"
+        if not self.future.done():
+            return "running" if self.future.running() else "queued"
+        return "failed" if self.future.exception() is not None else "done"
+
+    @property
+    def finished(self) -> bool:
+        return self.future.done()
+
+    def result(self):
+        return self.future.result()[0]
+
+    def to_dict(self) -> dict:
+        status = self.status
+        data = {
+            "job_id": self.id,
+            "method": self.method_name,
+            "status": status,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+        }
+        if status == "failed":
+            data["error"] = str(self.future.exception())
+        return data
+
+
+class JobStore:
+    """
+    Jobs of this worker by ID.
+
+    Finished jobs (and their results) expire ``ttl`` seconds after they
+    finished; at most ``max_jobs`` jobs are kept, the oldest finished job is
+    dropped first and a new job is refused when all of them are still active.
+    """
+
+    def __init__(self, max_jobs: int = Config.JOB_MAX_COUNT, ttl: float = Config.JOB_TTL) -> None:
+        self.max_jobs = max_jobs
+        self.ttl = ttl
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+        self.submitted = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def check_capacity(self) -> None:
+        with self._lock:
+            self._expire()
+            if len(self._jobs) >= self.max_jobs and not self._evict_finished():
+                raise JobLimitError(f"Too many active jobs (limit {self.max_jobs}), try again later.")
+
+    def add(self, job: Job) -> None:
+        with self._lock:
+            self._jobs[job.id] = job
+            self.submitted += 1
+            while len(self._jobs) > self.max_jobs and self._evict_finished():
+                pass
+
+    def get(self, job_id: str) -> Job | None:
+        with self._lock:
+            self._expire()
+            return self._jobs.get(job_id)
+
+    def remove(self, job_id: str) -> bool:
+        with self._lock:
+            return self._jobs.pop(job_id, None) is not None
+
+    def stats(self) -> dict:
+        with self._lock:
+            self._expire()
+            statuses = {}
+            for job in self._jobs.values():
+                status = job.status
+                statuses[status] = statuses.get(status, 0) + 1
+        return {
+            "jobs": len(self._jobs),
+            "statuses": statuses,
+            "max_jobs": self.max_jobs,
+            "ttl": self.ttl,
+            "submitted": self.submitted,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+    def _expire(self) -> None:
+        # TTL dihitung dari finished_at (waktu wall-clock yang juga dikembalikan di response)
+        deadline = time.time() - self.ttl
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job.finished and job.finished_at is not None and job.finished_at < deadline
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+        self.expirations += len(expired)
+
+    def _evict_finished(self) -> bool:
+        for job_id, job in self._jobs.items():
+            if job.finished:
+                del self._jobs[job_id]
+                self.evictions += 1
+                return True
+        return False
+
+
+job_store = JobStore()
+_pool = ProcessPool(Config.JOB_PROCESSES)
+
+
+def submit_job(method_name: str, arguments: dict, persist: str) -> Job:
+    """
+    Run ``CalculationModel.<method_name>(**arguments, persist=persist)`` in the job process pool.
+
+    A numeric ``decision_matrix`` is copied once into a shared memory block
+    and read in place by the pool process instead of being pickled; it is
+    released when the job finishes or is cancelled. Raises ``JobLimitError``
+    when this worker already has ``JOB_MAX_COUNT`` active jobs.
+    """
+    if method_name not in JOB_METHODS:
+        raise ValueError(f"Method '{method_name}' cannot run as a job.")
+    job_store.check_capacity()
+
+    arguments = dict(arguments)
+    shared = None
+    memory = None
+    matrix = arguments.get("decision_matrix")
+    if not method_name.endswith("_with_subcriteria"):
+        matrix = np.asarray(matrix, dtype=CalculationModel.resolve_dtype(arguments.get("dtype")))
+        memory = SharedMemory(create=True, size=max(1, matrix.nbytes))
+        np.ndarray(matrix.shape, matrix.dtype, buffer=memory.buf)[...] = matrix
+        shared = (memory.name, matrix.shape, matrix.dtype.str)
+        del arguments["decision_matrix"]
+
+    # Hasil job tidak ditunggu siapa pun, jadi write-behind (async) diganti penyimpanan langsung di proses pool
+    if persist == "async":
+        persist = "sync"
+
+    try:
+        future = _pool.get().submit(_run_job, method_name, arguments, persist, shared)
+    except Exception:
+        if memory is not None:
+            _release(memory)
+        raise
+
+    job = Job(method_name, future)
+
+    def _finished(future: Future) -> None:
+        job.finished_at = time.time()
+        if memory is not None:
+            _release(memory)
+        if not future.cancelled() and future.exception() is None and future.result()[1]:
+            # Backend memory: hasil yang disimpan proses pool dipindahkan ke repository worker ini
+            Connection.get_repository(CalculationModel().collection_name).save(future.result()[1])
+
+    future.add_done_callback(_finished)
+    job_store.add(job)
+    return job
+
+
+def cancel_job(job: Job) -> bool:
+    """
+    Cancel a job that has not started yet; a running job cannot be interrupted.
+    """
+    return job.future.cancel()
+
+
+def shutdown_job_pool() -> None:
+    """
+    Stop the job process pool of this worker; queued jobs are cancelled.
+    """
+    _pool.shutdown()
+
+
+def _release(memory: SharedMemory) -> None:
+    memory.close()
+    try:
+        memory.unlink()
+    except FileNotFoundError:
+        pass
+
+
+def _run_job(method_name: str, arguments: dict, persist: str, shared=None):
+    """
+    Entry point in the pool process; ``shared`` is ``(name, shape, dtype)`` of the decision matrix.
+
+    Returns ``(result, saved)``: ``saved`` are the documents written to the
+    in-memory backend of the pool process, which only the worker can serve.
+    """
+    memory = None
+    if shared is not None:
+        name, shape, dtype = shared
+        memory = SharedMemory(name=name)
+        matrix = np.ndarray(shape, dtype, buffer=memory.buf)
+        matrix.flags.writeable = False
+        arguments["decision_matrix"] = matrix
+        del matrix
+
+    # Blok shared memory baru bisa ditutup setelah tidak ada array (atau traceback) yang merujuknya,
+    # jadi exception diubah menjadi pesan dan dilempar ulang setelah close()
+    error = None
+    try:
+        model = CalculationModel()
+        result = getattr(model, method_name)(**arguments, persist=persist)
+        saved = model.repository.drain() if Config.STORAGE_BACKEND == "memory" else None
+        return result, saved
+    except ValueError as e:
+        error = ValueError(str(e))
+    except Exception as e:
+        error = RuntimeError(f"{type(e).__name__}: {e}")
+    finally:
+        arguments.clear()
+        if memory is not None:
+            memory.close()
+    raise error
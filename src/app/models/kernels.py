@@ -0,0 +1,159 @@
+import math
+import threading
+
+import numpy as np
+
+from app.utils.config import Config
+
+
+class Workspace:
+    """
+    Scratch buffers of one thread, reused by every calculation it runs.
+
+    ``buffer`` returns a view of a flat array that only grows, so repeated
+    requests of similar size do not allocate their temporaries again.
+    ``max_bytes`` bounds all buffers of the thread together: a request that
+    would take the total over it gets a one-off array instead, so large
+    requests do not pin their memory in every worker thread.
+    """
+
+    def __init__(self, max_bytes: int = Config.KERNEL_WORKSPACE_MAX_BYTES) -> None:
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self._buffers = {}
+
+    def buffer(self, name: str, shape: tuple, dtype: np.dtype) -> np.ndarray:
+        size = math.prod(shape)
+        key = (name, dtype)
+        flat = self._buffers.get(key)
+        if flat is None or flat.size < size:
+            if flat is not None:
+                # Buffer lama dilepas dulu, jadi total thread tidak menghitungnya dua kali
+                del self._buffers[key]
+                self.bytes -= flat.nbytes
+            nbytes = size * dtype.itemsize
+            if self.bytes + nbytes > self.max_bytes:
+                return np.empty(shape, dtype)
+            flat = self._buffers[key] = np.empty(size, dtype)
+            self.bytes += nbytes
+        return flat[:size].reshape(shape)
+
+
+_local = threading.local()
+
+
+def workspace() -> Workspace:
+    # Satu workspace per thread: worker gthread menjalankan beberapa request bersamaan
+    ws = getattr(_local, "workspace", None)
+    if ws is None:
+        ws = _local.workspace = Workspace()
+    return ws
+
+
+class ScoringKernels:
+    """
+    SAW and WP scores without A x C temporaries beyond one workspace buffer.
+
+    The normalization and the weighted row sum are fused into matrix-vector
+    products over the decision matrix itself; only the cost columns (SAW)
+    or ``log(X)`` (WP) need a scratch matrix, taken from ``workspace()``.
+    ``weights`` is C (scores of A) or S x C (S x A scores, one row per
+    scenario). Everything runs in the dtype of ``decision_matrix``, so a
+    float32 matrix is scored in float32.
+    """
+
+    @staticmethod
+    def saw(decision_matrix, weights, is_cost, col_min, col_max, out=None) -> np.ndarray:
+        """
+        ``sum_j w_j * r_ij`` with ``r = x / max`` (benefit) or ``min / x`` (cost).
+
+        Benefit terms are ``X @ (w / max)``; cost terms ``(1 / X[:, cost]) @ (w * min)``.
+        ``is_cost`` is C, or S x C when the type differs per scenario.
+        """
+        dtype = decision_matrix.dtype
+        n_alternatives = decision_matrix.shape[0]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            benefit_weights = np.where(is_cost, 0.0, weights / col_max).astype(dtype, copy=False)
+            cost_weights = np.where(is_cost, weights * col_min, 0.0).astype(dtype, copy=False)
+
+        if out is None:
+            out = np.empty(weights.shape[:-1] + (n_alternatives,), dtype)
+        np.matmul(benefit_weights, decision_matrix.T, out=out)
+
+        cost_columns = np.flatnonzero(is_cost if is_cost.ndim == 1 else is_cost.any(axis=0))
+        if cost_columns.size:
+            ws = workspace()
+            # Hanya kolom cost yang dibalik (1 / x), di buffer workspace
+            reciprocal = ws.buffer("saw.reciprocal", (n_alternatives, cost_columns.size), dtype)
+            np.take(decision_matrix, cost_columns, axis=1, out=reciprocal, mode="clip")
+            np.reciprocal(reciprocal, out=reciprocal)
+            cost_scores = ws.buffer("saw.cost_scores", out.shape, dtype)
+            np.matmul(cost_weights[..., cost_columns], reciprocal.T, out=cost_scores)
+            np.add(out, cost_scores, out=out)
+        return out
+
+    @staticmethod
+    def saw_bulk(decision_matrices, weights, is_cost, col_min, col_max) -> np.ndarray:
+        """
+        ``saw`` of P independent problems at once: P x A x C matrices, P x C weights, types and statistics.
+
+        Padded cells must hold a finite non-zero value (padded criteria a
+        zero weight); the P x A scores of padded alternatives are meaningless.
+        """
+        dtype = decision_matrices.dtype
+        # Masalah yang gagal validasi (statistik 0/inf) boleh menghasilkan skor tidak hingga; skornya dibuang
+        with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+            benefit_weights = np.where(is_cost, 0.0, weights / col_max).astype(dtype, copy=False)
+            cost_weights = np.where(is_cost, weights * col_min, 0.0).astype(dtype, copy=False)
+
+            # Perkalian matriks-vektor per masalah: (P x A x C) @ (P x C x 1)
+            scores = np.matmul(decision_matrices, benefit_weights[..., None])[..., 0]
+            if is_cost.any():
+                # 1 / x hanya di kolom cost; kolom lain 0 (bisa berisi nol pada kriteria benefit)
+                reciprocal = workspace().buffer("saw.bulk_reciprocal", decision_matrices.shape, dtype)
+                reciprocal.fill(0)
+                np.divide(1.0, decision_matrices, out=reciprocal, where=is_cost[:, None, :])
+                scores += np.matmul(reciprocal, cost_weights[..., None])[..., 0]
+        return scores
+
+    @staticmethod
+    def wp_log_scores_bulk(signed_weights, decision_matrices) -> np.ndarray:
+        """
+        ``log(X) @ signed_w`` of P problems (P x C weights, P x A x C matrices) as P x A.
+
+        Unlike ``wp_log_scores`` non-finite scores are returned as they are,
+        so the caller can fall back per problem.
+        """
+        dtype = decision_matrices.dtype
+        log_matrices = workspace().buffer("wp.bulk_log", decision_matrices.shape, dtype)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            np.log(decision_matrices, out=log_matrices)
+            return np.matmul(log_matrices, signed_weights.astype(dtype, copy=False)[..., None])[..., 0]
+
+    @staticmethod
+    def wp_log_scores(signed_weights, decision_matrix) -> np.ndarray | None:
+        """
+        ``log(X) @ signed_w`` with ``log(X)`` in a workspace buffer.
+
+        Returns ``None`` when a score is not finite (a zero in X), so the
+        caller can fall back to the zero-masked ``_log_matrix`` path.
+        """
+        dtype = decision_matrix.dtype
+        log_matrix = workspace().buffer("wp.log", decision_matrix.shape, dtype)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            np.log(decision_matrix, out=log_matrix)
+            log_scores = np.matmul(signed_weights.astype(dtype, copy=False), log_matrix.T)
+        if not np.isfinite(log_scores).all():
+            return None
+        return log_scores
+
+    @staticmethod
+    def normalize_log_scores(log_scores) -> np.ndarray:
+        """
+        ``exp(s) / sum(exp(s))`` per row, in place (log-sum-exp shift against overflow).
+        """
+        with np.errstate(invalid="ignore"):
+            log_scores -= log_scores.max(axis=-1, keepdims=True)
+        np.exp(log_scores, out=log_scores)
+        log_scores /= log_scores.sum(axis=-1, keepdims=True)
+        return log_scores
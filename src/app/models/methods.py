@@ -0,0 +1,230 @@
+from functools import cached_property
+
+import numpy as np
+
+from app.models.calculation_model import CalculationModel
+from app.models.criteria_schema import CriteriaSchema
+from app.models.kernels import ScoringKernels
+from app.utils.trace import trace_stage, trace_value
+
+# Kendall tau O(A^2); di atas batas ini hanya Spearman yang dihitung
+MAX_KENDALL_ALTERNATIVES = 5000
+KENDALL_BLOCK_ROWS = 256
+
+
+class ColumnStats:
+    """
+    Per-column statistics of one validated A x C decision matrix, computed on
+    first use and shared by every method scored against the same matrix.
+    """
+
+    def __init__(self, decision_matrix, is_cost) -> None:
+        self.decision_matrix = decision_matrix
+        self.is_cost = is_cost
+
+    @cached_property
+    def col_min(self) -> np.ndarray:
+        return self.decision_matrix.min(axis=0, initial=np.inf)
+
+    @cached_property
+    def col_max(self) -> np.ndarray:
+        return self.decision_matrix.max(axis=0, initial=-np.inf)
+
+    @cached_property
+    def norm(self) -> np.ndarray:
+        # Norma Euclidean per kolom (normalisasi vektor TOPSIS)
+        return np.sqrt(np.einsum("ij,ij->j", self.decision_matrix, self.decision_matrix))
+
+
+class MethodRegistry:
+    """
+    Scoring methods keyed by name. A method is ``scorer(stats, weights) -> scores``
+    and reads whatever it needs from the shared ``ColumnStats``.
+
+    ``validate_criteria(schema, criteria)`` optionally applies the weight
+    rules of the method's own v2 endpoint to a ``criteria`` tree.
+    """
+
+    _methods = {}
+    _criteria_validators = {}
+
+    @classmethod
+    def register(cls, name: str, validate_criteria=None):
+        def decorator(scorer):
+            cls._methods[name] = scorer
+            if validate_criteria is not None:
+                cls._criteria_validators[name] = validate_criteria
+            return scorer
+        return decorator
+
+    @classmethod
+    def validate_criteria(cls, name: str, schema: CriteriaSchema, criteria) -> None:
+        validator = cls._criteria_validators.get(name)
+        if validator is not None:
+            validator(schema, criteria)
+
+    @classmethod
+    def names(cls) -> list[str]:
+        return list(cls._methods)
+
+    @classmethod
+    def get(cls, name: str):
+        if name not in cls._methods:
+            raise ValueError(f"Unknown method '{name}'. Expected one of: {', '.join(cls._methods)}.")
+        return cls._methods[name]
+
+
+def validate_saw_criteria(schema: CriteriaSchema, criteria) -> None:
+    # Aturan yang sama dengan /saw/v2/calculate: total bobot aktual harus 1
+    if not np.isclose(schema.weights.sum(), 1.0):
+        raise ValueError(CalculationModel._saw_subcriteria_weight_error(criteria))
+
+
+def validate_wp_criteria(schema: CriteriaSchema, criteria) -> None:
+    # Aturan yang sama dengan /wp/v2/calculate: setiap bobot aktual pada skala 1-5
+    CalculationModel._validate_wp_subcriteria_weights(schema.names, schema.weights.astype(float))
+
+
+@MethodRegistry.register("saw", validate_criteria=validate_saw_criteria)
+def score_saw(stats: ColumnStats, weights) -> np.ndarray:
+    # Bobot dipakai apa adanya, sama seperti /saw/calculate; kernel yang sama dengan CalculationModel
+    CalculationModel._check_saw_stats(stats.is_cost, stats.col_min, stats.col_max)
+    return ScoringKernels.saw(stats.decision_matrix, weights, stats.is_cost, stats.col_min, stats.col_max)
+
+
+@MethodRegistry.register("wp", validate_criteria=validate_wp_criteria)
+def score_wp(stats: ColumnStats, weights) -> np.ndarray:
+    for i in np.flatnonzero(stats.is_cost & (stats.decision_matrix == 0).any(axis=0)):
+        raise ValueError(
+            f"Zero value found in cost criterion at index {i}, cannot divide by zero."
+        )
+    weights = weights / weights.sum()
+    signed_weights = np.where(stats.is_cost, -weights, weights)
+    return CalculationModel._weighted_product_kernel(signed_weights, stats.decision_matrix)
+
+
+@MethodRegistry.register("topsis")
+def score_topsis(stats: ColumnStats, weights) -> np.ndarray:
+    for i in np.flatnonzero(stats.norm == 0):
+        raise ValueError(
+            f"All values of criterion at index {i} are zero, cannot normalize for TOPSIS."
+        )
+    weights = weights / weights.sum()
+    scale = weights / stats.norm
+    weighted_matrix = stats.decision_matrix * scale
+    # Solusi ideal positif/negatif dari min/max kolom yang sudah dihitung (bobot >= 0)
+    ideal_best = np.where(stats.is_cost, stats.col_min, stats.col_max) * scale
+    ideal_worst = np.where(stats.is_cost, stats.col_max, stats.col_min) * scale
+    distance_best = np.sqrt(((weighted_matrix - ideal_best) ** 2).sum(axis=1))
+    distance_worst = np.sqrt(((weighted_matrix - ideal_worst) ** 2).sum(axis=1))
+    total = distance_best + distance_worst
+    # Semua alternatif identik: jarak 0 ke kedua solusi ideal
+    return np.divide(distance_worst, total, out=np.full_like(total, 0.5), where=total > 0)
+
+
+def competition_ranks(scores) -> np.ndarray:
+    """
+    Rank 1 = highest score; equal scores share the best rank (1, 2, 2, 4).
+    """
+    descending = np.sort(-scores)
+    return np.searchsorted(descending, -scores, side="left") + 1
+
+
+def _average_ranks(values) -> np.ndarray:
+    order = np.argsort(values, kind="stable")
+    ranks = np.empty(len(values))
+    ranks[order] = np.arange(1, len(values) + 1)
+    _, inverse, counts = np.unique(values, return_inverse=True, return_counts=True)
+    return (np.bincount(inverse, weights=ranks) / counts)[inverse]
+
+
+def spearman_rho(a, b) -> float | None:
+    ranks_a, ranks_b = _average_ranks(a), _average_ranks(b)
+    ranks_a -= ranks_a.mean()
+    ranks_b -= ranks_b.mean()
+    denominator = np.sqrt((ranks_a ** 2).sum() * (ranks_b ** 2).sum())
+    return float((ranks_a * ranks_b).sum() / denominator) if denominator > 0 else None
+
+
+def kendall_tau(a, b) -> float | None:
+    """
+    Kendall tau-b, computed in row blocks so memory stays at ``KENDALL_BLOCK_ROWS`` x A.
+    """
+    n = len(a)
+    if n < 2 or n > MAX_KENDALL_ALTERNATIVES:
+        return None
+    score = tied_a = tied_b = 0
+    for start in range(0, n, KENDALL_BLOCK_ROWS):
+        sign_a = np.sign(a[start:start + KENDALL_BLOCK_ROWS, None] - a[None, :])
+        sign_b = np.sign(b[start:start + KENDALL_BLOCK_ROWS, None] - b[None, :])
+        score += (sign_a * sign_b).sum()
+        tied_a += (sign_a == 0).sum()
+        tied_b += (sign_b == 0).sum()
+    # Matriks penuh menghitung tiap pasangan dua kali dan diagonal (i == j) sebagai seri
+    pairs = n * (n - 1) / 2
+    tied_a = (tied_a - n) / 2
+    tied_b = (tied_b - n) / 2
+    denominator = np.sqrt((pairs - tied_a) * (pairs - tied_b))
+    return float(score / 2 / denominator) if denominator > 0 else None
+
+
+def compare_methods(
+    decision_matrix, criteria=None, criteria_weights=None, criteria_types=None, methods=None
+) -> dict:
+    """
+    Score one decision matrix with several registered methods.
+
+    The input (v1 ``criteria_weights``/``criteria_types`` or v2 ``criteria``)
+    is parsed and validated once and the column statistics are shared, so
+    each extra method costs only its own O(A x C) scoring step.
+    """
+    methods = list(methods) if methods else MethodRegistry.names()
+    scorers = {name: MethodRegistry.get(name) for name in methods}
+
+    if criteria is not None:
+        schema = CriteriaSchema.compile(criteria)
+        if schema.unknown.any():
+            i = np.flatnonzero(schema.unknown)[0]
+            raise ValueError(f"Jenis kriteria '{schema.types[i]}' pada sub-kriteria '{schema.names[i]}' tidak dikenal.")
+        # Bobot v2 divalidasi dengan aturan endpoint v2 setiap method yang diminta
+        for name in methods:
+            MethodRegistry.validate_criteria(name, schema, criteria)
+        with trace_stage("compare.assemble", (len(decision_matrix), len(schema.names))):
+            matrix = schema.assemble(decision_matrix)
+        weights = schema.weights.astype(float)
+        is_cost = schema.is_cost
+        alternative_names = [alternative['alternative'] for alternative in decision_matrix]
+    else:
+        matrix = np.array(decision_matrix, dtype=float)
+        weights = np.array(criteria_weights if criteria_weights is not None else [], dtype=float)
+        if matrix.ndim != 2 or weights.shape != (matrix.shape[1],):
+            raise ValueError(
+                "The number of criteria weights must match the number of columns in the decision matrix."
+            )
+        is_cost = CalculationModel._cost_mask(criteria_types, matrix.shape[1])
+        alternative_names = None
+    if (weights < 0).any() or not weights.sum() > 0:
+        raise ValueError("Criteria weights must be non-negative with a positive sum.")
+
+    stats = ColumnStats(matrix, is_cost)
+    scores = {}
+    for name, scorer in scorers.items():
+        with trace_stage(f"compare.{name}", matrix.shape):
+            scores[name] = scorer(stats, weights)
+        trace_value(f"{name}_scores", scores[name])
+
+    correlation = {}
+    for i, first in enumerate(methods):
+        for second in methods[i + 1:]:
+            correlation[f"{first}/{second}"] = {
+                "spearman": spearman_rho(scores[first], scores[second]),
+                "kendall": kendall_tau(scores[first], scores[second]),
+            }
+
+    return {
+        "methods": methods,
+        "alternatives": alternative_names,
+        "scores": {name: values.tolist() for name, values in scores.items()},
+        "rankings": {name: competition_ranks(values).tolist() for name, values in scores.items()},
+        "rank_correlation": correlation,
+    }
@@ -0,0 +1,174 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from app.models.calculation_model import CalculationModel
+from app.models.decision_session import DecisionSession
+from app.utils.config import Config
+from app.utils.process_pool import ProcessPool
+from app.utils.trace import trace_stage, trace_value
+
+DISTRIBUTIONS = ("dirichlet", "interval")
+DEFAULT_SAMPLES = 10000
+DEFAULT_CONCENTRATION = 100.0
+DEFAULT_SPREAD = 0.2
+# Matriks rank acceptability berukuran A x A, jadi jumlah alternatif dibatasi
+MAX_ALTERNATIVES = 2000
+
+
+class SensitivityAnalysis:
+    """
+    SMAA-2 weight sensitivity of a prepared ``DecisionSession``.
+
+    Weight vectors are sampled around the session weights, either from a
+    Dirichlet distribution (``concentration`` x weights) or uniformly within
+    ``+-spread`` of every weight, and scored in chunks of
+    ``Config.SENSITIVITY_CHUNK_SIZE`` samples against the precomputed
+    normalized/log matrix. Every chunk draws from its own child of
+    ``SeedSequence(seed)``, so a seed gives the same result whether the chunks
+    run in this process or in the process pool.
+    """
+
+    @staticmethod
+    def run(
+        session: DecisionSession, samples: int = DEFAULT_SAMPLES, distribution: str = "dirichlet",
+        concentration: float = DEFAULT_CONCENTRATION, spread: float = DEFAULT_SPREAD, seed: int | None = None,
+    ) -> dict:
+        n_alternatives, n_criteria = session.prepared.shape
+        SensitivityAnalysis._validate(session, n_alternatives, samples, distribution, concentration, spread, seed)
+        if seed is None:
+            # Seed acak dikembalikan di response agar hasil bisa diulang
+            seed = int(np.random.SeedSequence().generate_state(1)[0])
+
+        base_weights = session.weights / session.weights.sum()
+        parameter = concentration if distribution == "dirichlet" else spread
+
+        chunk_size = Config.SENSITIVITY_CHUNK_SIZE
+        sizes = [min(chunk_size, samples - start) for start in range(0, samples, chunk_size)]
+        seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+        step = Config.SENSITIVITY_CHUNKS_PER_TASK
+        tasks = [
+            (
+                session.method_name, session.prepared, session.is_cost, session.zero_mask,
+                base_weights, distribution, parameter, seeds[i:i + step], sizes[i:i + step],
+            )
+            for i in range(0, len(sizes), step)
+        ]
+
+        parallel = (
+            0 < Config.SENSITIVITY_PARALLEL_MIN <= samples
+            and Config.SENSITIVITY_PROCESSES > 1
+            and len(tasks) > 1
+        )
+        with trace_stage(f"{session.method_name}.sensitivity", (samples, n_alternatives, n_criteria)):
+            partials = get_sensitivity_pool().map(_run_task, tasks) if parallel else map(_run_task, tasks)
+            # Digabung sesuai urutan task agar hasil tidak tergantung pada paralelisme
+            rank_counts = np.zeros((n_alternatives, n_alternatives), dtype=np.int64)
+            central_sum = np.zeros((n_alternatives, n_criteria))
+            for task_counts, task_central in partials:
+                rank_counts += task_counts
+                central_sum += task_central
+
+        rank_acceptability = rank_counts / samples
+        first_counts = rank_counts[:, 0]
+        winners = np.flatnonzero(first_counts)
+        central_weights = central_sum[winners] / first_counts[winners, None]
+
+        # Faktor kepercayaan: apakah alternatif juara dengan bobot sentralnya sendiri.
+        # Nilai kriteria pasti (tanpa sampel), jadi hasilnya 1 atau 0.
+        central_scores = _score(session.method_name, session.prepared, session.is_cost, session.zero_mask, central_weights)
+        confidence = (np.argmax(central_scores, axis=1) == winners).astype(float) if len(winners) else np.zeros(0)
+        trace_value("rank_acceptability", rank_acceptability)
+
+        central_weights_out = [None] * n_alternatives
+        confidence_out = [None] * n_alternatives
+        for k, i in enumerate(winners):
+            central_weights_out[i] = central_weights[k].tolist()
+            confidence_out[i] = float(confidence[k])
+
+        return {
+            "samples": samples,
+            "seed": seed,
+            "distribution": distribution,
+            "alternatives": session.alternative_names,
+            "rank_acceptability": rank_acceptability.tolist(),
+            "central_weights": central_weights_out,
+            "confidence_factors": confidence_out,
+        }
+
+    @staticmethod
+    def _validate(session, n_alternatives, samples, distribution, concentration, spread, seed) -> None:
+        if not isinstance(samples, int) or not (1 <= samples <= Config.SENSITIVITY_MAX_SAMPLES):
+            raise ValueError(f"samples must be an integer between 1 and {Config.SENSITIVITY_MAX_SAMPLES}.")
+        if distribution not in DISTRIBUTIONS:
+            raise ValueError(
+                f"Unknown distribution '{distribution}'. Expected one of: {', '.join(DISTRIBUTIONS)}."
+            )
+        if not concentration > 0:
+            raise ValueError("concentration must be greater than 0.")
+        if not 0 <= spread < 1:
+            raise ValueError("spread must be between 0 and 1 (exclusive).")
+        if seed is not None and (not isinstance(seed, int) or seed < 0):
+            raise ValueError("seed must be a non-negative integer.")
+        if n_alternatives > MAX_ALTERNATIVES:
+            raise ValueError(f"Sensitivity analysis supports at most {MAX_ALTERNATIVES} alternatives.")
+        if (session.weights < 0).any() or not session.weights.sum() > 0:
+            raise ValueError("Sensitivity analysis requires non-negative criteria weights with a positive sum.")
+
+
+def _sample_weights(rng, base_weights, size: int, distribution: str, parameter: float) -> np.ndarray:
+    if distribution == "dirichlet":
+        # Kriteria berbobot 0 tetap 0 (Dirichlet butuh alpha > 0)
+        positive = base_weights > 0
+        weights = np.zeros((size, len(base_weights)))
+        weights[:, positive] = rng.dirichlet(parameter * base_weights[positive], size)
+        return weights
+    weights = base_weights * rng.uniform(1 - parameter, 1 + parameter, (size, len(base_weights)))
+    return weights / weights.sum(axis=1, keepdims=True)
+
+
+def _score(method_name: str, prepared, is_cost, zero_mask, weights) -> np.ndarray:
+    # S x C bobot -> S x A skor, dengan matriks yang sudah disiapkan sesi
+    if method_name.startswith("simple_additive_weighting"):
+        return weights @ prepared.T
+    signed_weights = np.where(is_cost, -weights, weights)
+    return CalculationModel._weighted_product_from_log(signed_weights, prepared, zero_mask)
+
+
+def _run_task(task) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Score a group of chunks; returns rank counts (A x A) and summed first-rank weights (A x C).
+    """
+    method_name, prepared, is_cost, zero_mask, base_weights, distribution, parameter, seeds, sizes = task
+    n_alternatives, n_criteria = prepared.shape
+    rank_counts = np.zeros(n_alternatives * n_alternatives, dtype=np.int64)
+    central_sum = np.zeros((n_alternatives, n_criteria))
+    rank_index = np.arange(n_alternatives)
+
+    for seed, size in zip(seeds, sizes):
+        rng = np.random.default_rng(seed)
+        weights = _sample_weights(rng, base_weights, size, distribution, parameter)
+        scores = _score(method_name, prepared, is_cost, zero_mask, weights)
+        # order[s, r] = alternatif pada peringkat r untuk sampel s
+        order = np.argsort(-scores, axis=1, kind="stable")
+        rank_counts += np.bincount((order * n_alternatives + rank_index).ravel(), minlength=rank_counts.size)
+        np.add.at(central_sum, order[:, 0], weights)
+
+    return rank_counts.reshape(n_alternatives, n_alternatives), central_sum
+
+
+_pool = ProcessPool(Config.SENSITIVITY_PROCESSES)
+
+
+def get_sensitivity_pool() -> ProcessPoolExecutor:
+    """
+    Process pool of this worker, created on first large analysis.
+    """
+    return _pool.get()
+
+
+def shutdown_sensitivity_pool() -> None:
+    """
+    Stop the process pool if this worker ever started one; called on worker shutdown.
+    """
+    _pool.shutdown()
@@ -0,0 +1,213 @@
+import io
+import json
+import os
+import tempfile
+from itertools import islice
+
+import numpy as np
+
+from app.models.calculation_model import CalculationModel
+from app.utils.config import Config
+from app.utils.trace import trace_stage
+
+# Content-Type -> format file upload
+INPUT_FORMATS = {
+    "text/csv": "csv",
+    "application/x-ndjson": "ndjson",
+    "application/x-npy": "npy",
+    "application/octet-stream": "npy",
+}
+SPOOL_BLOCK_BYTES = 1024 * 1024
+
+
+def spool_upload(stream, suffix: str = "") -> str:
+    """
+    Copy an upload stream to a temporary file in fixed-size blocks; returns its path.
+
+    The caller removes the file. Uploads above ``Config.UPLOAD_MAX_BYTES`` raise ``ValueError``.
+    """
+    fd, path = tempfile.mkstemp(suffix=suffix, dir=Config.UPLOAD_SPOOL_DIR)
+    try:
+        written = 0
+        with os.fdopen(fd, "wb") as spool:
+            while block := stream.read(SPOOL_BLOCK_BYTES):
+                written += len(block)
+                if written > Config.UPLOAD_MAX_BYTES:
+                    raise ValueError(f"Upload exceeds the limit of {Config.UPLOAD_MAX_BYTES} bytes.")
+                spool.write(block)
+    except BaseException:
+        os.remove(path)
+        raise
+    return path
+
+
+class TopK:
+    """
+    Running top-k (highest score, lowest row index on ties) over score blocks.
+
+    Each block is merged with the current candidates by ``np.argpartition``,
+    so memory stays at k + one block regardless of the number of rows.
+    """
+
+    def __init__(self, k: int) -> None:
+        self.k = k
+        self.indices = np.zeros(0, dtype=np.int64)
+        self.scores = np.zeros(0)
+
+    def push(self, indices, scores) -> None:
+        indices = np.concatenate([self.indices, indices])
+        scores = np.concatenate([self.scores, scores])
+        if len(scores) > self.k:
+            # NaN diperlakukan sebagai skor terendah
+            keep = np.argpartition(np.nan_to_num(-scores, nan=np.inf), self.k - 1)[:self.k]
+            indices, scores = indices[keep], scores[keep]
+        self.indices, self.scores = indices, scores
+
+    def result(self) -> list[dict]:
+        order = np.lexsort((self.indices, np.nan_to_num(-self.scores, nan=np.inf)))
+        return [
+            {"rank": rank, "index": int(self.indices[i]), "score": float(self.scores[i])}
+            for rank, i in enumerate(order, start=1)
+        ]
+
+
+class UploadScoring:
+    """
+    Out-of-core SAW / WP scoring of a decision matrix file (CSV, NDJSON or ``.npy``).
+
+    ``prepare`` is the first pass over the file: row count and validation plus
+    the per-column min/max (SAW) or the log-sum-exp of all scores (WP).
+    ``iter_scores`` is the second pass and yields ``(row_indices, scores)`` per
+    block of ``Config.UPLOAD_BLOCK_ROWS`` rows, normalized exactly like ``/calculate``.
+    """
+
+    def __init__(
+        self, method: str, path: str, input_format: str, criteria_weights, criteria_types, header: bool = False
+    ) -> None:
+        if method not in ("simple_additive_weighting", "weighted_product"):
+            raise ValueError(f"Unknown upload method '{method}'.")
+        if input_format not in ("csv", "ndjson", "npy"):
+            raise ValueError(f"Unknown input format '{input_format}'. Expected one of: csv, ndjson, npy.")
+        self.method = method
+        self.path = path
+        self.input_format = input_format
+        self.header = header
+        self.criteria_weights = np.array(criteria_weights, dtype=float)
+        self.is_cost = CalculationModel._cost_mask(criteria_types, len(self.criteria_weights))
+        self.block_rows = Config.UPLOAD_BLOCK_ROWS
+        self.rows = 0
+        self.col_min = None
+        self.col_max = None
+        self.signed_weights = None
+        self.log_norm = None
+
+    def prepare(self) -> None:
+        n_criteria = len(self.criteria_weights)
+        col_min = np.full(n_criteria, np.inf)
+        col_max = np.full(n_criteria, -np.inf)
+        cost_zero = np.zeros(n_criteria, dtype=bool)
+        if self.method == "weighted_product":
+            self.criteria_weights = self.criteria_weights / self.criteria_weights.sum()
+            signed_weights = np.where(self.is_cost, -self.criteria_weights, self.criteria_weights)
+            # Log-sum-exp berjalan: log_norm = log(sum(prod)) tanpa overflow
+            running_max, running_sum = -np.inf, 0.0
+
+        with trace_stage(f"{self.method}.upload.prepare"):
+            for start, block in self._blocks():
+                self.rows = start + len(block)
+                if self.method == "simple_additive_weighting":
+                    np.minimum(col_min, block.min(axis=0), out=col_min)
+                    np.maximum(col_max, block.max(axis=0), out=col_max)
+                    continue
+
+                cost_zero |= (self.is_cost & (block == 0)).any(axis=0)
+                if cost_zero.any():
+                    continue
+                log_scores = CalculationModel._weighted_product_log_scores(
+                    signed_weights, *CalculationModel._log_matrix(block)
+                )
+                block_max = log_scores.max()
+                if block_max == -np.inf:
+                    continue
+                new_max = max(running_max, block_max)
+                running_sum = running_sum * np.exp(running_max - new_max) + np.exp(log_scores - new_max).sum()
+                running_max = new_max
+
+        if self.rows == 0:
+            raise ValueError("The uploaded decision matrix has no rows.")
+        if self.method == "simple_additive_weighting":
+            # Validasi nol sama seperti /calculate (min cost / max benefit)
+            CalculationModel._check_saw_stats(self.is_cost, col_min, col_max)
+            self.col_min, self.col_max = col_min, col_max
+        else:
+            for i in np.flatnonzero(cost_zero):
+                raise ValueError(
+                    f"Zero value found in cost criterion at index {i}, cannot divide by zero."
+                )
+            self.signed_weights = signed_weights
+            self.log_norm = running_max + np.log(running_sum) if running_sum > 0 else np.nan
+
+    def iter_scores(self):
+        if self.rows == 0:
+            raise ValueError("prepare() must run before iter_scores().")
+        with trace_stage(f"{self.method}.upload.score", (self.rows, len(self.criteria_weights))):
+            for start, block in self._blocks():
+                if self.method == "simple_additive_weighting":
+                    normalized = CalculationModel._normalize_saw(block, self.is_cost, self.col_min, self.col_max)
+                    scores = normalized @ self.criteria_weights
+                else:
+                    log_scores = CalculationModel._weighted_product_log_scores(
+                        self.signed_weights, *CalculationModel._log_matrix(block)
+                    )
+                    scores = np.exp(log_scores - self.log_norm)
+                yield np.arange(start, start + len(block)), scores
+
+    def top_k(self, k: int) -> list[dict]:
+        top = TopK(k)
+        for indices, scores in self.iter_scores():
+            top.push(indices, scores)
+        return top.result()
+
+    def _blocks(self):
+        n_criteria = len(self.criteria_weights)
+        start = 0
+        for block in self._read_blocks():
+            if block.ndim != 2 or block.shape[1] != n_criteria:
+                raise ValueError(
+                    f"Rows {start}-{start + len(block) - 1}: the number of values must match the number of criteria weights ({n_criteria})."
+                )
+            missing = np.isnan(block).any(axis=1)
+            if missing.any():
+                raise ValueError(f"Row {start + int(np.argmax(missing))} contains missing or non-numeric values.")
+            yield start, block
+            start += len(block)
+
+    def _read_blocks(self):
+        if self.input_format == "npy":
+            try:
+                matrix = np.load(self.path, mmap_mode="r", allow_pickle=False)
+            except ValueError as e:
+                raise ValueError(f"Invalid .npy upload: {e}")
+            if matrix.ndim != 2:
+                raise ValueError("The uploaded .npy array must be 2-dimensional.")
+            for start in range(0, len(matrix), self.block_rows):
+                yield np.asarray(matrix[start:start + self.block_rows], dtype=float)
+            return
+
+        with io.open(self.path, "r", encoding="utf-8", newline="") as file:
+            if self.input_format == "csv" and self.header:
+                next(file, None)
+            row = 0
+            while raw_lines := list(islice(file, self.block_rows)):
+                lines = [line for line in raw_lines if line.strip()]
+                if not lines:
+                    continue
+                try:
+                    if self.input_format == "csv":
+                        block = np.loadtxt(lines, delimiter=",", dtype=float, ndmin=2)
+                    else:
+                        block = np.array([json.loads(line) for line in lines], dtype=float)
+                except (ValueError, TypeError) as e:
+                    raise ValueError(f"Invalid {self.input_format} upload near row {row}: {e}")
+                row += len(lines)
+                yield block
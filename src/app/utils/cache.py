@@ -0,0 +1,117 @@
+import hashlib
+import json
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+from app.utils.config import Config
+
+
+def content_hash(*parts) -> str:
+    """
+    Canonical SHA-256 of calculation inputs; used as cache key and Firestore document ID.
+
+    Arrays are hashed as float64 bytes plus shape, everything else as sorted-key JSON,
+    so ``[1, 2]`` and ``[1.0, 2.0]`` give the same key. float32 arrays are
+    hashed as their own bytes (tagged with the dtype) instead of a float64 copy.
+    """
+    digest = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, np.ndarray):
+            if part.dtype == np.float32:
+                array = np.ascontiguousarray(part)
+                digest.update(f"ndarray{array.shape}float32".encode())
+            else:
+                array = np.ascontiguousarray(part, dtype=np.float64)
+                digest.update(f"ndarray{array.shape}".encode())
+            # Buffer array langsung di-hash, tanpa salinan tobytes()
+            digest.update(memoryview(array).cast("B"))
+        else:
+            digest.update(json.dumps(part, sort_keys=True, separators=(",", ":"), default=str).encode())
+        digest.update(b"\x00")
+    return digest.hexdigest()
+
+
+def _sizeof(value) -> int:
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(sys.getsizeof(k) + 32 for k in value)
+    return sys.getsizeof(value)
+
+
+class ResultCache:
+    """
+    Thread-safe LRU + TTL cache of calculation results, bounded by total bytes.
+
+    Each entry remembers whether its result was already persisted, so a
+    repeat that asks for persistence after a ``persist=none`` call is not
+    served from the cache.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = Config.RESULT_CACHE_MAX_BYTES,
+        ttl: float = Config.RESULT_CACHE_TTL,
+    ) -> None:
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str, persist: str = "none"):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] < now:
+                self._remove(key)
+                entry = None
+            if entry is None or (persist != "none" and not entry[3]):
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            value = entry[2]
+        return value.copy()
+
+    def put(self, key: str, value, persist: str = "none") -> None:
+        size = _sizeof(value)
+        if self.max_bytes <= 0 or size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.monotonic() + self.ttl, size, value, persist != "none")
+            self.bytes += size
+            while self.bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "bytes": self.bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    def _remove(self, key: str) -> None:
+        _, size, _, _ = self._entries.pop(key)
+        self.bytes -= size
+
+
+result_cache = ResultCache()
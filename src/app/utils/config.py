@@ -1,18 +1,138 @@
+import logging
 import os
-import firebase_admin
-from firebase_admin import credentials
 
 class Config:
+    # Mode penyimpanan hasil: sync (tunggu Firestore), async (write-behind), none (tidak disimpan)
+    PERSIST_MODES = ("sync", "async", "none")
+    DEFAULT_PERSIST = os.environ.get("DEFAULT_PERSIST", "sync")
+    # Presisi perhitungan per request (?dtype=); float32 opt-in: setengah memori, toleransi di readme
+    DTYPES = ("float64", "float32")
+    DEFAULT_DTYPE = os.environ.get("DEFAULT_DTYPE", "float64")
+    # Batas total buffer kerja kernel yang disimpan per thread worker (semua buffer bersama);
+    # di atasnya buffer dialokasikan per request. Worker async menjalankan banyak thread, jadi tetap kecil
+    KERNEL_WORKSPACE_MAX_BYTES = int(os.environ.get("KERNEL_WORKSPACE_MAX_BYTES", str(16 * 1024 * 1024)))
+
+    # Pengaturan antrian write-behind (persist=async)
+    WRITE_BEHIND_MAX_SIZE = int(os.environ.get("WRITE_BEHIND_MAX_SIZE", "10000"))
+    WRITE_BEHIND_BATCH_SIZE = int(os.environ.get("WRITE_BEHIND_BATCH_SIZE", "499"))
+    WRITE_BEHIND_FLUSH_INTERVAL = float(os.environ.get("WRITE_BEHIND_FLUSH_INTERVAL", "1.0"))
+
+    # Cache hasil perhitungan (LRU + TTL) per worker
+    RESULT_CACHE_MAX_BYTES = int(os.environ.get("RESULT_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+    RESULT_CACHE_TTL = float(os.environ.get("RESULT_CACHE_TTL", "300"))
+
+    # Jumlah schema kriteria v2 (hasil flatten) yang disimpan per worker
+    SCHEMA_CACHE_SIZE = int(os.environ.get("SCHEMA_CACHE_SIZE", "256"))
+
+    # Sesi slider bobot (matriks dinormalisasi disimpan di memori worker), dibatasi jumlah, bytes dan TTL
+    SESSION_MAX_COUNT = int(os.environ.get("SESSION_MAX_COUNT", "1000"))
+    SESSION_MAX_BYTES = int(os.environ.get("SESSION_MAX_BYTES", str(256 * 1024 * 1024)))
+    SESSION_TTL = float(os.environ.get("SESSION_TTL", "1800"))
+
+    # Analisis sensitivitas bobot (SMAA): jumlah sampel maksimum, ukuran chunk dan process pool
+    SENSITIVITY_MAX_SAMPLES = int(os.environ.get("SENSITIVITY_MAX_SAMPLES", "1000000"))
+    SENSITIVITY_CHUNK_SIZE = int(os.environ.get("SENSITIVITY_CHUNK_SIZE", "2048"))
+    SENSITIVITY_CHUNKS_PER_TASK = int(os.environ.get("SENSITIVITY_CHUNKS_PER_TASK", "16"))
+    # Mulai jumlah sampel ini perhitungan dibagi ke process pool; 0 = selalu di proses worker
+    SENSITIVITY_PARALLEL_MIN = int(os.environ.get("SENSITIVITY_PARALLEL_MIN", "100000"))
+    SENSITIVITY_PROCESSES = int(os.environ.get("SENSITIVITY_PROCESSES", str(os.cpu_count() or 1)))
+
+    # Endpoint bulk (/saw/bulk, /wp/bulk): banyak masalah kecil dihitung dalam satu tensor P x A x C berpadding
+    BULK_MAX_PROBLEMS = int(os.environ.get("BULK_MAX_PROBLEMS", "10000"))
+    BULK_MAX_CELLS = int(os.environ.get("BULK_MAX_CELLS", "50000000"))  # sel tensor termasuk padding
+
+    # Jumlah worker gunicorn (juga dibaca gunicorn.conf.py); job dan sesi hanya ada di worker yang membuatnya
+    GUNICORN_WORKERS = int(os.environ.get("GUNICORN_WORKERS", "1"))
+
+    # Job latar belakang: request calculate dengan matriks >= JOB_ASYNC_MIN_CELLS sel (atau ?async=1)
+    # dihitung di process pool dan langsung dijawab dengan job ID; 0 = hanya lewat ?async=1
+    JOB_ASYNC_MIN_CELLS = int(os.environ.get("JOB_ASYNC_MIN_CELLS", "5000000"))
+    JOB_PROCESSES = int(os.environ.get("JOB_PROCESSES", str(os.cpu_count() or 1)))
+    JOB_MAX_COUNT = int(os.environ.get("JOB_MAX_COUNT", "1000"))
+    JOB_TTL = float(os.environ.get("JOB_TTL", "3600"))  # detik hasil disimpan setelah job selesai
+
+    # Upload matriks besar (CSV/NDJSON/.npy): disimpan sementara ke disk lalu dibaca per blok baris
+    UPLOAD_MAX_BYTES = int(os.environ.get("UPLOAD_MAX_BYTES", str(4 * 1024 * 1024 * 1024)))
+    UPLOAD_BLOCK_ROWS = int(os.environ.get("UPLOAD_BLOCK_ROWS", "65536"))
+    UPLOAD_MAX_TOP_K = int(os.environ.get("UPLOAD_MAX_TOP_K", "10000"))
+    UPLOAD_SPOOL_DIR = os.environ.get("UPLOAD_SPOOL_DIR") or None  # default: direktori temp sistem
+
+    # Backend penyimpanan hasil: firestore, sqlite (file lokal, mode WAL) atau memory (per proses, untuk tes/batch)
+    STORAGE_BACKENDS = ("firestore", "sqlite", "memory")
+    STORAGE_BACKEND = os.environ.get("STORAGE_BACKEND", "firestore").lower()
+    SQLITE_PATH = os.environ.get(
+        "SQLITE_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "db", "results.sqlite3")
+    )
+    SQLITE_TIMEOUT = float(os.environ.get("SQLITE_TIMEOUT", "30"))  # detik menunggu lock tulis
+
+    # Materialized view hasil per worker untuk GET /results: off, auto, listen (on_snapshot Firestore)
+    # atau poll (emulator, sqlite, memory). auto = listen untuk Firestore, poll untuk yang lain
+    RESULTS_VIEW_MODES = ("off", "auto", "listen", "poll")
+    RESULTS_VIEW = os.environ.get("RESULTS_VIEW", "off").lower()
+    RESULTS_VIEW_MAX_BYTES = int(os.environ.get("RESULTS_VIEW_MAX_BYTES", str(256 * 1024 * 1024)))
+    RESULTS_VIEW_MAX_STALENESS = float(os.environ.get("RESULTS_VIEW_MAX_STALENESS", "5"))  # detik
+    RESULTS_VIEW_POLL_INTERVAL = float(os.environ.get("RESULTS_VIEW_POLL_INTERVAL", "1"))
+
+    # Endpoint /metrics (Prometheus); butuh prometheus_client. Multi-worker: set PROMETHEUS_MULTIPROC_DIR
+    METRICS_ENABLED = os.environ.get("METRICS_ENABLED", "1") == "1"
+
+    # Format penyimpanan decision_matrix: binary (float little-endian) atau json (format lama)
+    MATRIX_CODEC = os.environ.get("MATRIX_CODEC", "binary")
+    MATRIX_COMPRESS_LEVEL = int(os.environ.get("MATRIX_COMPRESS_LEVEL", "1"))  # 0 = tanpa zlib
+    # Matriks lebih besar dari ini dipecah ke subkoleksi (batas dokumen Firestore 1 MiB)
+    MATRIX_CHUNK_BYTES = int(os.environ.get("MATRIX_CHUNK_BYTES", str(512 * 1024)))
+
+    # Koleksi untuk dokumen counter (jumlah dokumen per koleksi)
+    COUNTER_COLLECTION = os.environ.get("COUNTER_COLLECTION", "counters")
+
+    # Ukuran halaman untuk endpoint /results
+    RESULTS_PAGE_SIZE = int(os.environ.get("RESULTS_PAGE_SIZE", "100"))
+    RESULTS_MAX_PAGE_SIZE = int(os.environ.get("RESULTS_MAX_PAGE_SIZE", "1000"))
+
+    # Pengaturan channel gRPC Firestore (satu channel per worker)
+    FIRESTORE_KEEPALIVE_TIME_MS = int(os.environ.get("FIRESTORE_KEEPALIVE_TIME_MS", "30000"))
+    FIRESTORE_KEEPALIVE_TIMEOUT_MS = int(os.environ.get("FIRESTORE_KEEPALIVE_TIMEOUT_MS", "10000"))
+    FIRESTORE_KEEPALIVE_WITHOUT_CALLS = os.environ.get("FIRESTORE_KEEPALIVE_WITHOUT_CALLS", "0") == "1"
+    # Lakukan satu RPC ringan di post_fork agar request pertama tidak membayar setup koneksi
+    FIRESTORE_WARMUP = os.environ.get("FIRESTORE_WARMUP", "0") == "1"
+
+    # sync: worker gunicorn sync + client Firestore biasa; async: worker gthread + satu event loop
+    # dan AsyncClient Firestore per worker untuk /save, /results dan penyimpanan hasil
+    SERVING_MODES = ("sync", "async")
+    SERVING_MODE = os.environ.get("SERVING_MODE", "sync").lower()
+    # Batas waktu (detik) menunggu operasi Firestore di event loop async
+    FIRESTORE_ASYNC_TIMEOUT = float(os.environ.get("FIRESTORE_ASYNC_TIMEOUT", "60"))
+
+    # Budget waktu (detik) semua panggilan Firestore dalam satu request, dan batas per panggilan
+    FIRESTORE_DEADLINE = float(os.environ.get("FIRESTORE_DEADLINE", "10"))
+    FIRESTORE_CALL_TIMEOUT = float(os.environ.get("FIRESTORE_CALL_TIMEOUT", "5"))
+    # Retry (hanya operasi idempotent) dengan backoff eksponensial + jitter
+    FIRESTORE_MAX_ATTEMPTS = int(os.environ.get("FIRESTORE_MAX_ATTEMPTS", "3"))
+    FIRESTORE_RETRY_BASE_DELAY = float(os.environ.get("FIRESTORE_RETRY_BASE_DELAY", "0.1"))
+    FIRESTORE_RETRY_MAX_DELAY = float(os.environ.get("FIRESTORE_RETRY_MAX_DELAY", "2"))
+    # Circuit breaker: terbuka setelah N kegagalan berturut-turut, dicoba lagi setelah RESET detik
+    FIRESTORE_BREAKER_FAILURES = int(os.environ.get("FIRESTORE_BREAKER_FAILURES", "5"))
+    FIRESTORE_BREAKER_RESET = float(os.environ.get("FIRESTORE_BREAKER_RESET", "30"))
+
+    # Level log aplikasi; DEBUG menampilkan ringkasan ukuran dan durasi tiap tahap perhitungan
+    LOG_LEVEL = os.environ.get("LOG_LEVEL", "INFO").upper()
+
+    # Batas waktu startup (ms) untuk `python index.py --profile-startup` di CI; 0 = tanpa batas
+    STARTUP_BUDGET_MS = float(os.environ.get("STARTUP_BUDGET_MS", "0"))
+
     @staticmethod
     def init_firebase():
+        # firebase_admin di-import saat dipakai saja supaya cold start tidak membayar import-nya
+        import firebase_admin
+        from firebase_admin import credentials
+
         try:
-            firebase_admin.get_app()
-            print("Firebase app already initialized")
+            return firebase_admin.get_app()
         except ValueError:
             current_dir = os.path.dirname(os.path.abspath(__file__))
             cred_path = os.path.join(current_dir, '..', '..', 'db', 'FirebaseCred.json')
 
-            print(f"Initializing Firebase app with credentials at: {cred_path}")
+            logging.getLogger(__name__).info("Initializing Firebase app with credentials at: %s", cred_path)
 
             cred = credentials.Certificate(cred_path)
-            firebase_admin.initialize_app(cred)
+            return firebase_admin.initialize_app(cred)
@@ -0,0 +1,209 @@
+import os
+import time
+from contextlib import contextmanager
+
+from app.utils.config import Config
+
+try:
+    import prometheus_client
+except ImportError:
+    prometheus_client = None
+
+# Detik: dari operasi numpy kecil (< 1 ms) sampai request besar / Firestore lambat
+LATENCY_BUCKETS = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0,
+)
+CELL_BUCKETS = (10, 100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000, 100_000_000)
+DIMENSION_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 1_000, 10_000, 100_000, 1_000_000)
+STAGES = ("parse", "validate", "compute", "persist")
+
+
+class Metrics:
+    """
+    Prometheus metrics of this process.
+
+    - ``spk_request_seconds{route, method, status}``: latency per Flask route
+    - ``spk_stage_seconds{stage, name}``: ``parse``, ``validate``, ``compute``
+      and ``persist`` stages; ``name`` is the endpoint (parse) or the
+      ``trace_stage`` name (``simple_additive_weighting.normalize``)
+    - ``spk_firestore_calls_total``, ``spk_firestore_errors_total`` and
+      ``spk_firestore_call_seconds`` per ``operation``
+    - ``spk_firestore_retries_total{operation}``, ``spk_firestore_breaker_state``
+      (0 closed, 1 half open, 2 open) and ``spk_deferred_writes_total``
+    - ``spk_matrix_cells``, ``spk_matrix_alternatives`` and
+      ``spk_matrix_criteria`` per calculation ``method``
+
+    With gunicorn, ``PROMETHEUS_MULTIPROC_DIR`` makes every worker write its
+    values to a shared directory and ``/metrics`` aggregates all of them.
+    Everything is a no-op when ``METRICS_ENABLED`` is off or
+    ``prometheus_client`` is not installed.
+    """
+
+    def __init__(self, enabled: bool = Config.METRICS_ENABLED) -> None:
+        self.enabled = enabled and prometheus_client is not None
+        if not self.enabled:
+            return
+
+        from prometheus_client import Counter, Gauge, Histogram
+
+        # Seri per kombinasi label disimpan sendiri: .labels() memakai lock dan validasi di setiap panggilan
+        self._children = {}
+
+        self.request_seconds = Histogram(
+            "spk_request_seconds", "HTTP request latency by route.",
+            ("route", "method", "status"), buckets=LATENCY_BUCKETS,
+        )
+        self.stage_seconds = Histogram(
+            "spk_stage_seconds", "Duration of request stages (parse, validate, compute, persist).",
+            ("stage", "name"), buckets=LATENCY_BUCKETS,
+        )
+        self.firestore_calls = Counter(
+            "spk_firestore_calls", "Firestore calls by operation.", ("operation",),
+        )
+        self.firestore_errors = Counter(
+            "spk_firestore_errors", "Failed Firestore calls by operation and exception type.", ("operation", "error"),
+        )
+        self.firestore_seconds = Histogram(
+            "spk_firestore_call_seconds", "Firestore call latency by operation.",
+            ("operation",), buckets=LATENCY_BUCKETS,
+        )
+        self.firestore_retries = Counter(
+            "spk_firestore_retries", "Retried Firestore calls by operation.", ("operation",),
+        )
+        self.breaker_state = Gauge(
+            "spk_firestore_breaker_state", "Firestore circuit breaker state (0 closed, 1 half open, 2 open).",
+            multiprocess_mode="livemax",
+        )
+        self.deferred_writes = Counter(
+            "spk_deferred_writes", "Synchronous result saves deferred to the write-behind queue.", ("collection",),
+        )
+        self.matrix_cells = Histogram(
+            "spk_matrix_cells", "Decision matrix size (alternatives x criteria) per calculation.",
+            ("method",), buckets=CELL_BUCKETS,
+        )
+        self.matrix_alternatives = Histogram(
+            "spk_matrix_alternatives", "Number of alternatives per calculation.",
+            ("method",), buckets=DIMENSION_BUCKETS,
+        )
+        self.matrix_criteria = Histogram(
+            "spk_matrix_criteria", "Number of criteria per calculation.",
+            ("method",), buckets=DIMENSION_BUCKETS,
+        )
+
+    def observe_request(self, route: str, method: str, status: int, seconds: float) -> None:
+        if self.enabled:
+            self._child(self.request_seconds, route, method, str(status)).observe(seconds)
+
+    def observe_stage(self, stage: str, name: str, seconds: float) -> None:
+        if self.enabled:
+            self._child(self.stage_seconds, stage, name).observe(seconds)
+
+    @contextmanager
+    def stage(self, stage: str, name: str):
+        """
+        Time a block as ``stage`` (one of ``STAGES``).
+        """
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe_stage(stage, name, time.perf_counter() - start)
+
+    def observe_matrix(self, method: str, shape) -> None:
+        """
+        Record the size of an ``alternatives x criteria`` decision matrix (the last two dimensions of ``shape``).
+        """
+        if not self.enabled or len(shape) < 2:
+            return
+        alternatives, criteria = shape[-2], shape[-1]
+        self._child(self.matrix_cells, method).observe(alternatives * criteria)
+        self._child(self.matrix_alternatives, method).observe(alternatives)
+        self._child(self.matrix_criteria, method).observe(criteria)
+
+    @contextmanager
+    def firestore_call(self, operation: str):
+        """
+        Count and time one Firestore operation; exceptions are counted as errors and re-raised.
+        """
+        if not self.enabled:
+            yield
+            return
+        self._child(self.firestore_calls, operation).inc()
+        start = time.perf_counter()
+        try:
+            yield
+        except Exception as e:
+            self.firestore_errors.labels(operation, type(e).__name__).inc()
+            raise
+        finally:
+            self._child(self.firestore_seconds, operation).observe(time.perf_counter() - start)
+
+    def firestore_stream(self, operation: str, iterable):
+        """
+        Iterate a Firestore stream, timing only the time spent waiting for documents.
+
+        The time the caller spends between documents (decoding, writing the
+        response) is not part of the call latency.
+        """
+        if not self.enabled:
+            yield from iterable
+            return
+        self._child(self.firestore_calls, operation).inc()
+        elapsed = 0.0
+        iterator = iter(iterable)
+        try:
+            while True:
+                start = time.perf_counter()
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    elapsed += time.perf_counter() - start
+                    break
+                elapsed += time.perf_counter() - start
+                yield item
+        except Exception as e:
+            self.firestore_errors.labels(operation, type(e).__name__).inc()
+            raise
+        finally:
+            self._child(self.firestore_seconds, operation).observe(elapsed)
+
+    def observe_retry(self, operation: str) -> None:
+        if self.enabled:
+            self._child(self.firestore_retries, operation).inc()
+
+    def set_breaker_state(self, state: int) -> None:
+        if self.enabled:
+            self.breaker_state.set(state)
+
+    def observe_deferred(self, collection: str, count: int = 1) -> None:
+        if self.enabled:
+            self._child(self.deferred_writes, collection).inc(count)
+
+    def _child(self, metric, *labels):
+        key = (metric, labels)
+        child = self._children.get(key)
+        if child is None:
+            child = self._children.setdefault(key, metric.labels(*labels))
+        return child
+
+    @staticmethod
+    def render() -> tuple[bytes, str]:
+        """
+        Metrics in the Prometheus text format; aggregated over all workers in multiprocess mode.
+        """
+        from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, generate_latest
+
+        if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+            from prometheus_client import multiprocess
+
+            registry = CollectorRegistry()
+            multiprocess.MultiProcessCollector(registry)
+        else:
+            registry = REGISTRY
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+metrics = Metrics()
@@ -0,0 +1,152 @@
+import json
+from flask import Response, request
+import numpy as np
+from app.connection.matrix_codec import CODEC_NAME, MatrixCodec
+from app.utils.metrics import metrics
+
+MSGPACK_TYPES = ("application/msgpack", "application/x-msgpack")
+RAW_TYPE = "application/octet-stream"
+# Urutan preferensi saat Accept tidak memilih (mis. */*): JSON tetap default
+RESPONSE_TYPES = ("application/json",) + MSGPACK_TYPES + (RAW_TYPE,)
+RAW_DTYPES = ("<f8", "<f4")
+
+
+def request_payload() -> dict:
+    """
+    Body of a calculate request as a dict, whatever its Content-Type.
+
+    - ``application/json``: as before
+    - ``application/msgpack``: the same keys; any value may be an ``ndarray-le``
+      map (``codec``, ``dtype``, ``shape``, ``data``) and is decoded to an array
+    - ``application/octet-stream``: the body is the raw little-endian decision
+      matrix, shaped by ``X-Matrix-Shape: A,C`` (dtype ``X-Matrix-Dtype``,
+      default ``<f8``); the other fields come from the query string, as a
+      comma-separated list or a JSON value (``criteria_weights=[[...],[...]]``)
+    """
+    with metrics.stage("parse", request.endpoint):
+        return _parse_payload()
+
+
+def _parse_payload() -> dict:
+    if request.mimetype in MSGPACK_TYPES:
+        import msgpack
+
+        try:
+            data = msgpack.unpackb(request.get_data(), raw=False, object_hook=_decode_ndarray)
+        except (ValueError, TypeError, msgpack.UnpackException) as e:
+            raise ValueError(f"Invalid msgpack body: {str(e) or type(e).__name__}")
+        if not isinstance(data, dict):
+            raise ValueError("The msgpack body must be a map.")
+        return data
+
+    if request.mimetype == RAW_TYPE:
+        data = {key: _query_value(value) for key, value in request.args.items() if key != "persist"}
+        data["decision_matrix"] = _raw_matrix(request.get_data())
+        return data
+
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        raise ValueError("The request body must be a JSON object.")
+    return data
+
+
+def payload_response(payload: dict, status: int = 200) -> tuple[Response, int]:
+    """
+    Serialize a calculate response by ``Accept``: JSON (default), msgpack, or raw ``scores`` bytes.
+
+    Payloads without ``scores`` (e.g. bulk results) fall back to JSON for a raw ``Accept``.
+
+    Arrays in ``payload`` are written directly, without ``tolist()``.
+    """
+    mimetype = request.accept_mimetypes.best_match(RESPONSE_TYPES, default="application/json")
+
+    if mimetype in MSGPACK_TYPES:
+        import msgpack
+
+        body = msgpack.packb(payload, default=_encode_numpy, use_bin_type=True)
+        return Response(body, mimetype=mimetype), status
+
+    if mimetype == RAW_TYPE and "scores" in payload:
+        scores = payload["scores"]
+        if isinstance(scores, dict):
+            # Hasil v2: nilai skor dalam urutan alternatif pada request
+            scores = np.fromiter(scores.values(), dtype=float, count=len(scores))
+        scores = np.ascontiguousarray(scores, dtype="<f8")
+        headers = {"X-Scores-Shape": ",".join(map(str, scores.shape)), "X-Scores-Dtype": "<f8"}
+        return Response(scores.tobytes(), mimetype=RAW_TYPE, headers=headers), status
+
+    return Response(_dumps_json(payload), mimetype="application/json"), status
+
+
+def _dumps_json(payload) -> bytes:
+    # orjson menulis ndarray langsung dari buffer; tanpa orjson jatuh ke json + tolist()
+    try:
+        import orjson
+    except ImportError:
+        return json.dumps(payload, default=_json_default, sort_keys=True).encode()
+    return orjson.dumps(
+        payload,
+        default=_json_default,
+        option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS | orjson.OPT_SORT_KEYS,
+    )
+
+
+def _json_default(value):
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _encode_numpy(value):
+    if isinstance(value, np.ndarray):
+        array = np.ascontiguousarray(value, dtype="<f8")
+        return {
+            "codec": CODEC_NAME,
+            "dtype": array.dtype.str,
+            "shape": list(array.shape),
+            "compression": None,
+            "chunks": 0,
+            "data": array.tobytes(),
+        }
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Object of type {type(value).__name__} is not msgpack serializable")
+
+
+def _decode_ndarray(value):
+    if MatrixCodec.is_encoded(value):
+        return MatrixCodec.to_array(value)
+    return value
+
+
+def _query_value(value: str):
+    if value[:1] in ("[", "{"):
+        try:
+            return json.loads(value)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid JSON query value '{value}': {e}")
+    items = [item.strip() for item in value.split(",")]
+    try:
+        return [float(item) for item in items]
+    except ValueError:
+        return items
+
+
+def _raw_matrix(body: bytes) -> np.ndarray:
+    shape = request.headers.get("X-Matrix-Shape")
+    if not shape:
+        raise ValueError("X-Matrix-Shape header (rows,columns) is required for application/octet-stream.")
+    try:
+        shape = tuple(int(size) for size in shape.split(","))
+    except ValueError:
+        raise ValueError(f"Invalid X-Matrix-Shape '{shape}', expected 'rows,columns'.")
+    dtype = request.headers.get("X-Matrix-Dtype", "<f8")
+    if len(shape) != 2 or dtype not in RAW_DTYPES:
+        raise ValueError(f"Raw matrices must be 2-dimensional with dtype one of: {', '.join(RAW_DTYPES)}.")
+
+    expected = shape[0] * shape[1] * np.dtype(dtype).itemsize
+    if len(body) != expected:
+        raise ValueError(f"Body has {len(body)} bytes, X-Matrix-Shape {shape} with {dtype} needs {expected}.")
+    return np.frombuffer(body, dtype=dtype).reshape(shape)
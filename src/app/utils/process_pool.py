@@ -0,0 +1,47 @@
+import atexit
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+
+class ProcessPool:
+    """
+    A ``ProcessPoolExecutor`` owned by one worker process, created on first use.
+
+    The pool uses ``spawn`` so child processes do not inherit the gRPC threads
+    of the worker, and it is re-created when the process ID changes (after a
+    gunicorn fork) or after a child process died.
+    """
+
+    def __init__(self, max_workers: int) -> None:
+        self.max_workers = max_workers
+        self._pool = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def get(self) -> ProcessPoolExecutor:
+        if self._usable():
+            return self._pool
+        with self._lock:
+            if not self._usable():
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+                if self._pid != os.getpid():
+                    atexit.register(self.shutdown)
+                self._pid = os.getpid()
+        return self._pool
+
+    def shutdown(self) -> None:
+        """
+        Stop the pool if this process ever started one; pending tasks are cancelled.
+        """
+        if self._pool is not None and self._pid == os.getpid():
+            self._pool.shutdown(wait=False, cancel_futures=True)
+        self._pool = None
+
+    def _usable(self) -> bool:
+        # Pool yang rusak (child mati mendadak) tidak menerima task baru
+        return self._pool is not None and self._pid == os.getpid() and not self._pool._broken
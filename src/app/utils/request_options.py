@@ -0,0 +1,102 @@
+from contextlib import contextmanager
+from flask import request
+from app.utils.config import Config
+from app.utils.trace import tracing
+
+
+def persist_mode(data: dict | None = None, default: str | None = None) -> str:
+    """
+    Read the per-request ``persist`` option from the query string or JSON body.
+    """
+    mode = request.args.get("persist") or (data or {}).get("persist") or default or Config.DEFAULT_PERSIST
+    if mode not in Config.PERSIST_MODES:
+        raise ValueError(
+            f"Unknown persist mode '{mode}'. Expected one of: {', '.join(Config.PERSIST_MODES)}."
+        )
+    return mode
+
+
+def save_persist_mode(data: dict | None = None) -> str:
+    """
+    ``persist`` of an explicit save endpoint (default ``sync``); ``none`` is rejected because it saves nothing.
+    """
+    mode = persist_mode(data, default="sync")
+    if mode == "none":
+        raise ValueError("persist=none does not save the results; use 'sync' or 'async'.")
+    return mode
+
+
+def dtype_option(data: dict | None = None) -> str:
+    """
+    Read the per-request ``dtype`` option (``float64``, or opt-in ``float32``) from the query string or JSON body.
+    """
+    dtype = request.args.get("dtype") or (data or {}).get("dtype") or Config.DEFAULT_DTYPE
+    if dtype not in Config.DTYPES:
+        raise ValueError(f"Unknown dtype '{dtype}'. Expected one of: {', '.join(Config.DTYPES)}.")
+    return dtype
+
+
+def results_options(default_methods=None) -> dict:
+    """
+    Read pagination, ``method`` filter and field projection for the results endpoints.
+
+    ``method`` is a comma-separated list (``all`` disables the filter), ``fields``
+    a comma-separated projection, ``limit`` the page size and ``start_after``
+    the ``next_cursor`` of the previous page.
+    """
+    method = request.args.get("method")
+    if method == "all":
+        methods = None
+    elif method:
+        methods = [m for m in method.split(",") if m]
+    else:
+        methods = list(default_methods) if default_methods else None
+
+    limit = request.args.get("limit", Config.RESULTS_PAGE_SIZE if not wants_ndjson() else None)
+    if limit is not None:
+        try:
+            limit = int(limit)
+        except ValueError:
+            raise ValueError(f"Invalid limit '{limit}', expected an integer.")
+        if not (1 <= limit <= Config.RESULTS_MAX_PAGE_SIZE):
+            raise ValueError(f"Limit must be between 1 and {Config.RESULTS_MAX_PAGE_SIZE}.")
+
+    fields = request.args.get("fields")
+    fields = [f for f in fields.split(",") if f] if fields else None
+
+    return {
+        "methods": methods,
+        "limit": limit,
+        "start_after": request.args.get("start_after") or None,
+        "fields": fields,
+    }
+
+
+def wants_ndjson() -> bool:
+    return (
+        request.args.get("format") == "ndjson"
+        or request.accept_mimetypes.best == "application/x-ndjson"
+    )
+
+
+def trace_requested() -> bool:
+    value = request.args.get("trace") or request.headers.get("X-Trace")
+    return value in ("1", "true")
+
+
+@contextmanager
+def request_trace():
+    """
+    Activate a calculation trace when the request asks for ``?trace=1`` or ``X-Trace: 1``.
+    """
+    if not trace_requested():
+        yield None
+        return
+    with tracing() as trace:
+        yield trace
+
+
+def with_trace(payload: dict, trace) -> dict:
+    if trace is not None:
+        payload["trace"] = trace.to_dict()
+    return payload
@@ -0,0 +1,43 @@
+import time
+from contextlib import contextmanager
+
+
+class StartupTimer:
+    """
+    Records named startup phases and the time to the first response.
+
+    All times are milliseconds since this module was imported, which
+    ``index.py`` does before anything else.
+    """
+
+    def __init__(self) -> None:
+        self.origin = time.perf_counter()
+        self.phases = []
+        self.first_response_ms = None
+
+    def _elapsed_ms(self, since: float | None = None) -> float:
+        return round((time.perf_counter() - (self.origin if since is None else since)) * 1000, 3)
+
+    @contextmanager
+    def phase(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append(
+                {"name": name, "duration_ms": self._elapsed_ms(start), "end_ms": self._elapsed_ms()}
+            )
+
+    def mark_first_response(self) -> None:
+        if self.first_response_ms is None:
+            self.first_response_ms = self._elapsed_ms()
+
+    def report(self) -> dict:
+        return {
+            "phases": self.phases,
+            "ready_ms": self.phases[-1]["end_ms"] if self.phases else None,
+            "first_response_ms": self.first_response_ms,
+        }
+
+
+startup_timer = StartupTimer()
@@ -0,0 +1,80 @@
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+import numpy as np
+
+from app.utils.metrics import metrics
+
+logger = logging.getLogger("app.calculation")
+
+_current_trace = ContextVar("calculation_trace", default=None)
+
+
+class CalculationTrace:
+    """
+    Intermediate matrices and per-stage timings of one traced request.
+    """
+
+    def __init__(self) -> None:
+        self.stages = []
+        self.values = {}
+
+    def to_dict(self) -> dict:
+        return {
+            "stages": self.stages,
+            "values": {
+                name: value.tolist() if isinstance(value, np.ndarray) else value
+                for name, value in self.values.items()
+            },
+        }
+
+
+@contextmanager
+def tracing():
+    """
+    Collect a ``CalculationTrace`` for every calculation run inside the block.
+    """
+    trace = CalculationTrace()
+    token = _current_trace.set(trace)
+    try:
+        yield trace
+    finally:
+        _current_trace.reset(token)
+
+
+def trace_active() -> bool:
+    return _current_trace.get() is not None
+
+
+def trace_value(name: str, value) -> None:
+    # Tanpa trace aktif tidak ada format/copy sama sekali
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.values[name] = value.copy() if isinstance(value, np.ndarray) else value
+
+
+@contextmanager
+def trace_stage(name: str, shape=None, stage: str = "compute"):
+    """
+    Time a calculation stage; recorded in the active trace, logged at DEBUG
+    and observed in the ``stage`` metric (``validate``, ``compute`` or ``persist``).
+    """
+    trace = _current_trace.get()
+    if trace is None and not metrics.enabled and not logger.isEnabledFor(logging.DEBUG):
+        yield
+        return
+
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        seconds = time.perf_counter() - start
+        metrics.observe_stage(stage, name, seconds)
+        duration_ms = seconds * 1000
+        if trace is not None:
+            trace.stages.append(
+                {"name": name, "shape": list(shape) if shape is not None else None, "duration_ms": round(duration_ms, 3)}
+            )
+        logger.debug("%s shape=%s took %.3f ms", name, shape, duration_ms)
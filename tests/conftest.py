@@ -0,0 +1,8 @@
+import os
+import sys
+
+# Tes berjalan tanpa Firestore: hasil disimpan di backend memory dan tidak dilayani dari cache
+os.environ.setdefault("STORAGE_BACKEND", "memory")
+os.environ.setdefault("RESULT_CACHE_MAX_BYTES", "0")
+os.environ.setdefault("METRICS_ENABLED", "0")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
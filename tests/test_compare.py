@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+from app.models.calculation_model import CalculationModel
+from app.models.methods import compare_methods
+
+CRITERIA = [
+    {"name": "harga", "weight": 0.4, "type": "cost"},
+    {"name": "kualitas", "weight": 0.6, "type": "benefit"},
+]
+DECISION_MATRIX = [
+    {"alternative": "A", "criteria_scores": {"harga": 300, "kualitas": 4}},
+    {"alternative": "B", "criteria_scores": {"harga": 250, "kualitas": 3}},
+    {"alternative": "C", "criteria_scores": {"harga": 400, "kualitas": 5}},
+]
+
+
+def test_compare_v1_matches_calculate():
+    rng = np.random.default_rng(0)
+    decision_matrix = rng.uniform(1, 100, (40, 6))
+    criteria_weights = rng.uniform(0.1, 1, 6)
+    criteria_weights /= criteria_weights.sum()
+    criteria_types = ["cost", "benefit"] * 3
+
+    result = compare_methods(decision_matrix, criteria_weights=criteria_weights, criteria_types=criteria_types)
+    model = CalculationModel()
+    saw = model.simple_additive_weighting(criteria_weights, decision_matrix, criteria_types, "none")
+    wp = model.weighted_product(criteria_weights, decision_matrix, criteria_types, "none")
+    np.testing.assert_allclose(result["scores"]["saw"], saw, rtol=1e-12)
+    np.testing.assert_allclose(result["scores"]["wp"], wp, rtol=1e-12)
+
+
+@pytest.mark.parametrize("methods, message", [(["saw"], "SAW harus sama dengan 1"), (["wp"], "skala 1-5")])
+def test_compare_v2_applies_weight_rules_of_v2_endpoints(methods, message):
+    criteria = [dict(CRITERIA[0], weight=3), dict(CRITERIA[1], weight=6)]
+    with pytest.raises(ValueError, match=message):
+        compare_methods(DECISION_MATRIX, criteria=criteria, methods=methods)
+
+
+def test_compare_v2_matches_v2_calculate():
+    result = compare_methods(DECISION_MATRIX, criteria=CRITERIA, methods=["saw"])
+    scores = CalculationModel().simple_additive_weighting_with_subcriteria(CRITERIA, DECISION_MATRIX, "none")
+    np.testing.assert_allclose(result["scores"]["saw"], list(scores.values()), rtol=1e-12)
@@ -0,0 +1,27 @@
+import pytest
+
+from app import create_app
+from app.utils.config import Config
+
+CALCULATE_BODY = {"criteria_weights": [0.5, 0.5], "decision_matrix": [[1, 2], [3, 4]], "criteria_types": ["benefit", "cost"]}
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(Config, "GUNICORN_WORKERS", 4)
+    return create_app().test_client()
+
+
+@pytest.mark.parametrize("blueprint", ["saw", "wp"])
+def test_async_job_refused_with_several_workers(client, blueprint):
+    response = client.post(f"/{blueprint}/calculate?async=1", json=CALCULATE_BODY)
+    assert response.status_code == 400
+    assert "GUNICORN_WORKERS=1" in response.json["message"]
+
+
+@pytest.mark.parametrize("blueprint", ["saw", "wp"])
+def test_large_matrix_calculated_directly_with_several_workers(client, blueprint, monkeypatch):
+    monkeypatch.setattr(Config, "JOB_ASYNC_MIN_CELLS", 1)
+    response = client.post(f"/{blueprint}/calculate", json=CALCULATE_BODY)
+    assert response.status_code == 200
+    assert len(response.json["scores"]) == 2
@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+
+from app.models.calculation_model import CalculationModel
+from app.models.kernels import Workspace
+
+# Toleransi float32 yang dijanjikan di readme (error relatif terhadap float64)
+FLOAT32_RTOL = 1e-5
+
+
+def _inputs(alternatives: int, criteria: int, low: float, high: float, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    # Nilai log-uniform agar rentang low..high benar-benar terwakili
+    decision_matrix = np.exp(rng.uniform(np.log(low), np.log(high), (alternatives, criteria)))
+    criteria_weights = rng.uniform(0.1, 1, criteria)
+    criteria_weights /= criteria_weights.sum()
+    criteria_types = list(np.where(rng.random(criteria) < 0.4, "cost", "benefit"))
+    return criteria_weights, decision_matrix, criteria_types
+
+
+@pytest.mark.parametrize("method", ["simple_additive_weighting", "weighted_product"])
+@pytest.mark.parametrize("alternatives, criteria", [(50, 10), (1000, 50), (200, 2000)])
+@pytest.mark.parametrize("low, high", [(1e-3, 1e6), (1, 100)])
+def test_float32_within_documented_tolerance(method, alternatives, criteria, low, high):
+    model = CalculationModel()
+    criteria_weights, decision_matrix, criteria_types = _inputs(alternatives, criteria, low, high)
+
+    reference = getattr(model, method)(criteria_weights, decision_matrix, criteria_types, "none", "float64")
+    scores = getattr(model, method)(criteria_weights, decision_matrix, criteria_types, "none", "float32")
+
+    assert scores.dtype == np.float32
+    relative_error = np.abs(scores.astype(float) - reference) / np.abs(reference)
+    assert relative_error.max() < FLOAT32_RTOL
+
+
+def test_workspace_caps_total_bytes_of_thread():
+    ws = Workspace(max_bytes=1000)
+    float64 = np.dtype(np.float64)
+
+    first = ws.buffer("a", (50,), float64)  # 400 byte, disimpan
+    assert ws.bytes == 400
+    assert ws.buffer("a", (40,), float64).base is first.base
+
+    ws.buffer("b", (60,), float64)  # 480 byte, total 880
+    assert ws.bytes == 880
+
+    # Buffer ketiga tidak muat dalam total: dialokasikan sekali, tidak disimpan
+    ws.buffer("c", (50,), float64)
+    assert ws.bytes == 880
+
+    # Buffer yang tumbuh melepas buffer lamanya dulu
+    ws.buffer("a", (60,), float64)
+    assert ws.bytes == 960
+    assert ws.bytes <= ws.max_bytes
@@ -0,0 +1,33 @@
+from app.connection.memory_repository import MemoryRepository
+from app.connection.results_view import ResultsView
+
+
+def test_put_keeps_created_at_of_existing_document():
+    view = ResultsView(MemoryRepository("results"), "poll")
+    view.put({"id": "a", "method": "weighted_product", "scores": [1.0], "created_at": 100.0})
+    view.put({"id": "a", "method": "weighted_product", "scores": [1.0], "created_at": 200.0})
+    view.put({"id": "b", "method": "weighted_product", "scores": [1.0], "created_at": 150.0})
+
+    assert view._documents["a"][0] == 100.0
+    assert view._created == [(100.0, "a"), (150.0, "b")]
+    assert view._watermark == 150.0
+
+
+def test_batch_apply_keeps_indexes_sorted():
+    view = ResultsView(MemoryRepository("results"), "poll")
+    view.apply([
+        {"id": "c", "method": "weighted_product", "created_at": 3.0},
+        {"id": "a", "method": "simple_additive_weighting", "created_at": 2.0},
+    ], [])
+    view.apply([
+        {"id": "d", "method": "weighted_product", "created_at": 1.0},
+        {"id": "b", "method": "weighted_product", "created_at": 5.0},
+        {"id": "c", "method": "simple_additive_weighting", "created_at": 4.0},
+        {"id": "b", "method": "weighted_product", "created_at": 6.0},
+    ], ["a"])
+
+    assert view._ids == ["b", "c", "d"]
+    assert view._ids_by_method == {"weighted_product": ["b", "d"], "simple_additive_weighting": ["c"]}
+    assert view._created == [(1.0, "d"), (4.0, "c"), (6.0, "b")]
+    assert [document["id"] for document in view.iter_results(methods=["weighted_product"])] == ["b", "d"]
+    assert view.count() == 3
@@ -0,0 +1,30 @@
+import pytest
+
+from app import create_app
+
+SAVE_BODY = {"criteria_weights": [0.5, 0.5], "decision_matrix": [[1, 2], [3, 4]], "scores": [0.4, 0.6]}
+
+
+@pytest.fixture
+def client():
+    return create_app().test_client()
+
+
+@pytest.mark.parametrize("blueprint", ["saw", "wp"])
+def test_save_rejects_persist_none(client, blueprint):
+    response = client.post(f"/{blueprint}/save?persist=none", json=SAVE_BODY)
+    assert response.status_code == 400
+    assert "persist=none" in response.json["message"]
+
+
+@pytest.mark.parametrize("blueprint", ["saw", "wp"])
+def test_save_rejects_unknown_persist_mode(client, blueprint):
+    response = client.post(f"/{blueprint}/save?persist=later", json=SAVE_BODY)
+    assert response.status_code == 400
+    assert "Unknown persist mode" in response.json["message"]
+
+
+@pytest.mark.parametrize("blueprint", ["saw", "wp"])
+def test_save_persists_by_default(client, blueprint):
+    response = client.post(f"/{blueprint}/save", json=SAVE_BODY)
+    assert response.status_code == 201